@@ -4,5 +4,5 @@ from .models import User
 
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
-    list_display = ("id", "username", "email", "provider", "provider_uid")
-    search_fields = ("username", "email", "provider")
+    list_display = ("id", "username", "email", "auth_provider", "created_at")
+    search_fields = ("username", "email", "auth_provider")
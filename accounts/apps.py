@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
+
+    def ready(self):
+        # 사용자 저장/삭제 시 JWT 인증 사용자 캐시 무효화
+        from django.db.models.signals import post_delete, post_save
+        from .authentication import invalidate_user_cache
+        from .models import User
+
+        post_save.connect(invalidate_user_cache, sender=User, dispatch_uid="accounts.user_cache_save")
+        post_delete.connect(invalidate_user_cache, sender=User, dispatch_uid="accounts.user_cache_delete")
@@ -0,0 +1,16 @@
+# accounts/async_views.py
+# - ASGI(uvicorn) 환경용 async 버전 /api/accounts/async/me/
+
+from django.http import JsonResponse
+from django.views import View
+
+from .authentication import async_jwt_required
+from .serializers import MeSerializer
+
+
+class AsyncMeView(View):
+    """로그인(인증)된 사용자의 기본 정보를 반환하는 async 뷰 (MeView 와 같은 응답)"""
+
+    @async_jwt_required
+    async def get(self, request):
+        return JsonResponse(MeSerializer(request.user).data, json_dumps_params={"ensure_ascii": False})
@@ -0,0 +1,181 @@
+# accounts/authentication.py
+# - JWT 인증 확장
+# - CachedJWTAuthentication: 토큰의 사용자 조회 결과를 Django 캐시에 짧게 보관 → 요청마다 User SELECT 생략
+#   (User 객체 전체가 아니라 CACHED_FIELDS 값만 보관 — 비밀번호 해시는 캐시에 넣지 않음)
+# - AsyncJWTAuthentication: async 뷰(ASGI)에서 스레드 전환 없이 async ORM 으로 사용자 조회
+
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from django.http import JsonResponse
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from backend import perf
+
+DEFAULT_USER_CACHE = {
+    "ENABLED": True,
+    "ALIAS": "default",     # settings.CACHES 의 캐시 이름
+    "TTL_SECONDS": 60,      # 다른 프로세스에서 바뀐 사용자 정보가 반영되기까지 최대 지연
+    "VERSION": 2,           # 캐시 항목 구조(CACHED_FIELDS)가 바뀌면 올려서 기존 캐시 무효화
+}
+
+# 캐시에 보관하는 User 필드 (인증 검사 + request.user 를 쓰는 뷰에 필요한 것만)
+CACHED_FIELDS = ("id", "username", "email", "auth_provider", "created_at", "is_active", "is_staff", "is_superuser")
+
+
+def get_user_cache_config():
+    return {**DEFAULT_USER_CACHE, **getattr(settings, "JWT_USER_CACHE", {})}
+
+
+def user_cache_key(user_id):
+    return f"accounts:jwt-user:{user_id}"
+
+
+def _user_cache(config):
+    return caches[config["ALIAS"]]
+
+
+def invalidate_user_cache(sender, instance, **kwargs):
+    """사용자 정보가 바뀌거나 삭제되면 캐시된 인증 사용자 제거"""
+    config = get_user_cache_config()
+    if config["ENABLED"]:
+        _user_cache(config).delete(user_cache_key(instance.pk), version=config["VERSION"])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    simplejwt JWTAuthentication + 사용자 캐시
+    - 캐시 키: (사용자 id, JWT_USER_CACHE VERSION), TTL 은 TTL_SECONDS
+    - 캐시 항목: {"fields": CACHED_FIELDS 값, "password_md5": 토큰 무효화 검사용 해시}
+      → 꺼낼 때 나머지 필드는 deferred 인 User 로 복원 (save() 해도 로드한 필드만 저장됨)
+    - 캐시에서 꺼낸 사용자에도 is_active / 비밀번호 변경(REVOKE_TOKEN_CLAIM) 검사는 매번 수행
+    - 같은 프로세스의 User 저장/삭제는 시그널로 즉시 무효화, 다른 프로세스는 TTL 안에 반영
+      (QuerySet.update() 는 시그널이 없으므로 TTL 만큼 늦게 반영됨)
+    """
+
+    def _user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+    def _fetch_user(self, user_id):
+        """DB 조회 (캐시 미스) → (User, 캐시 항목)"""
+        queryset = self.user_model.objects.only(*CACHED_FIELDS, "password")
+        try:
+            user = queryset.get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+        return user, self._to_entry(user)
+
+    async def _afetch_user(self, user_id):
+        queryset = self.user_model.objects.only(*CACHED_FIELDS, "password")
+        try:
+            user = await queryset.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+        return user, self._to_entry(user)
+
+    def _to_entry(self, user):
+        user.password_md5 = get_md5_hash_password(user.password)
+        return {
+            "fields": {name: getattr(user, name) for name in CACHED_FIELDS},
+            "password_md5": user.password_md5,
+        }
+
+    def _from_entry(self, entry):
+        fields = entry["fields"]
+        # from_db 는 값이 모델 필드 순서대로 오길 기대함
+        names = [f.attname for f in self.user_model._meta.concrete_fields if f.attname in fields]
+        user = self.user_model.from_db(router.db_for_read(self.user_model), names, [fields[n] for n in names])
+        user.password_md5 = entry["password_md5"]
+        return user
+
+    def check_user(self, user, validated_token):
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != user.password_md5:
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+        return user
+
+    def get_user(self, validated_token):
+        config = get_user_cache_config()
+        if not config["ENABLED"]:
+            return super().get_user(validated_token)
+
+        user_id = self._user_id(validated_token)
+        cache = _user_cache(config)
+        key = user_cache_key(user_id)
+        entry = cache.get(key, version=config["VERSION"])
+        perf.record_cache("user", entry is not None)
+        if entry is None:
+            user, entry = self._fetch_user(user_id)
+            cache.set(key, entry, config["TTL_SECONDS"], version=config["VERSION"])
+        else:
+            user = self._from_entry(entry)
+        return self.check_user(user, validated_token)
+
+
+class AsyncJWTAuthentication(CachedJWTAuthentication):
+    """JWT 인증의 async 버전 (토큰 검증은 동일, 사용자 조회만 cache.aget / objects.aget)"""
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        config = get_user_cache_config()
+        user_id = self._user_id(validated_token)
+        cache = _user_cache(config) if config["ENABLED"] else None
+        key = user_cache_key(user_id)
+
+        entry = await cache.aget(key, version=config["VERSION"]) if cache else None
+        if cache:
+            perf.record_cache("user", entry is not None)
+        if entry is None:
+            user, entry = await self._afetch_user(user_id)
+            if cache:
+                await cache.aset(key, entry, config["TTL_SECONDS"], version=config["VERSION"])
+        else:
+            user = self._from_entry(entry)
+        return self.check_user(user, validated_token)
+
+
+def async_jwt_required(view_func):
+    """
+    async 뷰용 JWT 인증 데코레이터
+    - 성공 시 request.user 설정, 실패 시 DRF 와 같은 형식의 401 응답
+    """
+    authenticator = AsyncJWTAuthentication()
+
+    @wraps(view_func)
+    async def wrapper(self, request, *args, **kwargs):
+        try:
+            result = await authenticator.aauthenticate(request)
+            if result is None:
+                raise NotAuthenticated()
+        except (AuthenticationFailed, InvalidToken, NotAuthenticated) as e:
+            body = e.detail if isinstance(e.detail, dict) else {"detail": e.detail}
+            response = JsonResponse(body, status=401, json_dumps_params={"ensure_ascii": False})
+            response["WWW-Authenticate"] = authenticator.authenticate_header(request)
+            return response
+        request.user = result[0]
+        return await view_func(self, request, *args, **kwargs)
+
+    return wrapper
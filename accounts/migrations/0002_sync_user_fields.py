@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:25
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="user",
+            old_name="provider",
+            new_name="auth_provider",
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="auth_provider",
+            field=models.CharField(
+                default="local",
+                help_text="로그인 제공자: local / kakao / google",
+                max_length=50,
+            ),
+        ),
+        migrations.RemoveField(
+            model_name="user",
+            name="provider_uid",
+        ),
+        migrations.RemoveField(
+            model_name="user",
+            name="avatar_url",
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="email",
+            field=models.EmailField(max_length=254, unique=True),
+        ),
+    ]
@@ -5,4 +5,4 @@ class MeSerializer(serializers.ModelSerializer):
     """현재 로그인한 사용자 정보를 내려주는 Serializer"""
     class Meta:
         model = User
-        fields = ("id", "username", "email", "provider", "provider_uid", "avatar_url")
+        fields = ("id", "username", "email", "auth_provider", "created_at")
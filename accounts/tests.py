@@ -1,3 +1,60 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from .authentication import CachedJWTAuthentication
+from .models import User
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("tester", "tester@example.com", "pw")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+        self.url = reverse("me")
+
+    def test_me_is_served_without_queries_after_first_request(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        with self.assertNumQueries(0):
+            res = self.client.get(self.url)
+        self.assertEqual(res.data["username"], "tester")
+
+    def test_cache_holds_only_needed_fields_not_password_hash(self):
+        self.client.get(self.url)
+        entry = cache.get(f"accounts:jwt-user:{self.user.pk}", version=2)
+        self.assertNotIn("password", entry["fields"])
+        self.assertNotIn(self.user.password, str(entry))
+
+        with self.assertNumQueries(0):
+            res = self.client.get(self.url)
+        self.assertEqual(res.data["email"], "tester@example.com")
+
+        # 캐시에서 복원한 User 를 저장해도 비밀번호는 그대로
+        user = CachedJWTAuthentication()._from_entry(entry)
+        user.email = "changed@example.com"
+        user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, "changed@example.com")
+        self.assertTrue(self.user.check_password("pw"))
+
+    def test_user_save_invalidates_cached_user(self):
+        self.client.get(self.url)
+        self.user.email = "changed@example.com"
+        self.user.save()
+
+        with self.assertNumQueries(1):
+            res = self.client.get(self.url)
+        self.assertEqual(res.data["email"], "changed@example.com")
+
+    def test_deactivated_or_deleted_user_is_rejected(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+        self.user.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
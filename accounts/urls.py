@@ -4,6 +4,7 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .views import MeView
+from .async_views import AsyncMeView
 
 urlpatterns = [
     # JWT 로그인 (username + password 입력 → 토큰 발급)
@@ -14,4 +15,7 @@ urlpatterns = [
 
     # 로그인된 사용자 정보 조회 (Authorization: Bearer <token> 필요)
     path("me/", MeView.as_view(), name="me"),
+
+    # ASGI(uvicorn) 배포용 async 버전
+    path("async/me/", AsyncMeView.as_view(), name="me_async"),
 ]
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class BackendConfig(AppConfig):
+    """프로젝트 공통 설정(DB 커넥션 튜닝 등)을 붙이는 앱"""
+    name = "backend"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .db import apply_sqlite_pragmas
+        from .perf import install_db_wrapper
+
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid="backend.sqlite_pragmas")
+        # 요청별 ORM 쿼리 수/시간 계측
+        connection_created.connect(install_db_wrapper, dispatch_uid="backend.perf_db_wrapper")
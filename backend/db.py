@@ -0,0 +1,16 @@
+# backend/db.py
+# - DB 커넥션 초기화 훅
+
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """새 SQLite 커넥션마다 settings.SQLITE_PRAGMAS 적용 (WAL, synchronous 등)"""
+    if connection.vendor != "sqlite":
+        return
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", {})
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
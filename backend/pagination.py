@@ -0,0 +1,94 @@
+# backend/pagination.py
+# - 기록 조회 API 공통 keyset(cursor) 페이지네이션
+# - OFFSET 대신 마지막 행의 (정렬 시각, id) 보다 "이전" 행만 조회 → 몇 페이지를 넘겨도 페이지당 비용 일정
+# - values() 로 필요한 열만 읽고, fields= 파라미터로 응답 필드 선택 (큰 텍스트 열 생략 가능)
+
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(when, pk):
+    raw = json.dumps([when.isoformat(), pk]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """cursor 문자열 → (datetime, id), 형식이 틀리면 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        when, pk = json.loads(raw)
+        return datetime.fromisoformat(when), int(pk)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"잘못된 cursor 입니다: {token}") from e
+
+
+class KeysetPaginator:
+    """
+    (order_field, id) 내림차순(최신순) keyset 페이지네이션
+    - fields: 응답 필드명 → values() 에 넘길 조회 경로 (예: {"category": "category__category_name"})
+    - 쿼리 파라미터: cursor (이전 응답의 next 에 포함), limit, fields=a,b,c
+    - 응답: {"results": [...], "next": 다음 페이지 URL 또는 null}
+    """
+
+    def __init__(self, order_field, fields, default_limit=50, max_limit=200):
+        self.order_field = order_field
+        self.fields = fields
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+
+    def _selected_fields(self, request):
+        param = request.query_params.get("fields")
+        if not param:
+            return list(self.fields)
+        selected = [f.strip() for f in param.split(",") if f.strip()]
+        unknown = [f for f in selected if f not in self.fields]
+        if unknown or not selected:
+            raise ValidationError({"fields": f"사용할 수 있는 필드: {', '.join(self.fields)}"})
+        return selected
+
+    def _limit(self, request):
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            raise ValidationError({"limit": "정수여야 합니다."})
+        return max(1, min(limit, self.max_limit))
+
+    def paginate(self, request, queryset):
+        selected = self._selected_fields(request)
+        limit = self._limit(request)
+
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            try:
+                when, pk = decode_cursor(cursor)
+            except ValueError as e:
+                raise ValidationError({"cursor": str(e)})
+            # (시각, pk) < (when, pk) 를 "시각 <= when AND NOT (시각 = when AND pk >= pk)" 로 표현
+            # → OR 조건과 달리 (user, 시각) 인덱스 범위 탐색이 가능
+            queryset = queryset.filter(
+                Q(**{f"{self.order_field}__lte": when})
+                & ~Q(**{self.order_field: when, "pk__gte": pk})
+            )
+
+        # 커서 계산용 키(정렬 시각, pk)는 항상 읽고, 선택하지 않았으면 응답에서는 뺌
+        lookups = {name: self.fields[name] for name in selected}
+        columns = dict.fromkeys([*lookups.values(), self.order_field, "pk"])
+        rows = list(
+            queryset.order_by(f"-{self.order_field}", "-pk").values(*columns)[:limit + 1]
+        )
+
+        next_url = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "cursor", encode_cursor(last[self.order_field], last["pk"])
+            )
+        results = [{name: row[lookup] for name, lookup in lookups.items()} for row in rows]
+        return Response({"results": results, "next": next_url})
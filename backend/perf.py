@@ -0,0 +1,293 @@
+# backend/perf.py
+# - 요청 단위 성능 계측: 처리 시간, ORM 쿼리 수/시간, 캐시 적중, 감정 모델 추론/배치 대기 시간
+# - 응답마다 Server-Timing 헤더로 내보내고, 프로세스 내 누적값을 라우트별 히스토그램으로
+#   Prometheus 텍스트 형식(/metrics)으로 제공 (prometheus_client 없이 직접 출력)
+# - 요청 밖(관리 명령, 배치 스레드)에서는 기록 함수가 아무 일도 하지 않음
+
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from .profiling import register_thread
+
+DEFAULT_CONFIG = {
+    "ENABLED": True,
+    "SERVER_TIMING": True,                  # 응답에 Server-Timing 헤더 추가
+    "ALLOWED_IPS": ("127.0.0.1", "::1"),    # /metrics 를 볼 수 있는 REMOTE_ADDR (TOKEN 이 없을 때)
+    "TOKEN": "",                            # 설정하면 Authorization: Bearer <TOKEN> 으로만 /metrics 접근
+    "BUCKETS": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),  # 시간 히스토그램 (초)
+}
+
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+RATIO_BUCKETS = (0.25, 0.5, 0.75, 0.9, 1)
+
+# 이름 → (종류, 설명, 히스토그램 구간; None 이면 BUCKETS)
+METRICS = {
+    "http_requests_total": ("counter", "처리한 요청 수", None),
+    "http_request_duration_seconds": ("histogram", "요청 처리 시간", None),
+    "db_queries_per_request": ("histogram", "요청 1건의 ORM 쿼리 수", QUERY_BUCKETS),
+    "db_query_duration_seconds": ("histogram", "요청 1건의 ORM 쿼리 시간 합계", None),
+    "cache_requests_total": ("counter", "캐시 조회 수 (result=hit/miss)", None),
+    "emotion_model_inference_seconds": ("histogram", "요청 1건이 포함된 배치의 모델 추론 시간", None),
+    "emotion_model_wait_seconds": ("histogram", "모델 큐/배치 구성 대기 시간", None),
+    "emotion_model_padding_efficiency": ("histogram", "배치별 실제 토큰 / 패딩 포함 토큰 (bucket=길이 구간 상한)", RATIO_BUCKETS),
+    "emotion_model_tokens_total": ("counter", "모델에 넣은 토큰 수 (kind=real/padding)", None),
+}
+
+_current = ContextVar("perf_request_stats", default=None)
+
+
+def get_config():
+    return {**DEFAULT_CONFIG, **getattr(settings, "PERF_METRICS", {})}
+
+
+# ---------------------
+# 요청 단위 기록
+# ---------------------
+
+def new_stats():
+    return {
+        "db_queries": 0,
+        "db_seconds": 0.0,
+        "cache": defaultdict(int),  # (캐시 이름, "hit"/"miss") → 횟수
+        "model_calls": 0,
+        "model_seconds": 0.0,
+        "model_wait_seconds": 0.0,
+    }
+
+
+@contextmanager
+def collect():
+    """with 블록 안의 쿼리/캐시/모델 시간을 stats dict 로 수집 (미들웨어 밖의 배치·벤치마크에서도 사용)"""
+    stats = new_stats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def record_cache(name, hit):
+    stats = _current.get()
+    if stats is not None:
+        stats["cache"][(name, "hit" if hit else "miss")] += 1
+
+
+def record_model(infer_seconds, wait_seconds):
+    """감정 모델 호출 1건: 배치 추론 시간 + 큐/배치 대기 시간"""
+    stats = _current.get()
+    if stats is not None:
+        stats["model_calls"] += 1
+        stats["model_seconds"] += infer_seconds
+        stats["model_wait_seconds"] += wait_seconds
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    """모든 커넥션에 거는 execute wrapper (요청 처리 중일 때만 쿼리 수/시간 기록)"""
+    # async 요청을 프로파일 중이면 쿼리를 실행하는 작업 스레드도 샘플링 대상에 등록
+    register_thread()
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats["db_queries"] += 1
+        stats["db_seconds"] += time.perf_counter() - started
+
+
+def install_db_wrapper(sender, connection, **kwargs):
+    """connection_created 시그널 핸들러"""
+    if db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_execute_wrapper)
+
+
+# ---------------------
+# 누적 값 (Prometheus)
+# ---------------------
+
+class Registry:
+    """프로세스 내 counter / histogram 저장소 (라벨은 정렬된 (이름, 값) tuple)"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self._counters = defaultdict(float)
+        self._histograms = {}   # (이름, 라벨) → [[구간별 개수..., +Inf 개수], 합계]
+        self._lock = threading.Lock()
+
+    def inc(self, name, labels, value=1):
+        with self._lock:
+            self._counters[(name, tuple(sorted(labels.items())))] += value
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2] or self.buckets
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            entry = self._histograms.setdefault(key, [[0] * (len(buckets) + 1), 0.0])
+            entry[0][bisect_left(buckets, value)] += 1
+            entry[1] += value
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self):
+        """Prometheus text exposition format 0.0.4"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: (list(counts), total) for k, (counts, total) in self._histograms.items()}
+
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            if kind == "counter":
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+            bounds = buckets or self.buckets
+            for (metric, labels), (counts, total) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip([*bounds, "+Inf"], counts):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else _number(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = Registry(get_config()["BUCKETS"])
+        return _registry
+
+
+# ---------------------
+# 미들웨어 / 뷰
+# ---------------------
+
+def server_timing(stats, total_seconds):
+    """요청 통계 → Server-Timing 헤더 값 (dur 는 ms)"""
+    parts = [
+        f"total;dur={total_seconds * 1000:.1f}",
+        f'db;dur={stats["db_seconds"] * 1000:.1f};desc="{stats["db_queries"]} queries"',
+    ]
+    if stats["cache"]:
+        hits = sum(n for (_, result), n in stats["cache"].items() if result == "hit")
+        misses = sum(n for (_, result), n in stats["cache"].items() if result == "miss")
+        parts.append(f'cache;desc="hit={hits} miss={misses}"')
+    if stats["model_calls"]:
+        parts.append(f"model;dur={stats['model_seconds'] * 1000:.1f}")
+        parts.append(f"model-wait;dur={stats['model_wait_seconds'] * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class PerfMiddleware:
+    """
+    요청 단위 계측 미들웨어 (sync / async 모두 지원)
+    - 라우트 라벨은 URL 패턴 (예: api/wellness/chatbot/message/), 매칭 실패는 "unmatched"
+    - MIDDLEWARE 맨 앞에 두어야 다른 미들웨어의 쿼리/시간까지 포함됨
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_config()
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.config["ENABLED"]:
+            return self.get_response(request)
+        started = time.perf_counter()
+        with collect() as stats:
+            response = self.get_response(request)
+        return self._finish(request, response, stats, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        if not self.config["ENABLED"]:
+            return await self.get_response(request)
+        started = time.perf_counter()
+        with collect() as stats:
+            response = await self.get_response(request)
+        return self._finish(request, response, stats, time.perf_counter() - started)
+
+    def _finish(self, request, response, stats, elapsed):
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match else "unmatched"
+        labels = {"route": route, "method": request.method}
+
+        registry = get_registry()
+        registry.inc("http_requests_total", {**labels, "status": str(response.status_code)})
+        registry.observe("http_request_duration_seconds", labels, elapsed)
+        registry.observe("db_queries_per_request", {"route": route}, stats["db_queries"])
+        registry.observe("db_query_duration_seconds", {"route": route}, stats["db_seconds"])
+        for (cache, result), count in stats["cache"].items():
+            registry.inc("cache_requests_total", {"route": route, "cache": cache, "result": result}, count)
+        if stats["model_calls"]:
+            registry.observe("emotion_model_inference_seconds", {"route": route}, stats["model_seconds"])
+            registry.observe("emotion_model_wait_seconds", {"route": route}, stats["model_wait_seconds"])
+
+        if self.config["SERVER_TIMING"]:
+            response["Server-Timing"] = server_timing(stats, elapsed)
+        return response
+
+
+# 프록시를 거친 요청에 붙는 헤더 (이 경우 REMOTE_ADDR 은 프록시 주소)
+FORWARDED_HEADERS = ("X-Forwarded-For", "Forwarded", "X-Real-IP")
+
+
+def _metrics_allowed(request, config):
+    """
+    /metrics 접근 허용 여부
+    - TOKEN 이 있으면 Bearer 토큰만 확인
+    - 없으면 REMOTE_ADDR 이 ALLOWED_IPS 여야 하고, 프록시 헤더가 붙은 요청은 거부
+      (같은 서버의 리버스 프록시 뒤에서는 모든 외부 요청의 REMOTE_ADDR 이 127.0.0.1 이 되므로)
+    """
+    if config["TOKEN"]:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(token.strip(), config["TOKEN"])
+    if any(name in request.headers for name in FORWARDED_HEADERS):
+        return False
+    return request.META.get("REMOTE_ADDR") in config["ALLOWED_IPS"]
+
+
+def metrics_view(request):
+    """GET /metrics — 현재 워커 프로세스의 누적 값 (_metrics_allowed 통과한 요청만, 그 외는 404)"""
+    if not _metrics_allowed(request, get_config()):
+        raise Http404
+    return HttpResponse(get_registry().render(), content_type="text/plain; version=0.0.4; charset=utf-8")
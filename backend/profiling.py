@@ -0,0 +1,264 @@
+# backend/profiling.py
+# - 운영 요청용 샘플링 프로파일러 (선택 사용, 기본 꺼짐)
+# - 대상 요청: SAMPLE_RATE 비율로 무작위 선택 + HEADER 를 붙인 요청 중 뷰 실행 전에 확인된 것
+#   (HEADER 값이 SECRET 과 같거나, SECRET 이 없으면 JWT 사용자가 스태프)
+# - 요청 처리 스레드와 감정 모델 추론 스레드(INCLUDE_THREADS)의 호출 스택을 INTERVAL_MS 마다 수집
+#   (ASGI 에서는 sync 뷰·ORM 이 도는 sync_to_async 작업 스레드도 등록해 "worker" 로 함께 수집)
+#   → DRF 뷰 / ORM(쿼리 실행, 잠금 대기) / 규칙 매칭 / 모델 추론 중 어디서 시간이 가는지 확인
+# - 결과는 collapsed stack 형식 ("스레드;함수;함수 개수") → flamegraph.pl, speedscope 에서 바로 열림
+# - DIR 에 요청당 파일 1개, MAX_FILES 를 넘으면 오래된 파일부터 삭제
+# - 외부 의존성 없음 (sys._current_frames 기반, 별도 샘플링 스레드 1개)
+
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+DEFAULT_CONFIG = {
+    "ENABLED": False,
+    "SAMPLE_RATE": 0.0,                     # 무작위로 프로파일할 요청 비율 (0.0 ~ 1.0)
+    "HEADER": "X-Profile",                  # 스태프 사용자가 붙이면 해당 요청을 프로파일
+    "SECRET": "",                           # 설정하면 HEADER 값이 이 값일 때만 프로파일 (사용자 확인 생략)
+    "DIR": None,                            # 결과 디렉터리
+    "INTERVAL_MS": 5,                       # 샘플링 간격
+    "MAX_FILES": 200,                       # 보관할 최대 파일 수
+    "MAX_CONCURRENT": 1,                    # 동시에 프로파일하는 요청 수 (오버헤드 상한)
+    "INCLUDE_THREADS": ("emotion-model",),  # 요청 스레드와 함께 수집할 스레드 이름
+}
+
+_slots = None
+_slots_lock = threading.Lock()
+_rotate_lock = threading.Lock()
+_UNSAFE = re.compile(r"[^A-Za-z0-9_-]+")
+# 프로파일 중인 async 요청의 작업 스레드 집합 (sync_to_async 가 컨텍스트를 복사하므로 작업 스레드에서도 보임)
+_threads = ContextVar("profiler_threads", default=None)
+
+
+def get_config():
+    return {**DEFAULT_CONFIG, **getattr(settings, "PROFILER", {})}
+
+
+def register_thread():
+    """현재 스레드를 프로파일 중인 요청의 작업 스레드로 등록 (프로파일 중이 아니면 아무것도 안 함)"""
+    threads = _threads.get()
+    if threads is not None:
+        threads.add(threading.get_ident())
+
+
+def _frame_label(frame):
+    """스택 프레임 → "함수 (상위폴더/파일.py:첫 줄)" (collapsed 형식 구분자 ; 는 제거)"""
+    code = frame.f_code
+    path = Path(code.co_filename)
+    label = f"{code.co_name} ({path.parent.name}/{path.name}:{code.co_firstlineno})"
+    return label.replace(";", ":")
+
+
+def collapse(frame, root):
+    """프레임 → "root;바깥 함수;...;안쪽 함수" """
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join([root, *reversed(labels)])
+
+
+class Sampler:
+    """
+    스레드 하나(+ 이름으로 지정한 스레드들)의 스택을 주기적으로 수집
+    - start() / stop() 사이의 샘플을 stacks(Counter: collapsed stack → 횟수)에 누적
+    - threads 에 나중에 추가된 스레드(register_thread)도 매 샘플마다 다시 읽어 "worker" 로 수집
+    """
+
+    def __init__(self, thread_id, interval=0.005, include_threads=()):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.include_threads = set(include_threads)
+        self.threads = set()
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _targets(self):
+        targets = [("request", self.thread_id)]
+        targets.extend(("worker", ident) for ident in tuple(self.threads) if ident != self.thread_id)
+        for thread in threading.enumerate():
+            if thread.name in self.include_threads and thread.ident is not None:
+                targets.append((thread.name, thread.ident))
+        return targets
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            self.samples += 1
+            for root, ident in self._targets():
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = collapse(frame, root)
+                # 함께 수집하는 작업 스레드가 큐에서 일감을 기다리는 중이면 제외 (대기 시간이 그래프를 덮지 않도록)
+                if root != "request" and "/queue.py:" in stack:
+                    continue
+                self.stacks[stack] += 1
+
+
+def write_profile(directory, stacks, name, max_files):
+    """collapsed stack 파일 저장 후 오래된 파일 정리 → 저장 경로"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}.collapsed"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.most_common()), encoding="utf-8")
+    os.replace(tmp, path)
+
+    # 파일 이름이 시각으로 시작하므로 이름순 = 오래된 순
+    with _rotate_lock:
+        files = sorted(directory.glob("*.collapsed"))
+        for old in files[:max(len(files) - max_files, 0)]:
+            old.unlink(missing_ok=True)
+    return path
+
+
+def _acquire_slot(limit):
+    global _slots
+    with _slots_lock:
+        if _slots is None:
+            _slots = threading.BoundedSemaphore(limit)
+    return _slots.acquire(blocking=False)
+
+
+class ProfilerMiddleware:
+    """
+    샘플링 프로파일러 미들웨어
+    - 헤더 요청은 뷰 실행 전에 확인: SECRET 이 있으면 헤더 값 비교, 없으면 JWT 를 미리 인증해 스태프인지
+      (JWT 인증은 원래 뷰 안에서 일어나므로 여기서 한 번 더 — 사용자 캐시 덕분에 보통 쿼리 없음)
+      → 확인되지 않은 헤더는 무시하고 일반 요청처럼 SAMPLE_RATE 로만 선택 (프로파일 슬롯을 차지하지 않음)
+    - async 모드에서는 이벤트 루프 스레드 + 이 요청의 sync_to_async 작업 스레드(sync 뷰·미들웨어·ORM)를 수집
+      (루프 스레드에는 같은 루프의 다른 요청도 섞일 수 있음)
+    - 저장한 경우 응답 헤더 X-Profile-File 에 파일 이름
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_config()
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _active(self):
+        return self.config["ENABLED"] and bool(self.config["DIR"])
+
+    def _header_check(self, request):
+        """프로파일 요청 헤더 → None(헤더 없음) / True·False(SECRET 비교 결과) / "user"(사용자로 확인)"""
+        header = self.config["HEADER"]
+        value = request.headers.get(header) if header else None
+        if value is None:
+            return None
+        secret = self.config["SECRET"]
+        if not secret:
+            return "user"
+        return hmac.compare_digest(value.encode(), secret.encode())
+
+    def _staff(self, request):
+        from accounts.authentication import CachedJWTAuthentication
+        from rest_framework.exceptions import AuthenticationFailed
+        from rest_framework_simplejwt.exceptions import InvalidToken
+
+        try:
+            result = CachedJWTAuthentication().authenticate(request)
+        except (AuthenticationFailed, InvalidToken):
+            return False
+        # 이 미들웨어는 AuthenticationMiddleware 보다 앞이라 세션 사용자는 아직 없음
+        return bool(result and result[0].is_staff)
+
+    async def _astaff(self, request):
+        from accounts.authentication import AsyncJWTAuthentication
+        from rest_framework.exceptions import AuthenticationFailed
+        from rest_framework_simplejwt.exceptions import InvalidToken
+
+        try:
+            result = await AsyncJWTAuthentication().aauthenticate(request)
+        except (AuthenticationFailed, InvalidToken):
+            return False
+        return bool(result and result[0].is_staff)
+
+    def _wanted(self, by_header):
+        """프로파일 여부 — by_header: 확인을 마친 헤더 요청인지"""
+        if not by_header and random.random() >= self.config["SAMPLE_RATE"]:
+            return False
+        return _acquire_slot(self.config["MAX_CONCURRENT"])
+
+    def _start(self):
+        return Sampler(
+            threading.get_ident(), self.config["INTERVAL_MS"] / 1000, self.config["INCLUDE_THREADS"]
+        ).start()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self._active():
+            return self.get_response(request)
+        check = self._header_check(request)
+        if not self._wanted(self._staff(request) if check == "user" else bool(check)):
+            return self.get_response(request)
+        started = time.perf_counter()
+        sampler = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler.stop()
+            _slots.release()
+        return self._finish(request, response, sampler, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        if not self._active():
+            return await self.get_response(request)
+        check = self._header_check(request)
+        if not self._wanted(await self._astaff(request) if check == "user" else bool(check)):
+            return await self.get_response(request)
+        started = time.perf_counter()
+        sampler = self._start()
+        token = _threads.set(sampler.threads)
+        try:
+            # 요청의 thread_sensitive 작업 스레드(sync 뷰와 async ORM 이 실행될 곳)를 미리 등록
+            # 나머지 스레드는 perf.db_execute_wrapper 가 첫 쿼리 때 등록
+            await sync_to_async(register_thread)()
+            response = await self.get_response(request)
+        finally:
+            _threads.reset(token)
+            sampler.stop()
+            _slots.release()
+        return self._finish(request, response, sampler, time.perf_counter() - started)
+
+    def _finish(self, request, response, sampler, elapsed):
+        if not sampler.stacks:
+            return response
+        match = getattr(request, "resolver_match", None)
+        route = _UNSAFE.sub("_", match.route if match else "unmatched").strip("_") or "root"
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        name = f"{stamp}-{route}-{int(elapsed * 1000)}ms-{uuid.uuid4().hex[:8]}"
+        path = write_profile(self.config["DIR"], sampler.stacks, name, self.config["MAX_FILES"])
+        response["X-Profile-File"] = path.name
+        return response
@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     "drf_yasg",
 
     # Local Apps
+    "backend.apps.BackendConfig",
     "accounts",
     "wellness",
     "usage",
@@ -48,6 +49,8 @@ INSTALLED_APPS = [
 # Middleware
 # ---------------------
 MIDDLEWARE = [
+    "backend.perf.PerfMiddleware",  # 요청 단위 계측 (다른 미들웨어 시간까지 포함하도록 맨 앞)
+    "backend.profiling.ProfilerMiddleware",  # 샘플링 프로파일러 (PROFILER_ENABLED 일 때만)
     "corsheaders.middleware.CorsMiddleware",  # ✅ 반드시 최상단 부근에 추가
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -85,12 +88,91 @@ WSGI_APPLICATION = "backend.wsgi.application"
 # ---------------------
 # DATABASE
 # ---------------------
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# DB_PROFILE 환경변수로 선택: sqlite(기본) / postgres
+DB_PROFILE = env("DB_PROFILE", default="sqlite")
+
+if DB_PROFILE == "postgres":
+    # 커넥션 풀(psycopg3 pool) 사용 시 Django 는 CONN_MAX_AGE=0 을 요구
+    # → 풀을 끄면 CONN_MAX_AGE 로 요청 간 커넥션 재사용
+    POSTGRES_POOL = env.bool("POSTGRES_POOL", default=True)
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": env("POSTGRES_DB", default="detox"),
+            "USER": env("POSTGRES_USER", default="detox"),
+            "PASSWORD": env("POSTGRES_PASSWORD", default=""),
+            "HOST": env("POSTGRES_HOST", default="localhost"),
+            "PORT": env("POSTGRES_PORT", default="5432"),
+            "CONN_MAX_AGE": 0 if POSTGRES_POOL else env.int("DB_CONN_MAX_AGE", default=60),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "pool": {
+                    "min_size": env.int("POSTGRES_POOL_MIN", default=2),
+                    "max_size": env.int("POSTGRES_POOL_MAX", default=10),
+                    "timeout": env.int("POSTGRES_POOL_TIMEOUT", default=10),
+                },
+            } if POSTGRES_POOL else {},
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": env("SQLITE_PATH", default=str(BASE_DIR / "db.sqlite3")),
+            "OPTIONS": {
+                # 쓰기 트랜잭션은 시작부터 RESERVED 잠금 → 읽기→쓰기 승격 중 "database is locked" 방지
+                "transaction_mode": "IMMEDIATE",
+                # 잠금 대기(초) — 바로 "database is locked" 대신 재시도 (sqlite3 busy_timeout 과 같은 설정)
+                "timeout": env.int("SQLITE_TIMEOUT", default=20),
+            },
+        }
+    }
+
+# SQLITE_TUNING=False 로 끄면 SQLite/Django 기본값
+# (rollback journal, synchronous=FULL, DEFERRED 트랜잭션, 잠금 대기 5초)
+SQLITE_TUNING = env.bool("SQLITE_TUNING", default=True)
+if DB_PROFILE != "postgres" and not SQLITE_TUNING:
+    DATABASES["default"]["OPTIONS"] = {}
+
+# SQLite 커넥션마다 적용할 PRAGMA (backend/db.py 의 connection_created 시그널)
+# 잠금 대기(busy_timeout)는 여기서 따로 정하지 않음 — 위 OPTIONS["timeout"] 하나로 관리
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",          # 읽기와 쓰기가 서로 막지 않음
+    "synchronous": "NORMAL",        # WAL 에서는 NORMAL 로도 커밋 내구성 충분
+    "mmap_size": 268435456,         # 256MB 메모리 맵 읽기
+    "cache_size": -20000,           # 약 20MB 페이지 캐시
+    "temp_store": "MEMORY",
+} if SQLITE_TUNING else {}
+
+# ---------------------
+# CACHE
+# ---------------------
+# CACHE_BACKEND 환경변수로 선택: locmem(기본, 프로세스별) / file / db
+# - file: 같은 서버의 여러 워커가 공유 (CACHE_DIR)
+# - db: 여러 서버가 공유, 사용 전 `python manage.py createcachetable` 필요
+CACHE_BACKEND = env("CACHE_BACKEND", default="locmem")
+if CACHE_BACKEND == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": env("CACHE_DIR", default=str(BASE_DIR / "var" / "cache")),
+        }
+    }
+elif CACHE_BACKEND == "db":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "detox-default",
+            "OPTIONS": {"MAX_ENTRIES": env.int("CACHE_MAX_ENTRIES", default=10000)},
+        }
     }
-}
 
 # ---------------------
 # PASSWORD VALIDATION (기본 유지)
@@ -127,6 +209,109 @@ AUTH_USER_MODEL = "accounts.User"
 # ---------------------
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ),
 }
+
+# 사용자 설정 / 개인 설정 읽기 캐시 (wellness.settings_cache) — GET 은 캐시 + ETag(304)
+WELLNESS_SETTINGS_CACHE = {
+    "ENABLED": env.bool("SETTINGS_CACHE_ENABLED", default=True),
+    "ALIAS": "default",
+    "TTL_SECONDS": env.int("SETTINGS_CACHE_TTL_SECONDS", default=300),
+}
+
+# JWT 인증 사용자 캐시 (accounts.authentication) — 요청마다 User SELECT 생략
+JWT_USER_CACHE = {
+    "ENABLED": env.bool("JWT_USER_CACHE_ENABLED", default=True),
+    "ALIAS": "default",
+    "TTL_SECONDS": env.int("JWT_USER_CACHE_TTL_SECONDS", default=60),
+    "VERSION": 2,
+}
+
+# 감정에 따른 목표 사용 시간 조정 (wellness.logic_goal)
+# - INLINE_ADJUST: 챗봇 메시지마다 바로 조정. 야간 일괄 조정(manage.py recalibrate_goals)을 쓰려면 False
+WELLNESS_GOALS = {
+    "INLINE_ADJUST": env.bool("GOAL_INLINE_ADJUST", default=True),
+}
+
+# ---------------------
+# ✅ 감정 분류 모델 (wellness.inference)
+# ---------------------
+EMOTION_MODEL = {
+    "ENABLED": env.bool("EMOTION_MODEL_ENABLED", default=True),
+    "NAME": "alsgyu/sentiment-analysis-fine-tuned-model",
+    "MAX_BATCH_SIZE": env.int("EMOTION_MODEL_MAX_BATCH_SIZE", default=16),
+    "MAX_WAIT_MS": env.int("EMOTION_MODEL_MAX_WAIT_MS", default=10),
+    "TIMEOUT_MS": env.int("EMOTION_MODEL_TIMEOUT_MS", default=3000),
+    "TORCH_THREADS": env.int("EMOTION_MODEL_TORCH_THREADS", default=1),
+    # 가중치 로컬 캐시 (처음 한 번만 허브에서 받아 저장)
+    "LOCAL_DIR": env("EMOTION_MODEL_LOCAL_DIR", default=str(BASE_DIR / "models" / "sentiment")),
+    # 추론 백엔드: "torch" (fp32) / "onnx" (manage.py export_emotion_onnx 로 만든 int8 그래프, CPU 서빙용)
+    "BACKEND": env("EMOTION_MODEL_BACKEND", default="torch"),
+    "MAX_LENGTH": env.int("EMOTION_MODEL_MAX_LENGTH", default=128),
+    # 토큰 길이 구간별로 배치를 나눠 패딩 낭비를 줄임 (마지막 구간은 MAX_LENGTH)
+    "LENGTH_BUCKETS": env.list("EMOTION_MODEL_LENGTH_BUCKETS", cast=int, default=[16, 32, 64]),
+    "PENDING_BATCHES": env.int("EMOTION_MODEL_PENDING_BATCHES", default=4),
+    "ONNX_PATH": env("EMOTION_MODEL_ONNX_PATH", default=str(BASE_DIR / "models" / "sentiment-onnx" / "model.int8.onnx")),
+    # 앱 시작 시 사전 로드: "" (첫 사용 시 로드) / "background" / "blocking"
+    # 웹 워커에만 켜고, migrate 등 관리 명령에서는 비워둘 것
+    "WARMUP": env("EMOTION_MODEL_WARMUP", default=""),
+}
+
+# 감정 분류 결과 캐시 (wellness.cache) — 반복되는 짧은 메시지의 분류/추론 생략
+EMOTION_CACHE = {
+    "ENABLED": env.bool("EMOTION_CACHE_ENABLED", default=True),
+    "MAX_SIZE": env.int("EMOTION_CACHE_MAX_SIZE", default=10000),
+    "TTL_SECONDS": env.int("EMOTION_CACHE_TTL_SECONDS", default=3600),
+    "POLICY": env("EMOTION_CACHE_POLICY", default="lru"),
+}
+
+# ---------------------
+# ✅ 로그 write-behind (wellness.writebehind)
+# ---------------------
+# 켜면 EmotionLog / AiCoachingLog INSERT 가 응답 경로에서 빠지고 백그라운드에서 bulk_create
+WELLNESS_LOG_WRITER = {
+    "ENABLED": env.bool("LOG_WRITE_BEHIND", default=False),
+    "FLUSH_SIZE": env.int("LOG_WRITE_BEHIND_FLUSH_SIZE", default=200),
+    "FLUSH_INTERVAL": env.float("LOG_WRITE_BEHIND_FLUSH_INTERVAL", default=1.0),
+    "MAX_QUEUE": env.int("LOG_WRITE_BEHIND_MAX_QUEUE", default=10000),
+    "SPILL_PATH": BASE_DIR / "var" / "log_spill.sqlite3",
+    # 재기록 중 표시가 이 시간(초)보다 오래되면 그 워커가 죽은 것으로 보고 다른 워커가 가져감
+    "SPILL_LEASE": env.int("LOG_WRITE_BEHIND_SPILL_LEASE", default=300),
+}
+
+# ---------------------
+# ✅ 오래된 사용 기록 보관 (usage.archive)
+# ---------------------
+# AFTER_DAYS 보다 오래된 달의 AppUsage 를 사용자·월별 열 파일로 옮김 (manage.py archive_usage)
+USAGE_ARCHIVE = {
+    "DIR": env("USAGE_ARCHIVE_DIR", default=str(BASE_DIR / "var" / "usage_archive")),
+    "AFTER_DAYS": env.int("USAGE_ARCHIVE_AFTER_DAYS", default=180),
+}
+
+# ---------------------
+# ✅ 요청 단위 성능 계측 (backend.perf)
+# ---------------------
+# 응답 Server-Timing 헤더 + /metrics (Prometheus 텍스트, 워커 프로세스별 누적)
+PERF_METRICS = {
+    "ENABLED": env.bool("PERF_METRICS_ENABLED", default=True),
+    "SERVER_TIMING": env.bool("PERF_SERVER_TIMING", default=DEBUG),   # 운영에서는 내부 시간 노출 주의
+    "ALLOWED_IPS": env.list("PERF_METRICS_ALLOWED_IPS", default=["127.0.0.1", "::1"]),
+    # 같은 서버의 리버스 프록시 뒤에 있으면 REMOTE_ADDR 이 항상 127.0.0.1 → 토큰을 설정할 것
+    # (토큰이 없으면 X-Forwarded-For 등 프록시 헤더가 붙은 요청은 거부)
+    "TOKEN": env("PERF_METRICS_TOKEN", default=""),
+}
+
+# ---------------------
+# ✅ 샘플링 프로파일러 (backend.profiling)
+# ---------------------
+# 일부 요청(비율) 또는 스태프가 X-Profile 헤더를 붙인 요청의 호출 스택을 collapsed 형식으로 저장
+PROFILER = {
+    "ENABLED": env.bool("PROFILER_ENABLED", default=False),
+    "SAMPLE_RATE": env.float("PROFILER_SAMPLE_RATE", default=0.0),
+    "DIR": env("PROFILER_DIR", default=str(BASE_DIR / "var" / "profiles")),
+    "INTERVAL_MS": env.int("PROFILER_INTERVAL_MS", default=5),
+    "MAX_FILES": env.int("PROFILER_MAX_FILES", default=200),
+    # X-Profile 헤더 값으로 쓸 공유 비밀 (비워두면 JWT 사용자가 스태프인지 뷰 실행 전에 확인)
+    "SECRET": env("PROFILER_SECRET", default=""),
+}
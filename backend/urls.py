@@ -18,10 +18,16 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include   # ← include 추가하기
 
+from backend.perf import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
 
     path("api/accounts/", include("accounts.urls")), # ✅ accounts 앱 URL 연결
 
     path("api/wellness/", include("wellness.urls")),  # ✅ wellness 라우팅 연결
+
+    path("api/usage/", include("usage.urls")),  # ✅ usage(앱 사용 기록) 라우팅 연결
+
+    path("metrics", metrics_view, name="metrics"),  # ✅ Prometheus 수집용 (로컬 IP 또는 토큰)
 ]
@@ -0,0 +1,170 @@
+# benchmarks/bench_async.py
+# - uvicorn(ASGI) 에서 동기 DRF 뷰 vs async 뷰 동시 접속 처리량 비교
+# - 임시 SQLite DB 에 사용자/JWT 를 만들고 uvicorn 을 띄운 뒤 httpx 로 동시 요청
+#   me        : /api/accounts/me/               vs /api/accounts/async/me/
+#   settings  : /api/wellness/settings/         vs /api/wellness/async/settings/
+#   chatbot   : /api/wellness/chatbot/message/  vs /api/wellness/async/chatbot/message/
+# 실행: python benchmarks/bench_async.py [--clients 128] [--requests 20] [--workers 1] [--output result.json]
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+ENDPOINTS = {
+    "me": ("GET", "/api/accounts/me/", "/api/accounts/async/me/"),
+    "settings": ("GET", "/api/wellness/settings/", "/api/wellness/async/settings/"),
+    "chatbot": ("POST", "/api/wellness/chatbot/message/", "/api/wellness/async/chatbot/message/"),
+}
+
+MESSAGES = ["오늘 너무 피곤해", "불안해서 잠이 안 와", "그냥 그래", "기분 좋다", "아무 것도 하기 싫어"]
+
+
+def setup_users(count):
+    """DB 마이그레이션 후 사용자 생성, access token 목록 출력 (자식 프로세스에서 실행됨)"""
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+    django.setup()
+
+    from django.core.management import call_command
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from accounts.models import User
+
+    call_command("migrate", verbosity=0)
+    tokens = []
+    for i in range(count):
+        user = User.objects.create_user(f"bench{i}", f"bench{i}@example.com", "pw")
+        tokens.append(str(AccessToken.for_user(user)))
+    return tokens
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("uvicorn 이 시작되지 않았습니다")
+
+
+def _summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2) if latencies else None,
+    }
+
+
+async def hammer(base_url, method, path, tokens, requests_per_client):
+    import httpx
+
+    limits = httpx.Limits(max_connections=len(tokens), max_keepalive_connections=len(tokens))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+
+        async def one_client(token):
+            headers = {"Authorization": f"Bearer {token}"}
+            latencies, errors = [], 0
+            for n in range(requests_per_client):
+                start = time.perf_counter()
+                try:
+                    if method == "POST":
+                        res = await client.post(
+                            path, json={"message": MESSAGES[n % len(MESSAGES)]}, headers=headers,
+                        )
+                    else:
+                        res = await client.get(path, headers=headers)
+                    ok = res.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+            return latencies, errors
+
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(*(one_client(t) for t in tokens))
+        elapsed = time.perf_counter() - start
+    latencies = [lat for lats, _ in outcomes for lat in lats]
+    return _summarize(latencies, sum(e for _, e in outcomes), elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sync vs async 뷰 동시 접속 부하 테스트")
+    parser.add_argument("--clients", type=int, default=128, help="동시 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=20, help="클라이언트당 요청 수")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--endpoints", nargs="*", default=list(ENDPOINTS))
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--setup", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.setup is not None:
+        print(json.dumps(setup_users(args.setup)))
+        return
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DB_PROFILE": "sqlite",
+            "SQLITE_PATH": os.path.join(tmp, "bench.sqlite3"),
+            "SQLITE_TUNING": "True",
+            "EMOTION_MODEL_ENABLED": "False",
+        }
+        out = subprocess.run(
+            [sys.executable, __file__, "--setup", str(args.clients)],
+            cwd=BASE_DIR, env=env, check=True, capture_output=True, text=True,
+        )
+        tokens = json.loads(out.stdout.strip().splitlines()[-1])
+
+        port = _free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.asgi:application",
+             "--port", str(port), "--workers", str(args.workers),
+             "--log-level", "warning", "--no-access-log"],
+            cwd=BASE_DIR, env=env,
+        )
+        try:
+            _wait_for_port(port)
+            base_url = f"http://127.0.0.1:{port}"
+            for name in args.endpoints:
+                method, sync_path, async_path = ENDPOINTS[name]
+                for kind, path in (("sync", sync_path), ("async", async_path)):
+                    r = asyncio.run(hammer(base_url, method, path, tokens, args.requests))
+                    results[f"{name}-{kind}"] = r
+                    print(f"{name:9s} {kind:6s} {r['throughput_rps']:8.1f} req/s  "
+                          f"p50={r['p50_ms']}ms p95={r['p95_ms']}ms errors={r['errors']}")
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
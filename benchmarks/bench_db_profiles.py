@@ -0,0 +1,160 @@
+# benchmarks/bench_db_profiles.py
+# - DB 프로필별 동시 쓰기 부하 테스트 (챗봇 메시지 / 사용 기록 업로드 엔드포인트)
+# - 프로필마다 별도 프로세스에서 임시 DB 를 만들어 측정 후 결과를 비교 출력
+#   sqlite-default : SQLite/Django 기본값 (PRAGMA 튜닝, IMMEDIATE 트랜잭션, 잠금 대기 연장 모두 없음)
+#   sqlite-tuned   : WAL + synchronous=NORMAL + mmap + IMMEDIATE 트랜잭션 + 잠금 대기 SQLITE_TIMEOUT 초
+#   postgres       : POSTGRES_* 환경변수가 설정된 경우에만 (테스트 DB 를 만들고 끝나면 삭제)
+# 실행: python benchmarks/bench_db_profiles.py [--clients 16] [--requests 50] [--output result.json]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+PROFILES = {
+    "sqlite-default": {"DB_PROFILE": "sqlite", "SQLITE_TUNING": "False"},
+    "sqlite-tuned": {"DB_PROFILE": "sqlite", "SQLITE_TUNING": "True"},
+    "postgres": {"DB_PROFILE": "postgres"},
+}
+
+MESSAGES = ["오늘 너무 피곤해", "불안해서 잠이 안 와", "그냥 그래", "기분 좋다", "아무 것도 하기 싫어"]
+
+
+def _ndjson(user_index, request_index, rows=200):
+    lines = []
+    for i in range(rows):
+        minute = (request_index * rows + i) % (24 * 60)
+        day = 1 + (request_index * rows + i) // (24 * 60)
+        lines.append(json.dumps({
+            "app_name": f"app-{i % 20}",
+            "start_time": f"2025-11-{day:02d}T{minute // 60:02d}:{minute % 60:02d}:00+09:00",
+            "end_time": f"2025-11-{day:02d}T{minute // 60:02d}:{minute % 60:02d}:40+09:00",
+        }))
+    return "\n".join(lines).encode("utf-8")
+
+
+def _summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2) if latencies else None,
+    }
+
+
+def run_profile(clients, requests_per_client):
+    """현재 프로세스의 DB 설정으로 측정 (자식 프로세스에서 실행됨)"""
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection, connections
+    from rest_framework.test import APIClient
+
+    from accounts.models import User
+
+    postgres = connection.vendor == "postgresql"
+    if postgres:
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    else:
+        call_command("migrate", verbosity=0)
+
+    users = [
+        User.objects.create_user(f"bench{i}", f"bench{i}@example.com", "pw")
+        for i in range(clients)
+    ]
+
+    def hammer(kind, user_index):
+        client = APIClient()
+        client.force_authenticate(users[user_index])
+        latencies, errors = [], 0
+        for n in range(requests_per_client):
+            start = time.perf_counter()
+            try:
+                if kind == "chatbot":
+                    res = client.post(
+                        "/api/wellness/chatbot/message/",
+                        {"message": MESSAGES[n % len(MESSAGES)]}, format="json",
+                    )
+                else:
+                    res = client.generic(
+                        "POST", "/api/usage/sessions/bulk/", _ndjson(user_index, n),
+                        content_type="application/x-ndjson",
+                    )
+                ok = res.status_code == 200
+            except Exception:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+        connections.close_all()
+        return latencies, errors
+
+    results = {}
+    for kind in ("chatbot", "ingest"):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            outcomes = list(pool.map(lambda i: hammer(kind, i), range(clients)))
+        elapsed = time.perf_counter() - start
+        latencies = [lat for lats, _ in outcomes for lat in lats]
+        results[kind] = _summarize(latencies, sum(e for _, e in outcomes), elapsed)
+
+    if postgres:
+        connection.creation.destroy_test_db(connection.settings_dict["NAME"], verbosity=0)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB 프로필별 부하 테스트")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=50, help="클라이언트당 요청 수")
+    parser.add_argument("--profiles", nargs="*", default=list(PROFILES))
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_profile(args.clients, args.requests)))
+        return
+
+    results = {}
+    for name in args.profiles:
+        if name == "postgres" and not os.environ.get("POSTGRES_HOST"):
+            print(f"{name:15s} 건너뜀 (POSTGRES_HOST 미설정)")
+            continue
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                **os.environ, **PROFILES[name],
+                "SQLITE_PATH": os.path.join(tmp, "bench.sqlite3"),
+                "EMOTION_MODEL_ENABLED": "False",
+            }
+            out = subprocess.run(
+                [sys.executable, __file__, "--child",
+                 "--clients", str(args.clients), "--requests", str(args.requests)],
+                cwd=BASE_DIR, env=env, check=True, capture_output=True, text=True,
+            )
+        results[name] = json.loads(out.stdout.strip().splitlines()[-1])
+        for kind, r in results[name].items():
+            print(f"{name:15s} {kind:8s} {r['throughput_rps']:8.1f} req/s  "
+                  f"p50={r['p50_ms']}ms p95={r['p95_ms']}ms errors={r['errors']}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
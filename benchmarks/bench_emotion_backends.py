@@ -0,0 +1,148 @@
+# benchmarks/bench_emotion_backends.py
+# - 감정 모델 추론 백엔드 비교: torch(fp32) / onnx-fp32 / onnx-int8
+#   로드 시간, 최대 RSS, 배치 1 지연(p50/p95), 배치 16 처리량,
+#   레이블 표본(benchmarks/data/emotion_labeled.jsonl) 정확도와 torch 대비 예측 일치율
+# - 백엔드마다 새 인터프리터에서 실행 (RSS 가 서로 섞이지 않도록)
+# - 먼저 python manage.py export_emotion_onnx 로 ONNX 그래프 생성 필요
+# 실행:
+#   python benchmarks/bench_emotion_backends.py [--output result.json]
+#   python benchmarks/bench_emotion_backends.py --max-accuracy-drop 4.0   # torch 대비 정확도가 4%p 넘게 떨어지면 종료 코드 1
+# - 표본이 50문장이라 예측 1개가 바뀌면 2%p → 기본 허용치는 2문장(4%p)
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+DATA = BASE_DIR / "benchmarks" / "data" / "emotion_labeled.jsonl"
+
+# 프로필 이름 → (BACKEND, ONNX 파일 이름)
+PROFILES = {
+    "torch": ("torch", None),
+    "onnx-fp32": ("onnx", "model.onnx"),
+    "onnx-int8": ("onnx", "model.int8.onnx"),
+}
+
+
+def load_sample():
+    with open(DATA, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run_profile(args):
+    """자식 프로세스: 백엔드 1개 측정 → JSON 한 줄 출력"""
+    import resource
+
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+    django.setup()
+
+    from wellness.inference import get_config
+    from wellness.model_backends import load_backend
+
+    backend, onnx_file = PROFILES[args.profile]
+    config = {**get_config(), "BACKEND": backend, "MAX_LENGTH": args.max_length}
+    if onnx_file:
+        config["ONNX_PATH"] = str(Path(args.onnx_dir or Path(config["ONNX_PATH"]).parent) / onnx_file)
+
+    started = time.perf_counter()
+    classify = load_backend(config)
+    load_seconds = time.perf_counter() - started
+
+    sample = load_sample()
+    texts = [row["text"] for row in sample]
+    predictions = [r["label"] for i in range(0, len(texts), 16) for r in classify(texts[i:i + 16])]
+
+    # 배치 1 지연 (워밍업 후)
+    for text in texts[:5]:
+        classify([text])
+    latencies = []
+    for i in range(args.requests):
+        start = time.perf_counter()
+        classify([texts[i % len(texts)]])
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    # 배치 16 처리량
+    batch = (texts * (16 // len(texts) + 1))[:16]
+    start = time.perf_counter()
+    for _ in range(args.batches):
+        classify(batch)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "load_s": round(load_seconds, 3),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),  # Linux: KB 단위
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000, 3),
+        "batch16_texts_per_s": round(16 * args.batches / batch_seconds, 1),
+        "predictions": predictions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감정 모델 추론 백엔드 비교")
+    parser.add_argument("--profiles", nargs="*", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--onnx-dir", help="ONNX 그래프 폴더 (기본: EMOTION_MODEL_ONNX_PATH 의 폴더)")
+    parser.add_argument("--max-length", type=int, default=128)
+    parser.add_argument("--requests", type=int, default=200, help="배치 1 지연 측정 횟수")
+    parser.add_argument("--batches", type=int, default=30, help="배치 16 처리량 측정 횟수")
+    parser.add_argument("--max-accuracy-drop", type=float, default=None,
+                        help="torch 대비 허용 정확도 하락 (%%p, 기본: 표본 2문장 = 50문장이면 4%%p)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--profile", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        print(json.dumps(run_profile(args), ensure_ascii=False))
+        return
+
+    expected = [row["label"] for row in load_sample()]
+    if args.max_accuracy_drop is None:
+        # 한 문장 = 100 / 표본 수 %p, 양자화로 1~2문장이 바뀌는 정도는 허용
+        args.max_accuracy_drop = 2 * 100 / len(expected)
+    results = {}
+    for name in args.profiles:
+        out = subprocess.run(
+            [sys.executable, __file__, *sys.argv[1:], "--profile", name],
+            cwd=BASE_DIR, capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            sys.exit(f"{name} 실패:\n{out.stderr}")
+        results[name] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    reference = results.get("torch", {}).get("predictions")
+    for name, r in results.items():
+        predictions = r.pop("predictions")
+        r["accuracy"] = round(sum(p == e for p, e in zip(predictions, expected)) / len(expected) * 100, 1)
+        if reference:
+            r["agreement_with_torch"] = round(
+                sum(p == q for p, q in zip(predictions, reference)) / len(reference) * 100, 1
+            )
+        metrics = "  ".join(f"{k}={v}" for k, v in r.items())
+        print(f"{name:10s} {metrics}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(
+            {"samples": len(expected), "max_length": args.max_length, "results": results},
+            indent=2, ensure_ascii=False,
+        ))
+
+    if "torch" in results:
+        base = results["torch"]["accuracy"]
+        dropped = [name for name, r in results.items() if round(base - r["accuracy"], 1) > args.max_accuracy_drop]
+        if dropped:
+            print(f"\ntorch({base}%) 대비 정확도 하락이 {args.max_accuracy_drop}%p 를 넘음: {', '.join(dropped)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_startup.py
+# - `manage.py check` 기동 시간 / 최대 메모리 측정
+# - 감정 모델 사전 로드 없이(기본) vs 사전 로드(EMOTION_MODEL_WARMUP=blocking) 비교
+# 실행: python benchmarks/bench_startup.py [--runs 5] [--output result.json]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+PROFILES = {
+    "lazy": {"EMOTION_MODEL_WARMUP": ""},
+    "warmup": {"EMOTION_MODEL_WARMUP": "blocking"},
+}
+
+# 모델 관련 모듈이 실제로 import 됐는지 확인하는 코드
+PROBE = (
+    "import os, sys, django;"
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings');"
+    "django.setup();"
+    "print(sorted(m for m in ('torch', 'transformers') if m in sys.modules))"
+)
+
+
+def run_once(extra_env):
+    env = {**os.environ, **extra_env}
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "manage.py", "check"],
+        cwd=BASE_DIR, env=env, check=True, capture_output=True,
+    )
+    return time.perf_counter() - start
+
+
+def probe_imports(extra_env):
+    env = {**os.environ, **extra_env}
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BASE_DIR, env=env, check=True, capture_output=True, text=True,
+    )
+    return out.stdout.strip().splitlines()[-1]
+
+
+def measure_rss(extra_env):
+    """자식 프로세스 1회 실행의 최대 RSS(MB) — 프로필마다 새 인터프리터에서 측정"""
+    code = (
+        "import resource, subprocess, sys;"
+        "subprocess.run([sys.executable, 'manage.py', 'check'], check=True, capture_output=True);"
+        "print(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)"
+    )
+    env = {**os.environ, **extra_env}
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=BASE_DIR, env=env,
+        check=True, capture_output=True, text=True,
+    )
+    return int(out.stdout.strip()) / 1024  # Linux: KB 단위
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results = {}
+    for name, extra_env in PROFILES.items():
+        times = [run_once(extra_env) for _ in range(args.runs)]
+        results[name] = {
+            "runs": args.runs,
+            "median_s": round(statistics.median(times), 4),
+            "min_s": round(min(times), 4),
+            "max_rss_mb": round(measure_rss(extra_env), 1),
+            "heavy_modules": probe_imports(extra_env),
+        }
+        print(f"{name:8s} median={results[name]['median_s']:.3f}s "
+              f"rss={results[name]['max_rss_mb']:.0f}MB "
+              f"modules={results[name]['heavy_modules']}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+# benchmarks/bench_suite.py
+# - 분류 / API 주요 경로 벤치마크 모음 (CPU 만으로 오프라인 측정, 결과 JSON + 기준값 비교)
+#   classify        : wellness.chatbot.classify_emotion (캐시 비움 → 서로 다른 문장 위주)
+#   classify_cached : 같은 문장 반복 (분류 캐시 적중 경로)
+#   analyze_final   : wellness.emotion_analysis.analyze_emotion_final
+#   chatbot         : POST /api/wellness/chatbot/message/ (테스트 클라이언트, 요청당 쿼리 수 포함)
+#   ingest_<N>      : POST /api/usage/sessions/bulk/ 에 N 행 NDJSON 1건
+# - 임시 SQLite DB 를 쓰는 별도 프로세스에서 실행, 감정 모델은 기본 비활성 (--with-model 로 사용)
+# - 말뭉치는 seed 고정 생성이라 같은 인자면 같은 입력
+# 실행:
+#   python benchmarks/bench_suite.py --output result.json
+#   python benchmarks/bench_suite.py --baseline benchmarks/baseline.json   # 기준 대비 회귀 시 종료 코드 1
+#     (기준값의 meta.args 와 측정 인자가 다르면 측정하지 않고 종료)
+#   python benchmarks/bench_suite.py --save-baseline benchmarks/baseline.json
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+# 지표 → 높을수록 좋은지 여부 (비교 시 방향)
+HIGHER_IS_BETTER = {"ops_per_s": True, "rows_per_s": True, "p50_ms": False, "p95_ms": False}
+# meta.args 에 기록하는 인자 — 기준값과 다르면 같은 측정이 아니므로 비교하지 않음
+META_ARGS = ("corpus", "requests", "ingest_rows", "repeat", "with_model")
+
+# 말뭉치 조각: 룰에 걸리는 표현과 걸리지 않는 표현을 섞음
+SUBJECTS = ["오늘", "요즘", "아침부터", "회사에서", "학교에서", "집에 와서", "주말 내내", "방금"]
+FEELINGS = [
+    "너무 피곤해", "지친다", "기운이 하나도 없네", "불안해서 잠이 안 와", "발표가 걱정돼",
+    "정말 짜증나", "화가 나", "슬퍼서 눈물이 나", "아무렇지도 않아", "기분 좋다",
+    "컨디션 좋아", "마음이 편안해", "아무 것도 하기 싫어", "우울하다", "그냥 그래",
+    "밥을 먹었어", "친구랑 통화했어", "산책을 했어", "영화를 봤어", "일이 많았어",
+]
+ENDINGS = ["", ".", "!", "...", " ㅠㅠ", " ㅎㅎ", " 진짜로", " 왜 그럴까"]
+
+
+def make_corpus(size, seed=42):
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(SUBJECTS)} {rng.choice(FEELINGS)}{rng.choice(ENDINGS)} #{i % 997}"
+        for i in range(size)
+    ]
+
+
+def _ndjson(rows, seed=7):
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    lines = []
+    for i in range(rows):
+        start = base + timedelta(minutes=i)
+        lines.append(json.dumps({
+            "app_name": f"app-{rng.randrange(200)}",
+            "category": rng.choice(["Video", "Social", "Game", None]),
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(seconds=rng.randrange(5, 55))).isoformat(),
+        }))
+    return "\n".join(lines).encode("utf-8")
+
+
+def _latency_summary(latencies):
+    latencies = sorted(latencies)
+    return {
+        "ops_per_s": round(len(latencies) / sum(latencies), 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000, 3),
+    }
+
+
+def _best_of(repeat, fn):
+    """repeat 번 실행해 가장 빠른 회차 (소요 시간, 결과)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, result)
+    return best
+
+
+def run_suite(args):
+    """현재 프로세스의 (임시) DB 로 전체 측정 (자식 프로세스에서 실행됨)"""
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+
+    from accounts.models import User
+    from usage.models import AppCategory, AppUsage
+    from wellness.cache import get_classification_cache
+    from wellness.chatbot import classify_emotion
+    from wellness.emotion_analysis import analyze_emotion_final
+    from wellness.models import UserSettings
+
+    call_command("migrate", verbosity=0)
+    corpus = make_corpus(args.corpus)
+    cache = get_classification_cache()
+    results = {}
+
+    def over_corpus(fn, texts, clear_cache):
+        def run():
+            if clear_cache:
+                cache.clear()
+            for text in texts:
+                fn(text)
+        elapsed, _ = _best_of(args.repeat, run)
+        return {"items": len(texts), "ops_per_s": round(len(texts) / elapsed, 1)}
+
+    results["classify"] = over_corpus(classify_emotion, corpus, clear_cache=True)
+    results["classify_cached"] = over_corpus(classify_emotion, corpus[:100] * (len(corpus) // 100), clear_cache=False)
+    results["analyze_final"] = over_corpus(analyze_emotion_final, corpus, clear_cache=True)
+
+    # 챗봇 엔드포인트 (인증은 force_authenticate → 뷰 + 미들웨어 + ORM 경로)
+    # repeat 회차 중 중앙값이 가장 낮은 회차를 사용
+    user = User.objects.create_user("bench", "bench@example.com", "pw")
+    UserSettings.objects.create(user=user, target_daily_usage_min=120)
+    client = APIClient()
+    client.force_authenticate(user)
+    # 측정 전 1회 호출 (URL 해석·뷰/시리얼라이저 첫 로드 비용이 첫 회차 처리량에 섞이지 않도록)
+    client.post("/api/wellness/chatbot/message/", {"message": "워밍업"}, format="json")
+    best = None
+    for _ in range(args.repeat):
+        cache.clear()
+        latencies = []
+        with CaptureQueriesContext(connection) as ctx:
+            for text in corpus[:args.requests]:
+                start = time.perf_counter()
+                res = client.post("/api/wellness/chatbot/message/", {"message": text}, format="json")
+                latencies.append(time.perf_counter() - start)
+                if res.status_code != 200:
+                    raise RuntimeError(f"chatbot 응답 {res.status_code}: {res.content[:200]}")
+        summary = {
+            "items": len(latencies), **_latency_summary(latencies),
+            "queries_per_request": round(len(ctx.captured_queries) / len(latencies), 2),
+        }
+        if best is None or summary["p50_ms"] < best["p50_ms"]:
+            best = summary
+    results["chatbot"] = best
+
+    # 사용 기록 업로드 (회차마다 새 사용자 → 중복 없이 전부 INSERT)
+    for name in ("Video", "Social", "Game"):
+        AppCategory.objects.get_or_create(category_name=name)
+    for rows in args.ingest_rows:
+        body = _ndjson(rows)
+        # 큰 업로드는 반복하지 않음 (DB 가 커지면서 회차마다 조건이 달라짐)
+        repeat = args.repeat if rows <= 10000 else 1
+        # 비밀번호 해시 비용이 측정에 섞이지 않도록 사용자는 미리 생성
+        start_index = User.objects.count()
+        users = iter([
+            User.objects.create_user(f"ingest{n}", f"ingest{n}@example.com", "pw")
+            for n in range(start_index, start_index + repeat)
+        ])
+
+        def ingest():
+            ingest_user = next(users)
+            client.force_authenticate(ingest_user)
+            res = client.generic("POST", "/api/usage/sessions/bulk/", body, content_type="application/x-ndjson")
+            if res.status_code != 200 or res.data["accepted"] != rows:
+                raise RuntimeError(f"ingest {rows}행 실패: {res.status_code} {str(res.data)[:200]}")
+            return ingest_user
+
+        elapsed, ingest_user = _best_of(repeat, ingest)
+        results[f"ingest_{rows}"] = {
+            "items": rows,
+            "rows_per_s": round(rows / elapsed, 1),
+            "stored": AppUsage.objects.filter(user=ingest_user).count(),
+        }
+    return results
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def args_mismatch(args, baseline):
+    """기준값과 다른 측정 인자 목록 [(인자, 기준, 현재)]"""
+    recorded = baseline.get("meta", {}).get("args", {})
+    return [(key, recorded.get(key), args[key]) for key in META_ARGS if recorded.get(key) != args[key]]
+
+
+def compare(results, baseline, tolerance):
+    """기준값 대비 변화율 목록 [(벤치, 지표, 기준, 현재, 변화율 %, 회귀 여부)]"""
+    rows = []
+    for bench, metrics in baseline.get("results", {}).items():
+        current = results.get(bench)
+        if current is None:
+            continue
+        for metric, higher in HIGHER_IS_BETTER.items():
+            if metric not in metrics or metric not in current or not metrics[metric]:
+                continue
+            change = (current[metric] - metrics[metric]) / metrics[metric] * 100
+            worse = -change if higher else change
+            rows.append((bench, metric, metrics[metric], current[metric], round(change, 1), worse > tolerance))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분류 / API 주요 경로 벤치마크")
+    parser.add_argument("--corpus", type=int, default=20000, help="생성할 문장 수")
+    parser.add_argument("--requests", type=int, default=300, help="챗봇 엔드포인트 요청 수")
+    parser.add_argument("--ingest-rows", type=int, nargs="*", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5, help="분류 벤치 반복 횟수 (가장 빠른 회차 사용)")
+    parser.add_argument("--with-model", action="store_true", help="감정 모델 사용 (transformers/torch 필요)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=15.0, help="회귀로 판단할 악화 비율 (%%)")
+    parser.add_argument("--save-baseline", help="이번 결과를 기준값으로 저장할 경로")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_suite(args)))
+        return
+
+    meta_args = {key: getattr(args, key) for key in META_ARGS}
+    baseline = None
+    if args.baseline:
+        # 측정 전에 확인 (인자가 다르면 수치 차이가 코드 변화 때문인지 알 수 없음)
+        baseline = json.loads(Path(args.baseline).read_text())
+        mismatched = args_mismatch(meta_args, baseline)
+        if mismatched:
+            detail = ", ".join(f"{key}: 기준 {old} / 현재 {new}" for key, old, new in mismatched)
+            sys.exit(f"기준값({args.baseline})과 측정 인자가 다릅니다 — {detail}\n"
+                     f"같은 인자로 실행하거나 --save-baseline 으로 기준값을 다시 만드세요.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "SQLITE_PATH": os.path.join(tmp, "bench.sqlite3"),
+            "EMOTION_MODEL_ENABLED": str(args.with_model),
+            "LOG_WRITE_BEHIND": "False",   # 로그 INSERT 까지 요청 경로에서 측정
+        }
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", *sys.argv[1:]],
+            cwd=BASE_DIR, env=env, capture_output=True, text=True,
+        )
+    if out.returncode != 0:
+        sys.exit(out.stderr)
+    report = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+            "cpus": os.cpu_count(),
+            "args": meta_args,
+        },
+        "results": json.loads(out.stdout.strip().splitlines()[-1]),
+    }
+    for bench, r in report["results"].items():
+        metrics = "  ".join(f"{k}={v}" for k, v in r.items() if k != "items")
+        print(f"{bench:16s} n={r['items']:<7d} {metrics}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+
+    if baseline is not None:
+        rows = compare(report["results"], baseline, args.tolerance)
+        print(f"\n기준값 비교 ({args.baseline}, commit {baseline['meta'].get('commit')}, 허용 {args.tolerance}%)")
+        for bench, metric, old, new, change, regressed in rows:
+            flag = "  ← 회귀" if regressed else ""
+            print(f"{bench:16s} {metric:10s} {old:>12} → {new:<12} {change:+6.1f}%{flag}")
+        if any(row[-1] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
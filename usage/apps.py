@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class UsageConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "usage"
+
+    def ready(self):
+        # 앱 카탈로그 캐시 갱신 (카탈로그 warm 은 DB 접근이라 여기서 하지 않고 첫 조회 시)
+        from django.db.models.signals import post_delete, post_save
+        from . import catalog
+        from .models import App, AppCategory
+
+        post_save.connect(catalog.on_app_saved, sender=App, dispatch_uid="usage.catalog.app_save")
+        post_delete.connect(catalog.on_catalog_changed, sender=App, dispatch_uid="usage.catalog.app_delete")
+        for signal in (post_save, post_delete):
+            signal.connect(catalog.on_catalog_changed, sender=AppCategory,
+                           dispatch_uid="usage.catalog.category")
@@ -0,0 +1,339 @@
+# usage/archive.py
+# - 오래된 AppUsage 행을 사용자별·월별 열(column) 파일로 옮기는 보관(cold storage)
+# - 파일 1개 = 사용자 1명의 한 달 (현지 시간 기준), {USAGE_ARCHIVE DIR}/{user_id}/{YYYY-MM}.usg
+#   [MAGIC 8B][헤더 길이 4B][헤더 JSON][64바이트 정렬된 열 블록들]
+#   - start_delta: 직전 세션 시작과의 차이(초, int32) — 첫 값은 월 시작 기준
+#   - duration: 사용 시간(초, int32) → end_time = start + duration
+#   - app / usage_type: 사전(dictionary) 인코딩 코드 (사전은 헤더에 저장, 크기에 맞는 uint)
+#   - category: 카테고리 id (0: 미분류)
+# - 압축 대신 인코딩으로 크기를 줄여 np.memmap 으로 바로 읽을 수 있게 함
+# - 집계(usage_summary)는 DB(최근 행) + 보관 파일(오래된 행)을 합쳐서 반환
+# - 보관된 행은 DB unique 제약 밖이므로 수집(usage.ingest)이 archived_keys 로 재업로드 중복을 거름
+
+import json
+import os
+import struct
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import AppCategory, AppUsage, AppUsageQuerySet
+
+MAGIC = b"USGARC01"
+ALIGN = 64
+DEFAULT_CONFIG = {
+    "DIR": None,            # 보관 파일 디렉터리 (None 이면 보관 기능 꺼짐)
+    "AFTER_DAYS": 180,      # 이 일수보다 오래된 달을 보관
+}
+DELETE_CHUNK = 500
+
+
+def get_config():
+    return {**DEFAULT_CONFIG, **getattr(settings, "USAGE_ARCHIVE", {})}
+
+
+def _root():
+    directory = get_config()["DIR"]
+    return Path(directory) if directory else None
+
+
+def archive_path(user_id, year, month):
+    return _root() / str(user_id) / f"{year:04d}-{month:02d}.usg"
+
+
+def month_start(year, month):
+    """현지 시간 기준 월 시작 (aware datetime)"""
+    return timezone.make_aware(datetime.combine(date(year, month, 1), time.min))
+
+
+def next_month(year, month):
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _smallest_uint(count):
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if count <= np.iinfo(dtype).max + 1:
+            return dtype
+    return np.uint64
+
+
+# ---------------------
+# 파일 쓰기 / 읽기
+# ---------------------
+
+def write_month(path, base, starts, durations, apps, categories, usage_types):
+    """
+    한 달 치 열 배열을 파일로 저장 (임시 파일에 쓴 뒤 교체 → 중간에 죽어도 기존 파일 유지)
+    - starts 는 오름차순 epoch 초, apps / usage_types 는 문자열 배열
+    """
+    app_dict, app_codes = np.unique(apps, return_inverse=True)
+    type_dict, type_codes = np.unique(usage_types, return_inverse=True)
+    columns = {
+        "start_delta": np.diff(starts, prepend=base).astype(np.int32),
+        "duration": durations.astype(np.int32),
+        "app": app_codes.astype(_smallest_uint(len(app_dict))),
+        "category": categories.astype(np.int32),
+        "usage_type": type_codes.astype(_smallest_uint(len(type_dict))),
+    }
+
+    layout, offset = {}, 0
+    for name, arr in columns.items():
+        layout[name] = {"dtype": arr.dtype.str, "offset": offset}
+        offset += -(-arr.nbytes // ALIGN) * ALIGN
+    header = json.dumps({
+        "version": 1,
+        "rows": len(starts),
+        "base": int(base),
+        "apps": app_dict.tolist(),
+        "usage_types": type_dict.tolist(),
+        "columns": layout,
+    }, ensure_ascii=False).encode("utf-8")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".tmp{os.getpid()}")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header)) + header)
+        data_start = -(-f.tell() // ALIGN) * ALIGN
+        for name, arr in columns.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(arr.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class MonthArchive:
+    """보관 파일 1개 읽기 (열은 np.memmap 으로 필요할 때만 읽음)"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"보관 파일 형식이 아닙니다: {path}")
+            (length,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(length))
+        self.data_start = -(-(len(MAGIC) + 4 + length) // ALIGN) * ALIGN
+        self.rows = header["rows"]
+        self.base = header["base"]
+        self.apps = np.array(header["apps"], dtype=object)
+        self.usage_types = np.array(header["usage_types"], dtype=object)
+        self.layout = header["columns"]
+
+    def column(self, name):
+        spec = self.layout[name]
+        return np.memmap(
+            self.path, dtype=np.dtype(spec["dtype"]), mode="r",
+            offset=self.data_start + spec["offset"], shape=(self.rows,),
+        )
+
+    def starts(self):
+        return self.base + np.cumsum(self.column("start_delta"), dtype=np.int64)
+
+    def decode(self):
+        """전체 행 복원 → (starts, durations, apps, categories, usage_types) 배열"""
+        return (
+            self.starts(),
+            np.asarray(self.column("duration"), dtype=np.int64),
+            self.apps[self.column("app")],
+            np.asarray(self.column("category"), dtype=np.int64),
+            self.usage_types[self.column("usage_type")],
+        )
+
+
+# ---------------------
+# 보관 (DB → 파일)
+# ---------------------
+
+def _archive_month(user_id, year, month, rows):
+    """
+    한 사용자·한 달 행을 파일에 합쳐 쓰고 DB 에서 삭제 → 보관한 DB 행 수
+    - 이미 파일이 있으면(늦게 들어온 기록) 기존 내용과 합침, (app, start) 중복은 기존 것 유지
+    """
+    ids, apps, categories, usage_types, starts, durations = zip(*rows)
+    new = (
+        np.array([dt.timestamp() for dt in starts], dtype=np.int64),
+        np.array(durations, dtype=np.int64),
+        np.array(apps, dtype=object),
+        np.array([c or 0 for c in categories], dtype=np.int64),
+        np.array(usage_types, dtype=object),
+    )
+    path = archive_path(user_id, year, month)
+    if path.exists():
+        old = MonthArchive(path).decode()
+        new = tuple(np.concatenate([o, n]) for o, n in zip(old, new))
+
+    start_col, app_col = new[0], np.unique(new[2], return_inverse=True)[1].reshape(-1)
+    # 시작 시각 → 앱 순으로 안정 정렬 후 이전 행과 (start, app) 이 같으면 중복 (기존 행이 앞에 있음)
+    order = np.lexsort((app_col, start_col))
+    start_col, app_col = start_col[order], app_col[order]
+    keep = np.r_[True, (start_col[1:] != start_col[:-1]) | (app_col[1:] != app_col[:-1])]
+    merged = [col[order][keep] for col in new]
+
+    write_month(path, int(month_start(year, month).timestamp()), *merged)
+    with transaction.atomic():
+        for i in range(0, len(ids), DELETE_CHUNK):
+            AppUsage.objects.filter(pk__in=ids[i:i + DELETE_CHUNK]).delete()
+    return len(ids)
+
+
+def archive_usage(cutoff, user_ids=None, dry_run=False):
+    """
+    start_time < cutoff 인 AppUsage 를 사용자·월별 보관 파일로 이동
+    - cutoff 는 월 시작이어야 월 파일이 완결됨 (archive_cutoff() 사용)
+    - 반환: {"months": 처리한 (사용자, 월) 수, "rows": 옮긴 행 수}
+    """
+    if _root() is None:
+        raise RuntimeError("USAGE_ARCHIVE DIR 이 설정되지 않았습니다.")
+    qs = AppUsage.objects.filter(start_time__lt=cutoff)
+    if user_ids:
+        qs = qs.filter(user_id__in=user_ids)
+
+    report = {"months": 0, "rows": 0}
+    # 사용자 단위로 읽음 (읽는 중인 테이블에서 삭제하지 않도록 사용자 1명분은 먼저 모두 가져옴)
+    for user_id in list(qs.order_by().values_list("user_id", flat=True).distinct()):
+        months = defaultdict(list)
+        for pk, app, category, usage_type, start, duration in qs.filter(user_id=user_id).values_list(
+            "id", "app__app_name", "category_id", "usage_type", "start_time", "duration_seconds"
+        ):
+            local = timezone.localtime(start)
+            months[(local.year, local.month)].append((pk, app, category, usage_type, start, duration))
+        for (year, month), rows in sorted(months.items()):
+            report["months"] += 1
+            report["rows"] += len(rows) if dry_run else _archive_month(user_id, year, month, rows)
+    return report
+
+
+def archive_cutoff(days=None):
+    """지금부터 days 일 전이 속한 달의 시작 (그 이전 달들이 보관 대상)"""
+    days = get_config()["AFTER_DAYS"] if days is None else days
+    local = timezone.localtime() - timedelta(days=days)
+    return month_start(local.year, local.month)
+
+
+def archived_keys(user_id, starts):
+    """
+    이미 보관된 세션 키 → {(앱 이름, 시작 epoch 초)}
+    - starts(aware datetime 들)가 속한 달 중 보관 파일이 있는 달만 읽음 (최근 기록만 올라오면 파일을 열지 않음)
+    - 보관 파일은 초 단위라 같은 앱·같은 초에 시작한 세션은 같은 것으로 봄
+    """
+    if _root() is None:
+        return set()
+    months = defaultdict(set)
+    for start in starts:
+        local = timezone.localtime(start)
+        months[(local.year, local.month)].add(int(start.timestamp()))
+    keys = set()
+    for (year, month), wanted in months.items():
+        path = archive_path(user_id, year, month)
+        if not path.exists():
+            continue
+        arc = MonthArchive(path)
+        arc_starts = arc.starts()
+        mask = np.isin(arc_starts, np.fromiter(wanted, dtype=np.int64, count=len(wanted)))
+        if mask.any():
+            apps = arc.apps[np.asarray(arc.column("app"))[mask]]
+            keys.update(zip(apps.tolist(), arc_starts[mask].tolist()))
+    return keys
+
+
+# ---------------------
+# 집계 (DB + 보관 파일)
+# ---------------------
+
+def _month_paths(user_id, start, end):
+    """기간과 겹치는 보관 파일 목록 (user_id None 이면 전체 사용자)"""
+    root = _root()
+    if root is None or not root.exists():
+        return []
+    user_dirs = [root / str(user_id)] if user_id is not None else [p for p in root.iterdir() if p.is_dir()]
+    paths = []
+    for user_dir in user_dirs:
+        if not user_dir.exists():
+            continue
+        for path in sorted(user_dir.glob("*.usg")):
+            year, month = map(int, path.stem.split("-"))
+            if start is not None and month_start(*next_month(year, month)) <= start:
+                continue
+            if end is not None and month_start(year, month) >= end:
+                continue
+            paths.append(path)
+    return paths
+
+
+def aggregate_archive(keys, user_id=None, start=None, end=None):
+    """
+    보관 파일에서 기간 내 세션을 그룹별로 합산
+    - keys: AppUsageQuerySet.GROUP_FIELDS 의 키 tuple
+    - 반환: {그룹 값 tuple: [총 초, 세션 수]} (카테고리는 이름, 미분류는 None)
+    """
+    totals = defaultdict(lambda: [0, 0])
+    category_ids = set()
+    for path in _month_paths(user_id, start, end):
+        arc = MonthArchive(path)
+        starts = arc.starts()
+        mask = np.ones(arc.rows, dtype=bool)
+        if start is not None:
+            mask &= starts >= int(start.timestamp())
+        if end is not None:
+            mask &= starts < int(end.timestamp())
+        if not mask.any():
+            continue
+        codes = {
+            "app": np.asarray(arc.column("app"), dtype=np.int64)[mask],
+            "category": np.asarray(arc.column("category"), dtype=np.int64)[mask],
+            "usage_type": np.asarray(arc.column("usage_type"), dtype=np.int64)[mask],
+        }
+        groups, inverse = np.unique(np.stack([codes[k] for k in keys], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        seconds = np.bincount(inverse, weights=arc.column("duration")[mask], minlength=len(groups))
+        sessions = np.bincount(inverse, minlength=len(groups))
+        decoders = {"app": arc.apps, "usage_type": arc.usage_types}
+        for group, sec, count in zip(groups, seconds, sessions):
+            value = tuple(
+                int(code) if k == "category" else decoders[k][code] for k, code in zip(keys, group)
+            )
+            if "category" in keys:
+                category_ids.add(value[keys.index("category")])
+            totals[value][0] += int(sec)
+            totals[value][1] += int(count)
+
+    if "category" not in keys or not totals:
+        return dict(totals)
+    # 카테고리 id → 이름 (DB 집계의 category__category_name 과 같은 값으로)
+    names = dict(AppCategory.objects.filter(id__in=category_ids).values_list("id", "category_name"))
+    i = keys.index("category")
+    renamed = defaultdict(lambda: [0, 0])
+    for value, (sec, count) in totals.items():
+        value = value[:i] + (names.get(value[i]),) + value[i + 1:]
+        renamed[value][0] += sec
+        renamed[value][1] += count
+    return dict(renamed)
+
+
+def usage_summary(group_by="app", user=None, start=None, end=None):
+    """
+    AppUsage.objects.usage_by() 와 같은 형식, 보관된 오래된 기록까지 포함
+    - 최근 행은 DB 에서 GROUP BY, 보관 파일은 기간과 겹치는 월만 읽어 합산
+    """
+    keys = (group_by,) if isinstance(group_by, str) else tuple(group_by)
+    hot = list(AppUsage.objects.usage_by(keys, user=user, start=start, end=end))
+    cold = aggregate_archive(keys, user.pk if user is not None else None, start, end)
+    if not cold:
+        return hot
+
+    fields = [AppUsageQuerySet.GROUP_FIELDS[k] for k in keys]
+    merged = {tuple(row[f] for f in fields): [row["total_seconds"], row["sessions"]] for row in hot}
+    for value, (sec, count) in cold.items():
+        total = merged.setdefault(value, [0, 0])
+        total[0] += sec
+        total[1] += count
+    rows = [
+        {**dict(zip(fields, value)), "total_seconds": sec, "total_minutes": sec // 60, "sessions": count}
+        for value, (sec, count) in merged.items()
+    ]
+    return sorted(rows, key=lambda r: -r["total_seconds"])
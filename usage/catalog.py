@@ -0,0 +1,130 @@
+# usage/catalog.py
+# - 앱 카탈로그(App / AppCategory) 프로세스 내 조회 캐시
+# - 앱 이름 → (app id, 기본 카테고리 id), 카테고리 이름 → id 를 메모리에 보관 (이름은 sys.intern)
+# - 처음 쓸 때 카탈로그 전체를 읽어 두고(warm), 모르는 이름만 모아서 한 번에 조회/생성
+# - 캐시 반영은 항상 커밋 후 (롤백된 id 가 캐시에 남지 않도록)
+
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import App, AppCategory
+
+DEFAULT_CONFIG = {
+    "TTL_SECONDS": 600,     # 다른 프로세스에서 바뀐 앱 카테고리가 반영되기까지 최대 지연
+}
+
+_lock = threading.Lock()
+_apps = {}          # 앱 이름 → (app id, 카테고리 id)
+_categories = {}    # 카테고리 이름 → id
+_loaded_at = None
+
+
+def get_config():
+    return {**DEFAULT_CONFIG, **getattr(settings, "USAGE_APP_CATALOG", {})}
+
+
+def _store(apps=None, categories=None):
+    with _lock:
+        _apps.update(apps or {})
+        _categories.update(categories or {})
+
+
+def clear():
+    """캐시 비우기 → 다음 조회 때 다시 warm"""
+    global _loaded_at
+    with _lock:
+        _apps.clear()
+        _categories.clear()
+        _loaded_at = None
+
+
+def warm():
+    """카탈로그 전체를 다시 읽음 (쿼리 2번)"""
+    apps = {
+        sys.intern(name): (pk, category_id)
+        for pk, name, category_id in App.objects.values_list("id", "app_name", "category_id")
+    }
+    categories = {
+        sys.intern(name): pk
+        for pk, name in AppCategory.objects.values_list("id", "category_name")
+    }
+
+    def replace():
+        global _loaded_at
+        with _lock:
+            _apps.clear()
+            _apps.update(apps)
+            _categories.clear()
+            _categories.update(categories)
+            _loaded_at = time.monotonic()
+
+    transaction.on_commit(replace)
+    return apps, categories
+
+
+def _snapshot():
+    """(앱 dict, 카테고리 dict) — 비었거나 TTL 이 지났으면 warm"""
+    if _loaded_at is None or time.monotonic() - _loaded_at > get_config()["TTL_SECONDS"]:
+        apps, categories = warm()
+        # 트랜잭션 안이라 아직 캐시에 반영되지 않았어도 이번 조회에는 읽은 값을 사용
+        return {**_apps, **apps}, {**_categories, **categories}
+    return _apps, _categories
+
+
+def resolve_categories(names):
+    """카테고리 이름들 → {이름: id} (등록되지 않은 이름은 결과에 없음)"""
+    _, categories = _snapshot()
+    found = {name: categories[name] for name in names if name in categories}
+    missing = set(names) - found.keys()
+    if missing:
+        fetched = {
+            sys.intern(name): pk
+            for name, pk in AppCategory.objects.filter(category_name__in=missing).values_list("category_name", "id")
+        }
+        found.update(fetched)
+        transaction.on_commit(lambda: _store(categories=fetched))
+    return found
+
+
+def resolve_apps(names):
+    """
+    앱 이름 → {이름: (app id, 기본 카테고리 id)}
+    - names: {앱 이름: 처음 등록할 때 쓸 카테고리 id 또는 None}
+    - 카탈로그에 없는 앱은 bulk_create 로 한 번에 등록
+      (동시 요청이 먼저 등록했을 수 있으므로 ignore_conflicts 후 다시 조회)
+    """
+    apps, _ = _snapshot()
+    found = {name: apps[name] for name in names if name in apps}
+    missing = [name for name in names if name not in found]
+    if missing:
+        fetched = dict(_fetch_apps(missing))
+        new = [App(app_name=name, category_id=names[name]) for name in missing if name not in fetched]
+        if new:
+            App.objects.bulk_create(new, ignore_conflicts=True)
+            fetched.update(_fetch_apps([app.app_name for app in new]))
+        found.update(fetched)
+        transaction.on_commit(lambda: _store(apps=fetched))
+    return found
+
+
+def _fetch_apps(names):
+    for pk, name, category_id in App.objects.filter(app_name__in=names).values_list("id", "app_name", "category_id"):
+        yield sys.intern(name), (pk, category_id)
+
+
+def on_app_saved(sender, instance, **kwargs):
+    """App 저장 시그널 핸들러 (관리자 화면 등에서 기본 카테고리를 바꾼 경우)"""
+    entry = {sys.intern(instance.app_name): (instance.pk, instance.category_id)}
+    transaction.on_commit(lambda: _store(apps=entry))
+
+
+def on_catalog_changed(sender, instance, **kwargs):
+    """
+    App 삭제 / AppCategory 저장·삭제 시그널 핸들러
+    - 이름 변경·카테고리 삭제(앱들의 카테고리가 null 로 바뀜)까지 맞추기 위해 전체 재적재
+    """
+    transaction.on_commit(clear)
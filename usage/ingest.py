@@ -0,0 +1,233 @@
+# usage/ingest.py
+# - 앱 사용 기록 대량 수집 로직
+# - NDJSON(한 줄에 JSON 1개) 본문을 스트리밍으로 읽고, 청크 단위로 검증 → bulk_create
+# - (user, app, start_time) 기준 중복 제거 → 클라이언트 재전송에도 멱등
+#   (usage.archive 로 보관된 달의 세션도 보관 파일에서 확인 → 오래된 기록 재업로드가 두 번 집계되지 않음)
+# - 앱/카테고리 이름 → id 는 청크 단위로 카탈로그 캐시에서 한 번에 변환 (usage.catalog)
+
+import gzip
+import json
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from wellness.summary import apply_usage_batch
+
+from . import catalog
+from .models import AppUsage
+
+try:
+    from .archive import archived_keys
+except ImportError:   # numpy 가 없으면 보관 기능도 쓸 수 없음
+    archived_keys = None
+
+CHUNK_SIZE = 500            # bulk_create 한 번에 넣을 최대 행 수
+MAX_ERRORS_PER_CHUNK = 20   # 응답에 담을 청크별 오류 상세 최대 개수
+MAX_INSERT_ATTEMPTS = 3     # 동시 요청과 unique 제약이 충돌했을 때 재시도 횟수
+USAGE_TYPES = ("foreground", "background")
+
+
+def open_ndjson_lines(stream, content_encoding=""):
+    """
+    요청 본문 스트림을 한 줄(bytes)씩 돌려주는 iterator 로 감싼다.
+    - Content-Encoding: gzip 이면 압축을 풀면서 읽음(본문 전체를 메모리에 올리지 않음)
+    """
+    if stream is None:
+        return iter(())
+    if content_encoding.strip().lower() == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    return stream
+
+
+def _parse_time(value, name):
+    if not isinstance(value, str):
+        raise ValueError(f"{name}: ISO 8601 문자열이 필요합니다")
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"{name}: 날짜 형식이 올바르지 않습니다")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_usage_row(obj):
+    """
+    NDJSON 한 줄(dict)을 검증해 AppUsage 필드 dict 로 변환.
+    - Serializer 인스턴스를 행마다 만들지 않도록 필요한 검사만 직접 수행
+    - 잘못된 행은 ValueError(사유) 발생
+    """
+    if not isinstance(obj, dict):
+        raise ValueError("JSON 객체가 아닙니다")
+
+    app_name = obj.get("app_name")
+    if not isinstance(app_name, str) or not app_name.strip():
+        raise ValueError("app_name: 필수 값입니다")
+    app_name = app_name.strip()
+    if len(app_name) > 255:
+        raise ValueError("app_name: 255자를 넘을 수 없습니다")
+
+    usage_type = obj.get("usage_type") or "foreground"
+    if usage_type not in USAGE_TYPES:
+        raise ValueError(f"usage_type: {', '.join(USAGE_TYPES)} 중 하나여야 합니다")
+
+    start_time = _parse_time(obj.get("start_time"), "start_time")
+    end_time = _parse_time(obj.get("end_time"), "end_time")
+    if end_time < start_time:
+        raise ValueError("end_time 이 start_time 보다 앞설 수 없습니다")
+
+    category = obj.get("category")
+    if category is not None and not isinstance(category, str):
+        raise ValueError("category: 문자열이어야 합니다")
+
+    return {
+        "app_name": app_name,
+        "usage_type": usage_type,
+        "start_time": start_time,
+        "end_time": end_time,
+        "category": category or None,
+    }
+
+
+class UsageIngestor:
+    """
+    한 사용자의 NDJSON 업로드 1건을 처리하는 객체
+    - feed() 로 줄을 넣으면 CHUNK_SIZE 마다 DB 에 기록
+    - report() 로 전체/청크별 accepted·duplicates·rejected 집계를 돌려줌
+    """
+
+    def __init__(self, user, chunk_size=CHUNK_SIZE):
+        self.user = user
+        self.chunk_size = chunk_size
+        self.chunks = []
+        self._pending = []      # (line_no, 정제된 row)
+        self._errors = []       # 현재 청크의 {"line", "error"}
+        self._rejected = 0
+
+    def feed(self, line_no, raw):
+        line = raw.strip()
+        if not line:
+            return
+        try:
+            row = parse_usage_row(json.loads(line))
+        except ValueError as e:
+            # JSONDecodeError / UnicodeDecodeError 모두 ValueError 하위 클래스
+            self._reject(line_no, str(e))
+        else:
+            self._pending.append((line_no, row))
+
+        if len(self._pending) + self._rejected >= self.chunk_size:
+            self.flush()
+
+    def _reject(self, line_no, reason):
+        self._rejected += 1
+        if len(self._errors) < MAX_ERRORS_PER_CHUNK:
+            self._errors.append({"line": line_no, "error": reason})
+
+    def flush(self):
+        """쌓인 행을 하나의 청크로 DB 에 기록"""
+        if not self._pending and not self._rejected:
+            return
+
+        rows = self._pending
+        # 등록되지 않은 카테고리 이름은 무시(행 자체는 거절하지 않고 앱 기본 카테고리 사용)
+        categories = catalog.resolve_categories({r["category"] for _, r in rows if r["category"]})
+        # 처음 보는 앱은 그 앱의 첫 행 카테고리로 카탈로그에 등록
+        first_category = {}
+        for _, r in rows:
+            first_category.setdefault(r["app_name"], categories.get(r["category"]))
+        apps = catalog.resolve_apps(first_category)
+
+        # 이미 저장된 세션 키를 한 번의 쿼리로 조회
+        starts = {r["start_time"] for _, r in rows}
+        existing = set(
+            AppUsage.objects.filter(user=self.user, start_time__in=starts).values_list("app_id", "start_time")
+        )
+        # 보관 파일로 옮겨진 세션 (DB unique 제약으로는 막히지 않음)
+        archived = archived_keys(self.user.pk, starts) if archived_keys else set()
+
+        objs = []
+        duplicates = 0
+        for _, r in rows:
+            app_id, app_category_id = apps[r["app_name"]]
+            key = (app_id, r["start_time"])
+            if key in existing or (archived and (r["app_name"], int(r["start_time"].timestamp())) in archived):
+                duplicates += 1
+                continue
+            existing.add(key)  # 같은 청크 안의 중복도 제거
+            objs.append(AppUsage(
+                user=self.user,
+                app_id=app_id,
+                # 행에 카테고리가 있으면 그 값, 없으면 앱의 기본 카테고리
+                category_id=categories.get(r["category"], app_category_id),
+                usage_type=r["usage_type"],
+                start_time=r["start_time"],
+                end_time=r["end_time"],
+                duration_seconds=AppUsage.compute_duration(r["start_time"], r["end_time"]),
+            ))
+
+        objs, raced = self._insert(objs)
+        duplicates += raced
+
+        self.chunks.append({
+            "chunk": len(self.chunks),
+            "received": len(rows) + self._rejected,
+            "accepted": len(objs),
+            "duplicates": duplicates,
+            "rejected": self._rejected,
+            "errors": self._errors,
+        })
+        self._pending = []
+        self._errors = []
+        self._rejected = 0
+
+    def _insert(self, objs):
+        """
+        행 INSERT + 하루 요약 증분 갱신을 한 트랜잭션으로 → (실제로 넣은 행, 동시 요청이 먼저 넣은 행 수)
+        - ignore_conflicts 로 건너뛰면 어떤 행이 빠졌는지 알 수 없어 요약에 두 번 더해지므로,
+          unique 제약 충돌 시 롤백 → 이미 저장된 키를 다시 조회해 빼고 재시도
+          (요약 행의 동시 생성 충돌도 같은 방식으로 재시도)
+        """
+        raced = 0
+        for attempt in range(MAX_INSERT_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    AppUsage.objects.bulk_create(objs)
+                    # 같은 트랜잭션 안에서 하루 요약(DailySummary)도 증분 갱신
+                    apply_usage_batch(objs)
+                return objs, raced
+            except IntegrityError:
+                if attempt == MAX_INSERT_ATTEMPTS - 1:
+                    raise
+            stored = set(
+                AppUsage.objects.filter(
+                    user=self.user, start_time__in={o.start_time for o in objs},
+                ).values_list("app_id", "start_time")
+            )
+            remaining = []
+            for o in objs:
+                if (o.app_id, o.start_time) in stored:
+                    raced += 1
+                else:
+                    o.pk = None
+                    remaining.append(o)
+            objs = remaining
+        return objs, raced
+
+    def report(self):
+        return {
+            "received": sum(c["received"] for c in self.chunks),
+            "accepted": sum(c["accepted"] for c in self.chunks),
+            "duplicates": sum(c["duplicates"] for c in self.chunks),
+            "rejected": sum(c["rejected"] for c in self.chunks),
+            "chunks": self.chunks,
+        }
+
+
+def ingest_usage_lines(user, lines, chunk_size=CHUNK_SIZE):
+    """NDJSON 줄 iterator 를 끝까지 읽어 저장하고 집계 결과를 반환"""
+    ingestor = UsageIngestor(user, chunk_size=chunk_size)
+    for line_no, raw in enumerate(lines, start=1):
+        ingestor.feed(line_no, raw)
+    ingestor.flush()
+    return ingestor.report()
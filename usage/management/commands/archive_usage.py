@@ -0,0 +1,41 @@
+# usage/management/commands/archive_usage.py
+# - 오래된 AppUsage 를 사용자·월별 보관 파일로 이동 (usage.archive)
+# 실행: python manage.py archive_usage [--days 180] [--user 1] [--dry-run] [--vacuum]
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = "AFTER_DAYS 보다 오래된 달의 앱 사용 기록을 열 파일로 보관하고 DB 에서 삭제"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="이 일수보다 오래된 달을 보관 (기본: USAGE_ARCHIVE AFTER_DAYS)")
+        parser.add_argument("--user", type=int, action="append", dest="users", help="대상 사용자 id (여러 번 가능)")
+        parser.add_argument("--dry-run", action="store_true", help="옮길 행 수만 출력")
+        parser.add_argument("--vacuum", action="store_true", help="SQLite 인 경우 VACUUM 으로 파일 크기 줄이기")
+
+    def handle(self, *args, **options):
+        try:
+            from usage.archive import archive_cutoff, archive_usage
+        except ImportError as e:
+            raise CommandError(f"사용 기록 보관에는 numpy 가 필요합니다: {e}")
+
+        cutoff = archive_cutoff(options["days"])
+        started = time.perf_counter()
+        try:
+            report = archive_usage(cutoff, user_ids=options["users"], dry_run=options["dry_run"])
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        prefix = "[dry-run] " if options["dry_run"] else ""
+        self.stdout.write(
+            f"{prefix}{cutoff.date()} 이전: {report['months']}개 (사용자, 월) / {report['rows']}행 ({elapsed:.2f}s)"
+        )
+        if options["vacuum"] and not options["dry_run"] and connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM")
+            self.stdout.write("VACUUM 완료")
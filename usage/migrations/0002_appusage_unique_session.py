@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("usage", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="appusage",
+            constraint=models.UniqueConstraint(
+                fields=("user", "app_name", "start_time"), name="uniq_appusage_session"
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_duration(apps, schema_editor):
+    AppUsage = apps.get_model("usage", "AppUsage")
+    batch = []
+    for row in AppUsage.objects.only("id", "start_time", "end_time").iterator(
+        chunk_size=2000
+    ):
+        row.duration_seconds = int((row.end_time - row.start_time).total_seconds())
+        batch.append(row)
+        if len(batch) >= 2000:
+            AppUsage.objects.bulk_update(batch, ["duration_seconds"])
+            batch = []
+    AppUsage.objects.bulk_update(batch, ["duration_seconds"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("usage", "0002_appusage_unique_session"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="appusage",
+            name="duration_seconds",
+            field=models.IntegerField(
+                default=0,
+                help_text="end_time - start_time (초) — DB 집계용으로 저장해 두는 값",
+            ),
+        ),
+        migrations.RunPython(backfill_duration, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="appusage",
+            index=models.Index(
+                fields=["user", "start_time"], name="appusage_user_start_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="appusage",
+            index=models.Index(
+                fields=["user", "category", "start_time"],
+                name="appusage_user_cat_start_idx",
+            ),
+        ),
+    ]
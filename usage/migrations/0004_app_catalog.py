@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+
+def backfill_apps(apps, schema_editor):
+    App = apps.get_model("usage", "App")
+    AppUsage = apps.get_model("usage", "AppUsage")
+
+    # 앱별 기본 카테고리: 기존 행에서 가장 많이 쓰인 카테고리
+    categories = {}
+    for app_name, category_id, _ in (
+        AppUsage.objects.filter(category__isnull=False)
+        .values_list("app_name", "category_id")
+        .annotate(n=Count("id"))
+        .order_by("app_name", "-n")
+    ):
+        categories.setdefault(app_name, category_id)
+
+    names = AppUsage.objects.order_by().values_list("app_name", flat=True).distinct()
+    App.objects.bulk_create(
+        [App(app_name=name, category_id=categories.get(name)) for name in names],
+        batch_size=1000,
+    )
+    # 앱마다 UPDATE 하지 않고 App.app_name unique 인덱스를 쓰는 상관 서브쿼리 1번
+    AppUsage.objects.update(
+        app_id=Subquery(App.objects.filter(app_name=OuterRef("app_name")).values("id")[:1])
+    )
+
+
+def restore_app_names(apps, schema_editor):
+    App = apps.get_model("usage", "App")
+    AppUsage = apps.get_model("usage", "AppUsage")
+    AppUsage.objects.update(
+        app_name=Subquery(App.objects.filter(pk=OuterRef("app_id")).values("app_name")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("usage", "0003_appusage_duration_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="App",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("app_name", models.CharField(max_length=255, unique=True)),
+                (
+                    "category",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="usage.appcategory",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="appusage",
+            name="app",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                to="usage.app",
+            ),
+        ),
+        # 되돌릴 때 app_name 을 복원한 뒤에 다시 걸리도록 백필 전에 제거
+        migrations.RemoveConstraint(
+            model_name="appusage",
+            name="uniq_appusage_session",
+        ),
+        migrations.RunPython(backfill_apps, restore_app_names),
+    ]
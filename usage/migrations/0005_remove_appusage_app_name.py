@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:02
+# 0004 의 데이터 이전과 분리 (PostgreSQL 은 같은 트랜잭션에서 행 UPDATE 후 ALTER TABLE 불가)
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("usage", "0004_app_catalog"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # 되돌릴 때 기존 행에 열을 다시 추가할 수 있도록 기본값 지정 (값은 0004 에서 복원)
+        migrations.AlterField(
+            model_name="appusage",
+            name="app_name",
+            field=models.CharField(default="", max_length=255),
+        ),
+        migrations.RemoveField(
+            model_name="appusage",
+            name="app_name",
+        ),
+        migrations.AlterField(
+            model_name="appusage",
+            name="app",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                to="usage.app",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="appusage",
+            constraint=models.UniqueConstraint(
+                fields=("user", "app", "start_time"),
+                name="uniq_appusage_session",
+            ),
+        ),
+    ]
@@ -14,6 +14,64 @@ class AppCategory(models.Model):
         return self.category_name
 
 
+class App(models.Model):
+    """
+    앱 카탈로그 테이블
+    - 앱 이름은 여기 한 번만 저장하고 AppUsage 는 id 로 참조
+    - category: 앱의 기본 카테고리 (수집 시 행에 카테고리가 없으면 이 값을 사용)
+    """
+    app_name = models.CharField(max_length=255, unique=True)
+    category = models.ForeignKey(AppCategory, on_delete=models.SET_NULL, null=True)
+
+    def __str__(self):
+        return self.app_name
+
+
+class AppUsageQuerySet(models.QuerySet):
+    """AppUsage 집계용 QuerySet (SUM / GROUP BY 를 DB 에서 수행)"""
+
+    GROUP_FIELDS = {
+        "app": "app_name",
+        "category": "category__category_name",
+        "usage_type": "usage_type",
+    }
+    # 조인 값을 기존 응답 키 이름으로 노출
+    GROUP_EXPRESSIONS = {"app_name": models.F("app__app_name")}
+
+    def usage_by(self, group_by="app", user=None, start=None, end=None):
+        """
+        기간 내 사용시간을 그룹별로 합산
+        - group_by: "app" / "category" / "usage_type" (또는 이들의 tuple)
+        - start <= start_time < end 인 세션만 포함 → (user, start_time) 인덱스 사용
+        - 결과: [{"app_name": ..., "total_seconds": ..., "total_minutes": ..., "sessions": ...}, ...]
+        """
+        keys = (group_by,) if isinstance(group_by, str) else tuple(group_by)
+        try:
+            fields = [self.GROUP_FIELDS[k] for k in keys]
+        except KeyError as e:
+            raise ValueError(f"지원하지 않는 group_by 입니다: {e.args[0]}")
+
+        qs = self
+        if user is not None:
+            qs = qs.filter(user=user)
+        if start is not None:
+            qs = qs.filter(start_time__gte=start)
+        if end is not None:
+            qs = qs.filter(start_time__lt=end)
+        return (
+            qs.values(
+                *[f for f in fields if f not in self.GROUP_EXPRESSIONS],
+                **{f: self.GROUP_EXPRESSIONS[f] for f in fields if f in self.GROUP_EXPRESSIONS},
+            )
+            .annotate(
+                total_seconds=models.Sum("duration_seconds"),
+                total_minutes=models.Sum("duration_seconds") / 60,
+                sessions=models.Count("id"),
+            )
+            .order_by("-total_seconds")
+        )
+
+
 class AppUsage(models.Model):
     """
     앱 사용 기록 테이블
@@ -21,7 +79,8 @@ class AppUsage(models.Model):
     - start_time ~ end_time 을 기반으로 사용시간 계산 가능
     """
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    app_name = models.CharField(max_length=255)
+    app = models.ForeignKey(App, on_delete=models.PROTECT)
+    # 집계 인덱스용으로 행마다 유지 (수집 시 행의 카테고리, 없으면 App.category)
     category = models.ForeignKey(AppCategory, on_delete=models.SET_NULL, null=True)
     usage_type = models.CharField(
         max_length=50,
@@ -30,11 +89,44 @@ class AppUsage(models.Model):
     )
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
+    duration_seconds = models.IntegerField(
+        default=0,
+        help_text="end_time - start_time (초) — DB 집계용으로 저장해 두는 값"
+    )
+
+    objects = AppUsageQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # 사용자별 기간 조회 / 카테고리별 기간 집계
+            models.Index(fields=["user", "start_time"], name="appusage_user_start_idx"),
+            models.Index(
+                fields=["user", "category", "start_time"],
+                name="appusage_user_cat_start_idx",
+            ),
+        ]
+        constraints = [
+            # 클라이언트 재전송 시 같은 세션이 중복 저장되지 않도록 보장
+            models.UniqueConstraint(
+                fields=["user", "app", "start_time"],
+                name="uniq_appusage_session",
+            ),
+        ]
+
+    @staticmethod
+    def compute_duration(start_time, end_time):
+        """start_time ~ end_time 차이(초)"""
+        return int((end_time - start_time).total_seconds())
+
+    def save(self, *args, **kwargs):
+        # bulk_create 는 save() 를 거치지 않으므로 호출 측에서 직접 채워야 함
+        self.duration_seconds = self.compute_duration(self.start_time, self.end_time)
+        super().save(*args, **kwargs)
 
     @property
     def usage_minutes(self):
         """start_time ~ end_time 차이를 분 단위로 계산한 필드"""
-        return int((self.end_time - self.start_time).total_seconds() / 60)
+        return self.compute_duration(self.start_time, self.end_time) // 60
 
     def __str__(self):
-        return f"{self.user.username} - {self.app_name}"
+        return f"{self.user.username} - {self.app.app_name}"
@@ -1,3 +1,249 @@
-from django.test import TestCase
+import gzip
+import json
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from . import catalog
+from .models import App, AppCategory, AppUsage
+
+
+def _ndjson(rows):
+    return "\n".join(json.dumps(r) for r in rows).encode("utf-8")
+
+
+class AppUsageIngestTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("usage_bulk_ingest")
+        AppCategory.objects.create(category_name="Video")
+
+    def _row(self, minute, app="YouTube", **extra):
+        row = {
+            "app_name": app,
+            "category": "Video",
+            "start_time": f"2025-11-20T09:{minute:02d}:00+09:00",
+            "end_time": f"2025-11-20T09:{minute:02d}:30+09:00",
+        }
+        row.update(extra)
+        return row
+
+    def _post(self, body, **headers):
+        return self.client.generic(
+            "POST", self.url, body, content_type="application/x-ndjson", **headers
+        )
+
+    def test_gzip_body_is_ingested_in_chunks(self):
+        rows = [self._row(m) for m in range(30)]
+        res = self._post(gzip.compress(_ndjson(rows)), HTTP_CONTENT_ENCODING="gzip")
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["accepted"], 30)
+        self.assertEqual(AppUsage.objects.filter(user=self.user).count(), 30)
+        self.assertTrue(AppUsage.objects.filter(category__category_name="Video").exists())
+
+    def test_retry_is_idempotent(self):
+        body = _ndjson([self._row(1), self._row(1), self._row(2)])
+        first = self._post(body)
+        second = self._post(body)
+
+        self.assertEqual(first.data["accepted"], 2)
+        self.assertEqual(first.data["duplicates"], 1)
+        self.assertEqual(second.data["accepted"], 0)
+        self.assertEqual(second.data["duplicates"], 3)
+        self.assertEqual(AppUsage.objects.count(), 2)
+
+    def test_concurrently_inserted_rows_are_not_summarized_twice(self):
+        from wellness.models import DailyCategoryUsage, DailySummary
+        from .ingest import UsageIngestor
+
+        self._post(_ndjson([self._row(1)]))
+        app = App.objects.get(app_name="YouTube")
+        # 중복 확인 뒤 다른 요청이 같은 세션을 먼저 넣은 상황
+        start = datetime(2025, 11, 20, 0, 1, tzinfo=dt_timezone.utc)
+        raced = [
+            AppUsage(user=self.user, app=app, start_time=start + timedelta(minutes=m),
+                     end_time=start + timedelta(minutes=m, seconds=30), duration_seconds=30)
+            for m in (0, 1)
+        ]
+        inserted, duplicates = UsageIngestor(self.user)._insert(raced)
+
+        self.assertEqual((len(inserted), duplicates), (1, 1))
+        self.assertEqual(AppUsage.objects.count(), 2)
+        self.assertEqual(DailySummary.objects.get(user=self.user).total_unlocks, 2)
+        self.assertEqual(DailyCategoryUsage.objects.get(user=self.user, category=None).usage_seconds, 30)
+
+    def test_invalid_rows_are_rejected_per_chunk(self):
+        lines = [
+            json.dumps(self._row(1)),
+            "{not json",
+            json.dumps(self._row(2, end_time="2025-11-20T08:00:00+09:00")),
+            json.dumps(self._row(3, usage_type="sleep")),
+        ]
+        res = self._post("\n".join(lines).encode("utf-8"))
+
+        chunk = res.data["chunks"][0]
+        self.assertEqual(chunk["accepted"], 1)
+        self.assertEqual(chunk["rejected"], 3)
+        self.assertEqual([e["line"] for e in chunk["errors"]], [2, 3, 4])
+
+    def test_app_names_resolve_through_cached_catalog(self):
+        catalog.clear()
+        self.addCleanup(catalog.clear)   # 롤백된 id 가 다음 테스트에 남지 않도록
+        with self.captureOnCommitCallbacks(execute=True):
+            self._post(_ndjson([self._row(1), self._row(2, app="Memo", category=None)]))
+
+        self.assertEqual(App.objects.get(app_name="YouTube").category.category_name, "Video")
+        self.assertIsNone(App.objects.get(app_name="Memo").category)
+        # 카테고리 없이 온 행은 앱 기본 카테고리, 카탈로그 조회 쿼리 없음
+        with CaptureQueriesContext(connection) as queries:
+            res = self._post(_ndjson([self._row(3, category=None), self._row(4, app="Memo")]))
+        self.assertEqual(res.data["accepted"], 2)
+        self.assertFalse([q for q in queries if '"usage_app"' in q["sql"] and "SELECT" in q["sql"]])
+        self.assertEqual(
+            AppUsage.objects.filter(app__app_name="YouTube", category__category_name="Video").count(), 2
+        )
+
+    def test_broken_gzip_returns_400(self):
+        res = self._post(b"definitely not gzip", HTTP_CONTENT_ENCODING="gzip")
+        self.assertEqual(res.status_code, 400)
+
+
+class AppUsageAggregationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "pw")
+        video = AppCategory.objects.create(category_name="Video")
+        for minute, app, length in [(0, "YouTube", 600), (20, "YouTube", 300), (40, "Netflix", 120)]:
+            start = datetime(2025, 11, 20, 9, minute, tzinfo=dt_timezone.utc)
+            AppUsage.objects.create(
+                user=self.user, app=App.objects.get_or_create(app_name=app)[0], category=video,
+                start_time=start, end_time=start + timedelta(seconds=length),
+            )
+
+    def test_usage_by_app_sums_in_sql(self):
+        rows = list(AppUsage.objects.usage_by("app", user=self.user))
+        self.assertEqual(rows[0]["app_name"], "YouTube")
+        self.assertEqual(rows[0]["total_seconds"], 900)
+        self.assertEqual(rows[0]["total_minutes"], 15)
+        self.assertEqual(rows[0]["sessions"], 2)
+
+    def test_usage_by_category_within_range(self):
+        rows = list(AppUsage.objects.usage_by(
+            "category", user=self.user,
+            start=datetime(2025, 11, 20, 9, 10, tzinfo=dt_timezone.utc),
+        ))
+        self.assertEqual(rows, [{
+            "category__category_name": "Video",
+            "total_seconds": 420, "total_minutes": 7, "sessions": 2,
+        }])
+
+    def test_history_pages_with_category_name_and_fields(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        res = client.get(reverse("usage_history"), {"limit": 2, "fields": "app_name,category,duration_seconds"})
+
+        self.assertEqual(res.data["results"], [
+            {"app_name": "Netflix", "category": "Video", "duration_seconds": 120},
+            {"app_name": "YouTube", "category": "Video", "duration_seconds": 300},
+        ])
+        res = client.get(res.data["next"])
+        self.assertEqual([r["app_name"] for r in res.data["results"]], ["YouTube"])
+        self.assertIsNone(res.data["next"])
+
+
+class UsageArchiveTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(USAGE_ARCHIVE={"DIR": tmp.name, "AFTER_DAYS": 180})
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = User.objects.create_user("tester", "tester@example.com", "pw")
+        self.video = AppCategory.objects.create(category_name="Video")
+        # 2025-01 (보관 대상) 3건 + 2025-03 (남김) 1건
+        for day, app, category, length in [
+            (5, "YouTube", self.video, 600), (6, "YouTube", self.video, 300),
+            (7, "Memo", None, 120), (65, "YouTube", self.video, 60),
+        ]:
+            self._create(datetime(2025, 1, 1, 12, tzinfo=dt_timezone.utc) + timedelta(days=day), app, category, length)
+        self.cutoff = datetime(2025, 2, 1, tzinfo=dt_timezone.utc)
+
+    def _create(self, start, app, category, length):
+        return AppUsage.objects.create(
+            user=self.user, app=App.objects.get_or_create(app_name=app)[0], category=category,
+            start_time=start, end_time=start + timedelta(seconds=length),
+        )
+
+    def test_archive_moves_rows_and_summary_keeps_totals(self):
+        from .archive import archive_usage, usage_summary
+
+        before = {
+            keys: list(AppUsage.objects.usage_by(keys, user=self.user))
+            for keys in [("app",), ("category",), ("app", "usage_type")]
+        }
+        report = archive_usage(self.cutoff)
+
+        self.assertEqual(report, {"months": 1, "rows": 3})
+        self.assertEqual(AppUsage.objects.count(), 1)
+        for keys, expected in before.items():
+            self.assertEqual(usage_summary(keys, user=self.user), expected)
+
+    def test_archive_reads_back_and_merges_late_rows(self):
+        from .archive import MonthArchive, archive_path, archive_usage
+
+        archive_usage(self.cutoff)
+        # 같은 세션이 다시 올라온 경우(중복)와 늦게 들어온 새 세션
+        self._create(datetime(2025, 1, 6, 12, tzinfo=dt_timezone.utc), "YouTube", self.video, 300)
+        self._create(datetime(2025, 1, 20, 8, tzinfo=dt_timezone.utc), "Memo", None, 30)
+        self.assertEqual(archive_usage(self.cutoff)["rows"], 2)
+
+        starts, durations, apps, categories, _ = MonthArchive(archive_path(self.user.pk, 2025, 1)).decode()
+        self.assertEqual(list(durations), [600, 300, 120, 30])
+        self.assertEqual(list(apps), ["YouTube", "YouTube", "Memo", "Memo"])
+        self.assertEqual(list(categories), [self.video.pk, self.video.pk, 0, 0])
+        self.assertEqual(int(starts[0]), int(datetime(2025, 1, 6, 12, tzinfo=dt_timezone.utc).timestamp()))
+
+    def test_summary_api_filters_by_dates(self):
+        from .archive import archive_usage
+
+        archive_usage(self.cutoff)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        res = client.get(reverse("usage_summary"), {"group_by": "app", "start": "2025-01-08", "end": "2025-04-01"})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["results"], [
+            {"app_name": "Memo", "total_seconds": 120, "total_minutes": 2, "sessions": 1},
+            {"app_name": "YouTube", "total_seconds": 60, "total_minutes": 1, "sessions": 1},
+        ])
+        self.assertEqual(client.get(reverse("usage_summary"), {"group_by": "device"}).status_code, 400)
+        self.assertEqual(client.get(reverse("usage_summary"), {"start": "2025-02-30"}).status_code, 400)
+
+    def test_reuploaded_archived_sessions_are_duplicates(self):
+        from .archive import archive_usage, usage_summary
+
+        archive_usage(self.cutoff)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        start = datetime(2025, 1, 6, 12, tzinfo=dt_timezone.utc)
+        rows = [
+            {"app_name": "YouTube", "start_time": start.isoformat(),                       # 보관된 세션
+             "end_time": (start + timedelta(seconds=300)).isoformat()},
+            {"app_name": "YouTube", "start_time": (start + timedelta(hours=1)).isoformat(),  # 새 세션
+             "end_time": (start + timedelta(hours=1, seconds=60)).isoformat()},
+        ]
+        res = client.generic("POST", reverse("usage_bulk_ingest"), _ndjson(rows), content_type="application/x-ndjson")
+
+        self.assertEqual((res.data["accepted"], res.data["duplicates"]), (1, 1))
+        self.assertEqual(AppUsage.objects.filter(start_time__lt=self.cutoff).count(), 1)
+        youtube = next(r for r in usage_summary("app", user=self.user) if r["app_name"] == "YouTube")
+        self.assertEqual(youtube["total_seconds"], 600 + 300 + 60 + 60)
@@ -0,0 +1,11 @@
+# usage/urls.py
+# - 앱 사용 기록 관련 API 라우팅
+
+from django.urls import path
+from .views import AppUsageHistoryView, AppUsageIngestView, AppUsageSummaryView
+
+urlpatterns = [
+    path("sessions/", AppUsageHistoryView.as_view(), name="usage_history"),
+    path("summary/", AppUsageSummaryView.as_view(), name="usage_summary"),
+    path("sessions/bulk/", AppUsageIngestView.as_view(), name="usage_bulk_ingest"),
+]
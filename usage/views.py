@@ -1,3 +1,108 @@
-from django.shortcuts import render
+# usage/views.py
+# - 앱 사용 기록 대량 업로드 API
+# - 앱 사용 기록 조회 API (keyset 페이지네이션)
+# - 앱 사용 시간 집계 API (DB + 보관 파일)
 
-# Create your views here.
+import gzip
+import zlib
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from backend.pagination import KeysetPaginator
+
+from .ingest import ingest_usage_lines, open_ndjson_lines
+from .models import AppUsage
+
+
+class AppUsageIngestView(APIView):
+    """
+    POST /api/usage/sessions/bulk/
+    Content-Type: application/x-ndjson (선택: Content-Encoding: gzip)
+    Body: 한 줄에 세션 1개
+      {"app_name": "YouTube", "category": "Video", "usage_type": "foreground",
+       "start_time": "2025-11-20T09:00:00+09:00", "end_time": "2025-11-20T09:12:30+09:00"}
+    - 본문을 스트리밍으로 읽어 청크 단위 bulk_create
+    - (user, 앱, start_time) 중복은 건너뜀 → 재전송해도 안전
+    - 응답: 전체/청크별 accepted·duplicates·rejected 개수
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        # request.data 를 건드리지 않아야 DRF 파서가 본문 전체를 읽지 않음
+        lines = open_ndjson_lines(
+            request.stream, request.headers.get("Content-Encoding", "")
+        )
+        try:
+            report = ingest_usage_lines(request.user, lines)
+        except (gzip.BadGzipFile, zlib.error, EOFError) as e:
+            return Response(
+                {"detail": f"gzip 본문을 읽을 수 없습니다: {e}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(report)
+
+
+class AppUsageHistoryView(APIView):
+    """
+    GET /api/usage/sessions/?limit=50&fields=app_name,start_time,duration_seconds&cursor=...
+    - 내 앱 사용 기록 최신순(start_time), 다음 페이지는 응답의 next URL 사용
+    - app_name / category 는 카탈로그의 이름 (선택했을 때만 JOIN)
+    """
+    permission_classes = [IsAuthenticated]
+    paginator = KeysetPaginator("start_time", {
+        "id": "id",
+        "app_name": "app__app_name",
+        "category": "category__category_name",
+        "usage_type": "usage_type",
+        "start_time": "start_time",
+        "end_time": "end_time",
+        "duration_seconds": "duration_seconds",
+    })
+
+    def get(self, request):
+        return self.paginator.paginate(request, AppUsage.objects.filter(user=request.user))
+
+
+class AppUsageSummaryView(APIView):
+    """
+    GET /api/usage/summary/?group_by=app&start=2025-11-01&end=2025-12-01
+    - group_by: app / category / usage_type (쉼표로 여러 개)
+    - start <= 세션 시작 < end (현지 날짜, 생략 가능)
+    - 최근 기록은 DB, 보관된 오래된 기록은 보관 파일에서 읽어 합산
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        group_by = tuple(request.query_params.get("group_by", "app").split(","))
+        bounds = {}
+        for name in ("start", "end"):
+            value = request.query_params.get(name)
+            if value:
+                try:
+                    day = parse_date(value)
+                except ValueError:   # 없는 날짜 (2025-02-30)
+                    day = None
+                if day is None:
+                    return Response(
+                        {"detail": f"{name} 는 YYYY-MM-DD 형식이어야 합니다."},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                bounds[name] = timezone.make_aware(datetime.combine(day, time.min))
+
+        try:
+            from .archive import usage_summary
+        except ImportError:
+            # numpy 가 없으면 보관 기능도 쓸 수 없으므로 DB 만 집계
+            usage_summary = AppUsage.objects.usage_by
+        try:
+            rows = list(usage_summary(group_by, user=request.user, **bounds))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"results": rows})
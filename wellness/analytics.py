@@ -0,0 +1,244 @@
+# wellness/analytics.py
+# - 주간 리포트용 분석 (NumPy 벡터 연산)
+#   1) 사용자 × 카테고리 × 시간대(0~23시) 사용 시간
+#   2) 잠금 해제 목표 연속 달성일(streak)
+#   3) 감정 라벨 ↔ 다음날 총 사용 시간 상관관계
+# - 기간 내 행을 values_list 로 한 번에 읽어 열(column) 배열로 만든 뒤
+#   행 단위 파이썬 루프 없이 전체 사용자를 한 번에 집계
+# - numpy 는 이 모듈에서만 사용 (뷰/명령에서 필요할 때 import)
+
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from usage.models import AppCategory, AppUsage
+from .models import DailySummary, EmotionLog
+
+DEFAULT_UNLOCK_LIMIT = 50   # 하루 잠금 해제가 이 횟수 이하이면 목표 달성
+UNCATEGORIZED = "미분류"
+
+
+# ---------------------
+# 로딩: QuerySet → 열 배열
+# ---------------------
+
+def _columns(rows, width):
+    """values_list 결과(튜플 목록) → 열(column) 튜플 목록"""
+    return list(zip(*rows)) if rows else [()] * width
+
+
+def _ints(column):
+    return np.fromiter(column, dtype=np.int64, count=len(column))
+
+
+def _epoch(datetimes):
+    return np.fromiter((dt.timestamp() for dt in datetimes), dtype=np.int64, count=len(datetimes))
+
+
+def _local_offsets(epoch):
+    """
+    UTC epoch 초 → settings.TIME_ZONE 의 UTC 오프셋(초)
+    - 오프셋은 시(hour) 단위로만 바뀌므로 고유한 시각(시 단위)만 계산 후 펼침 (서머타임 대응)
+    """
+    tz = ZoneInfo(settings.TIME_ZONE)
+    hours, inverse = np.unique(epoch // 3600, return_inverse=True)
+    offsets = np.array(
+        [datetime.fromtimestamp(int(h) * 3600, tz).utcoffset().total_seconds() for h in hours],
+        dtype=np.int64,
+    )
+    return offsets[inverse]
+
+
+def _range(start_date, end_date):
+    """현지 날짜 [start_date, end_date) → aware datetime 범위"""
+    return (
+        timezone.make_aware(datetime.combine(start_date, time.min)),
+        timezone.make_aware(datetime.combine(end_date, time.min)),
+    )
+
+
+def _filter_users(qs, user_ids):
+    return qs if user_ids is None else qs.filter(user_id__in=user_ids)
+
+
+def load_usage(start_date, end_date, user_ids=None):
+    """기간 내 AppUsage → {"user", "category", "local_hour", "seconds"} 배열"""
+    start, end = _range(start_date, end_date)
+    qs = _filter_users(AppUsage.objects.filter(start_time__gte=start, start_time__lt=end), user_ids)
+    rows = list(qs.values_list(
+        "user_id", Coalesce("category_id", Value(0)), "start_time", "duration_seconds"
+    ))
+    users, categories, starts, seconds = _columns(rows, 4)
+    epoch = _epoch(starts)
+    local = epoch + _local_offsets(epoch)
+    return {
+        "user": _ints(users),
+        "category": _ints(categories),    # 0: 미분류
+        "local_hour": (local // 3600) % 24,
+        "seconds": _ints(seconds),
+    }
+
+
+def load_daily(start_date, end_date, user_ids=None):
+    """기간 내 DailySummary → {"user", "day"(ordinal), "unlocks", "minutes"} 배열 (user, day 순 정렬)"""
+    qs = _filter_users(
+        DailySummary.objects.filter(summary_date__gte=start_date, summary_date__lt=end_date), user_ids
+    ).order_by("user_id", "summary_date")
+    rows = list(qs.values_list("user_id", "summary_date", "total_unlocks", "total_usage_minutes"))
+    users, dates, unlocks, minutes = _columns(rows, 4)
+    return {
+        "user": _ints(users),
+        "day": np.fromiter((d.toordinal() for d in dates), dtype=np.int64, count=len(dates)),
+        "unlocks": _ints(unlocks),
+        "minutes": _ints(minutes),
+    }
+
+
+def load_emotions(start_date, end_date, user_ids=None):
+    """기간 내 EmotionLog → {"user", "day"(현지 날짜 ordinal), "label"} 배열"""
+    start, end = _range(start_date, end_date)
+    qs = _filter_users(EmotionLog.objects.filter(created_at__gte=start, created_at__lt=end), user_ids)
+    rows = list(qs.values_list("user_id", "created_at", "emotion_label"))
+    users, created, labels = _columns(rows, 3)
+    epoch = _epoch(created)
+    local = epoch + _local_offsets(epoch)
+    return {
+        "user": _ints(users),
+        # 1970-01-01 의 ordinal 을 더해 date.toordinal() 과 같은 기준으로
+        "day": local // 86400 + datetime(1970, 1, 1).toordinal(),
+        "label": np.array(labels, dtype=object),
+    }
+
+
+# ---------------------
+# 집계
+# ---------------------
+
+def usage_by_category_hour(usage):
+    """
+    사용자 × 카테고리 × 시간대 사용 시간(분)
+    - 세션 전체를 시작 시각의 시간대에 넣음
+    - 반환: {user_id: {카테고리명: [0시 ~ 23시 분]}}
+    """
+    if not len(usage["user"]):
+        return {}
+    user_ids, u_idx = np.unique(usage["user"], return_inverse=True)
+    cat_ids, c_idx = np.unique(usage["category"], return_inverse=True)
+    flat = (u_idx * len(cat_ids) + c_idx) * 24 + usage["local_hour"]
+    totals = np.bincount(
+        flat, weights=usage["seconds"], minlength=len(user_ids) * len(cat_ids) * 24
+    ).reshape(len(user_ids), len(cat_ids), 24) / 60
+
+    names = dict(AppCategory.objects.filter(id__in=cat_ids.tolist()).values_list("id", "category_name"))
+    result = {}
+    for i, user_id in enumerate(user_ids.tolist()):
+        used = totals[i].sum(axis=1) > 0
+        result[user_id] = {
+            names.get(cat_id, UNCATEGORIZED): np.round(totals[i, j], 1).tolist()
+            for j, cat_id in enumerate(cat_ids.tolist()) if used[j]
+        }
+    return result
+
+
+def unlock_streaks(daily, limit=DEFAULT_UNLOCK_LIMIT):
+    """
+    잠금 해제 횟수가 limit 이하인 날이 연속된 최대 일수 / 마지막 날 기준 현재 연속 일수
+    - daily 는 (user, day) 순으로 정렬돼 있어야 함
+    - 반환: {user_id: {"longest": n, "current": n}}
+    """
+    n = len(daily["user"])
+    if not n:
+        return {}
+    good = daily["unlocks"] <= limit
+    same_user = np.r_[False, daily["user"][1:] == daily["user"][:-1]]
+    next_day = np.r_[False, daily["day"][1:] == daily["day"][:-1] + 1]
+    # 이전 행과 이어지는 달성일이 아니면 새 구간 시작
+    continues = same_user & next_day & good & np.r_[False, good[:-1]]
+    run_id = np.cumsum(~continues) - 1
+    run_len = np.bincount(run_id, weights=good).astype(np.int64)
+    lengths = run_len[run_id]
+
+    user_ids, first = np.unique(daily["user"], return_index=True)
+    last = np.r_[first[1:], n] - 1
+    longest = np.maximum.reduceat(lengths, first)
+    current = np.where(good[last], lengths[last], 0)
+    return {
+        user_id: {"longest": int(lo), "current": int(cur)}
+        for user_id, lo, cur in zip(user_ids.tolist(), longest, current)
+    }
+
+
+def emotion_next_day_usage(emotions, daily):
+    """
+    감정 기록일 다음날의 총 사용 시간(분)과 감정 라벨의 관계
+    - 감정 기록 1건 = 표본 1개, 다음날 DailySummary 가 없는 기록은 제외
+    - correlation: 해당 라벨 여부(0/1)와 다음날 사용 시간의 피어슨 상관계수(point-biserial)
+    - 반환: {라벨: {"count", "mean_next_day_minutes", "correlation"}}
+    """
+    if not len(emotions["user"]) or not len(daily["user"]):
+        return {}
+    # (user, day) → 하나의 정수 키로 만들어 정렬 후 searchsorted 로 조인
+    span = int(max(daily["day"].max(), emotions["day"].max()) + 2)
+    daily_key = daily["user"] * span + daily["day"]
+    order = np.argsort(daily_key)
+    daily_key, minutes = daily_key[order], daily["minutes"][order]
+
+    want = emotions["user"] * span + emotions["day"] + 1
+    pos = np.clip(np.searchsorted(daily_key, want), 0, len(daily_key) - 1)
+    found = daily_key[pos] == want
+    if not found.any():
+        return {}
+    next_minutes = minutes[pos[found]].astype(np.float64)
+    labels, l_idx = np.unique(emotions["label"][found], return_inverse=True)
+
+    counts = np.bincount(l_idx, minlength=len(labels))
+    sums = np.bincount(l_idx, weights=next_minutes, minlength=len(labels))
+    # 지시변수 x(0/1) 와 y 의 상관: (mean_y|x=1 - mean_y) * sqrt(p / (1 - p)) / std_y
+    n, mean_y, std_y = len(next_minutes), next_minutes.mean(), next_minutes.std()
+    p = counts / n
+    means = sums / counts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = (means - mean_y) * np.sqrt(p / (1 - p)) / std_y
+    return {
+        label: {
+            "count": int(c),
+            "mean_next_day_minutes": round(float(m), 1),
+            "correlation": round(float(r), 3) if np.isfinite(r) else None,
+        }
+        for label, c, m, r in zip(labels.tolist(), counts, means, corr)
+    }
+
+
+def weekly_report(start_date, days=7, user_ids=None, unlock_limit=DEFAULT_UNLOCK_LIMIT):
+    """
+    [start_date, start_date + days) 주간 리포트
+    - user_ids 가 None 이면 전체 사용자, 감정 상관관계는 대상 사용자 전체를 합쳐 계산
+    """
+    end_date = start_date + timedelta(days=days)
+    usage = load_usage(start_date, end_date, user_ids)
+    # 감정 기록 마지막 날의 "다음날" 까지 필요
+    daily = load_daily(start_date, end_date + timedelta(days=1), user_ids)
+    emotions = load_emotions(start_date, end_date, user_ids)
+
+    in_range = daily["day"] < end_date.toordinal()
+    category_hour = usage_by_category_hour(usage)
+    streaks = unlock_streaks({k: v[in_range] for k, v in daily.items()}, unlock_limit)
+    users = sorted(set(category_hour) | set(streaks))
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "unlock_limit": unlock_limit,
+        "users": {
+            user_id: {
+                "category_hour_minutes": category_hour.get(user_id, {}),
+                "unlock_streak": streaks.get(user_id, {"longest": 0, "current": 0}),
+            }
+            for user_id in users
+        },
+        "emotion_next_day_usage": emotion_next_day_usage(emotions, daily),
+    }
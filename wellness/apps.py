@@ -4,3 +4,23 @@ from django.apps import AppConfig
 class WellnessConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "wellness"
+
+    def ready(self):
+        # 설정 읽기 캐시 무효화 (저장/삭제 시)
+        from django.db.models.signals import post_delete, post_save
+        from . import settings_cache
+        from .models import UserPreferences, UserSettings
+
+        for signal in (post_save, post_delete):
+            signal.connect(settings_cache.on_settings_changed, sender=UserSettings,
+                           dispatch_uid="wellness.settings_cache.settings")
+            signal.connect(settings_cache.on_preferences_changed, sender=UserPreferences,
+                           dispatch_uid="wellness.settings_cache.preferences")
+
+        # 모델 사전 로드는 설정으로 켠 경우에만 (기본은 첫 사용 시 로드)
+        # - gunicorn --preload 사용 시 fork 이후 워커에서 다시 로드되므로 post_fork 훅에서 호출 권장
+        from .inference import get_config, get_server
+
+        mode = get_config()["WARMUP"]
+        if mode:
+            get_server().warmup(wait=(mode == "blocking"))
@@ -0,0 +1,128 @@
+# wellness/async_views.py
+# - ASGI(uvicorn) 환경용 async 뷰 — views.py 와 같은 요청/응답 형식
+# - DRF APIView 는 동기 전용이라 Django async View + async ORM(aget_or_create, acreate) 사용
+# - 감정 모델 fallback 도 await 로 처리 → 요청마다 스레드 전환이 생기지 않음
+
+import json
+
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from accounts.authentication import async_jwt_required
+from .chatbot import ascore_emotions, coaching_for
+from .logic_goal import adjust_target_minutes_weighted, get_config as get_goal_config, log_weights
+from .models import AiCoachingLog, EmotionLog, UserSettings
+from .serializers import UserSettingsSerializer
+from .settings_cache import aget_entry, ainvalidate, aprime, not_modified
+from .writebehind import awrite_logs
+
+JSON_PARAMS = {"ensure_ascii": False}
+
+
+def _json_body(request):
+    try:
+        body = json.loads(request.body or b"{}")
+    except ValueError:
+        return None
+    return body if isinstance(body, dict) else None
+
+
+def _bad_request(detail):
+    return JsonResponse({"detail": detail}, status=400, json_dumps_params=JSON_PARAMS)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncEmotionMessageView(View):
+    """
+    POST /api/wellness/async/chatbot/message/
+    - EmotionMessageView 의 async 버전
+    - async 코드에서는 transaction.atomic 을 쓸 수 없으므로
+      목표치는 조건부 UPDATE(이전 값이 그대로일 때만 갱신)로 동시 메시지 덮어쓰기 방지
+    """
+
+    @async_jwt_required
+    async def post(self, request):
+        body = _json_body(request)
+        if body is None:
+            return _bad_request("JSON 객체 본문이 필요합니다.")
+        text = body.get("message", "") or ""
+
+        # 1) 규칙 기반 분류 → 2) 모호하면 모델 분류
+        scores = await ascore_emotions(text)
+        emotion, source = scores["emotion"], scores["source"]
+        msg = coaching_for(emotion)
+
+        # 3) 감정/코칭 로그 저장
+        await awrite_logs([
+            EmotionLog(
+                user=request.user, emotion_label=emotion, emotion_weights=log_weights(scores["weights"]),
+                source=source, log_text=text,
+            ),
+            AiCoachingLog(
+                user=request.user,
+                insight_text=f"감정: {emotion} ({source})",
+                suggestion_text=msg,
+            ),
+        ])
+
+        # 4) 목표치 조정 (다른 요청이 먼저 바꿨으면 다시 읽고 재계산, 야간 일괄 조정 모드면 생략)
+        settings_obj, _ = await UserSettings.objects.aget_or_create(user=request.user)
+        for _ in range(3 if get_goal_config()["INLINE_ADJUST"] else 0):
+            current = settings_obj.target_daily_usage_min
+            new_target = adjust_target_minutes_weighted(current, scores["weights"], settings_obj.stress_sensitivity)
+            if new_target == current:
+                break
+            updated = await UserSettings.objects.filter(
+                pk=settings_obj.pk, target_daily_usage_min=current
+            ).aupdate(target_daily_usage_min=new_target)
+            if updated:
+                settings_obj.target_daily_usage_min = new_target
+                await ainvalidate("settings", settings_obj.user_id)
+                break
+            await settings_obj.arefresh_from_db(
+                fields=["target_daily_usage_min", "stress_sensitivity"]
+            )
+
+        return JsonResponse({
+            "emotion": emotion,
+            "coachingMessage": msg,
+            "newTargetDailyUsage": settings_obj.target_daily_usage_min,
+        }, json_dumps_params=JSON_PARAMS)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncUserSettingsView(View):
+    """
+    GET   /api/wellness/async/settings/  → 사용자 설정 조회 (UserSettingsView 와 같은 캐시 / ETag)
+    PATCH /api/wellness/async/settings/  → 설정 일부 수정
+    """
+
+    @async_jwt_required
+    async def get(self, request):
+        entry = await aget_entry("settings", request.user)
+        if not_modified(request, entry):
+            response = HttpResponseNotModified()
+            response["ETag"] = entry["etag"]
+            return response
+        response = JsonResponse(entry["data"], json_dumps_params=JSON_PARAMS)
+        response["ETag"] = entry["etag"]
+        return response
+
+    @async_jwt_required
+    async def patch(self, request):
+        body = _json_body(request)
+        if body is None:
+            return _bad_request("JSON 객체 본문이 필요합니다.")
+        settings_obj, _ = await UserSettings.objects.aget_or_create(user=request.user)
+        ser = UserSettingsSerializer(settings_obj, data=body, partial=True)
+        if not ser.is_valid():
+            return JsonResponse(ser.errors, status=400, json_dumps_params=JSON_PARAMS)
+        for field, value in ser.validated_data.items():
+            setattr(settings_obj, field, value)
+        await settings_obj.asave(update_fields=list(ser.validated_data))
+        entry = await aprime("settings", settings_obj.user_id, UserSettingsSerializer(settings_obj).data)
+        response = JsonResponse(entry["data"], json_dumps_params=JSON_PARAMS)
+        response["ETag"] = entry["etag"]
+        return response
@@ -0,0 +1,145 @@
+# wellness/cache.py
+# - 감정 분류 결과 캐시 (프로세스 내, 크기 제한 + TTL)
+# - 키: (규칙/모델 버전, 정규화된 문장) → 같은 짧은 문장이 반복돼도 분류/모델 추론을 건너뜀
+
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from django.conf import settings
+
+from backend import perf
+
+DEFAULT_CONFIG = {
+    "ENABLED": True,
+    "MAX_SIZE": 10000,      # 최대 항목 수
+    "TTL_SECONDS": 3600,    # 항목 유효 시간
+    "POLICY": "lru",        # 가득 찼을 때 제거 정책: "lru" / "fifo"
+}
+
+_MISSING = object()
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """캐시 키용 정규화: 유니코드 NFC, 소문자, 앞뒤 공백 제거, 연속 공백 1칸으로"""
+    text = unicodedata.normalize("NFC", text or "")
+    return _SPACES.sub(" ", text).strip().lower()
+
+
+def cache_key(version, text):
+    return (version, normalize_text(text))
+
+
+class ClassificationCache:
+    """
+    크기 제한 + TTL 캐시
+    - policy="lru": 조회할 때마다 최근 사용으로 갱신, 가장 오래 안 쓴 항목부터 제거
+    - policy="fifo": 먼저 들어온 항목부터 제거
+    - hits / misses / evictions 카운터 제공, name 은 요청 계측(backend.perf)에 쓰는 캐시 이름
+    """
+
+    def __init__(self, max_size=10000, ttl_seconds=3600, policy="lru", name="emotion"):
+        if policy not in ("lru", "fifo"):
+            raise ValueError(f"지원하지 않는 캐시 정책입니다: {policy}")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.policy = policy
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()   # key → (만료 시각, 값)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING:
+                expires_at, value = item
+                if expires_at > time.monotonic():
+                    self.hits += 1
+                    perf.record_cache(self.name, True)
+                    if self.policy == "lru":
+                        self._data.move_to_end(key)
+                    return value
+                del self._data[key]
+            self.misses += 1
+            perf.record_cache(self.name, False)
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, version, text, compute):
+        """
+        (version, 정규화된 text) 로 조회, 없으면 compute(정규화된 text) 결과를 저장 후 반환
+        - compute 가 예외를 던지면 저장하지 않음(모델 오류 등은 캐시되지 않음)
+        """
+        key = cache_key(version, text)
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute(key[1])
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class _NullCache:
+    """캐시 비활성화 시 사용 (항상 compute)"""
+
+    def get(self, key, default=None):
+        return default
+
+    def set(self, key, value):
+        pass
+
+    def get_or_compute(self, version, text, compute):
+        return compute(normalize_text(text))
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_classification_cache():
+    """settings.EMOTION_CACHE 기준 프로세스 공용 캐시"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            config = {**DEFAULT_CONFIG, **getattr(settings, "EMOTION_CACHE", {})}
+            if config["ENABLED"]:
+                _cache = ClassificationCache(
+                    max_size=config["MAX_SIZE"],
+                    ttl_seconds=config["TTL_SECONDS"],
+                    policy=config["POLICY"],
+                )
+            else:
+                _cache = _NullCache()
+        return _cache
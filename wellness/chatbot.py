@@ -1,5 +1,16 @@
 # wellness/chatbot.py
 # - 규칙 기반 감정 분류와 감정별 코칭 문구 테이블
+# - score_emotions: 키워드 1회 스캔 + 모델 최대 1번 호출로 걸린 감정 전부 / 모델 확률 / 목표 조정 가중치를 반환
+#   classify_emotion, predict_emotion 은 그 결과의 단일 레이블 버전
+
+import hashlib
+
+from collections import defaultdict
+
+from .cache import get_classification_cache
+from .emotion_analysis import amodel_result, model_result, rule_matches
+from .inference import LABEL_MAP, ModelUnavailable, get_server
+from .matcher import EmotionMatcher
 
 EMOTION_KEYWORDS = {
     # "키워드" : "감정레이블"
@@ -11,16 +22,108 @@ EMOTION_KEYWORDS = {
     "기분 좋": "활력", "컨디션 좋": "활력", "상쾌": "활력",
 }
 
+# 모듈 로드 시 한 번만 컴파일 (테이블 순서 = 우선순위)
+_keyword_matcher = EmotionMatcher.from_keywords(EMOTION_KEYWORDS, lowercase=True)
+
+# 키워드 테이블이 바뀌면 캐시 키도 바뀌도록 테이블 내용으로 버전 생성
+RULE_VERSION = "rules:" + hashlib.sha1(
+    repr(list(EMOTION_KEYWORDS.items())).encode("utf-8")
+).hexdigest()[:12]
+
+def _match_keywords(text: str) -> tuple[str, ...]:
+    return tuple(label for label, _ in rule_matches(_keyword_matcher, text))
+
+def keyword_emotions(text: str) -> tuple[str, ...]:
+    """
+    키워드에 걸린 감정 전부 (테이블 순서 = 우선순위, 중복 없음)
+    - 미리 컴파일한 매처로 텍스트를 한 번만 스캔
+    - 결과는 (RULE_VERSION, 정규화된 문장) 키로 캐시
+    """
+    return get_classification_cache().get_or_compute(RULE_VERSION, text, _match_keywords)
+
 def classify_emotion(text: str) -> str | None:
     """
     간단한 키워드 매칭으로 감정을 분류.
+    - keyword_emotions() 중 테이블 순서상 가장 앞선 감정 반환
     - 매칭 실패 시 None 반환(→ 상위 로직에서 모델로 분류하는 fallback 지점)
     """
-    t = text.lower()
-    for k, v in EMOTION_KEYWORDS.items():
-        if k in t:
-            return v
-    return None
+    emotions = keyword_emotions(text)
+    return emotions[0] if emotions else None
+
+# 감정 분류 모델 레이블(3종) → 챗봇 감정 레이블
+MODEL_EMOTION_MAP = {"슬픔/부정": "우울", "중립": "안정", "기쁨/긍정": "활력"}
+
+def _scores(emotions, result, status) -> dict:
+    """
+    키워드 결과 + 모델 결과 → score_emotions() 반환 형식
+    - emotion / source: 기존 단일 결과 (키워드 1순위 → 모델 → 기본값 "안정")
+    - model_emotions: 모델 확률을 챗봇 감정으로 옮긴 값
+    - weights: 목표 조정용 감정별 비중 (키워드에 걸린 감정들은 같은 비중,
+      모델로 분류했으면 1순위 감정 1.0 — 확률 평균으로 조정량이 줄지 않도록, 기본값은 "안정" 1.0)
+    """
+    model_emotions = defaultdict(float)
+    if result is not None:
+        for label, p in result["scores"].items():
+            model_emotions[MODEL_EMOTION_MAP.get(LABEL_MAP.get(label), "안정")] += p
+    if emotions:
+        emotion, source = emotions[0], "Rule-Based"
+        weights = {e: 1 / len(emotions) for e in emotions}
+    elif result is not None:
+        emotion, source = MODEL_EMOTION_MAP.get(result["label_kor"], "안정"), f"AI-Model ({result['label']})"
+        weights = {emotion: 1.0}
+    else:
+        emotion, source = "안정", "Rule-Based (Default)"
+        weights = {"안정": 1.0}
+    return {
+        "rules": [(e, "Rule-Based") for e in emotions],
+        "model": result,
+        "model_status": status,
+        "model_emotions": dict(model_emotions),
+        "emotion": emotion,
+        "source": source,
+        "weights": weights,
+    }
+
+def score_emotions(text: str, model: str = "fallback") -> dict:
+    """
+    문장 1개의 감정 후보 전체를 한 번에 계산
+    - model: "fallback"(키워드에 안 걸렸을 때만) / "always"(키워드와 함께 모델 확률도) / "never"
+    - 반환: {"rules": [(감정, source)], "model": 모델 결과 또는 None, "model_status": ...,
+             "model_emotions": {감정: 확률}, "emotion": 1순위 감정, "source": ..., "weights": {감정: 비중}}
+    """
+    emotions = keyword_emotions(text)
+    return _scores(emotions, *model_result(text, model, bool(emotions)))
+
+async def ascore_emotions(text: str, model: str = "fallback") -> dict:
+    """score_emotions() 의 async 버전"""
+    emotions = keyword_emotions(text)
+    return _scores(emotions, *await amodel_result(text, model, bool(emotions)))
+
+def predict_emotion(text: str) -> tuple[str, str]:
+    """
+    규칙에 안 걸린 문장을 감정 분류 모델로 분류 → (감정, source)
+    - 모델을 쓸 수 없으면 기본값 "안정"
+    """
+    scores = _scores((), *model_result(text, "always"))
+    return scores["emotion"], scores["source"]
+
+def predict_emotions(texts: list[str]) -> list[tuple[str, str]]:
+    """
+    predict_emotion() 의 배치 버전 (과거 기록 재처리 등 오프라인용)
+    - 모델 서버가 문장들을 토큰 길이별로 묶어 추론
+    """
+    try:
+        results = get_server().predict_many(texts)
+    except ModelUnavailable:
+        return [("안정", "Rule-Based (Default)")] * len(texts)
+    return [
+        (MODEL_EMOTION_MAP.get(r["label_kor"], "안정"), f"AI-Model ({r['label']})") for r in results
+    ]
+
+async def apredict_emotion(text: str) -> tuple[str, str]:
+    """predict_emotion() 의 async 버전"""
+    scores = _scores((), *await amodel_result(text, "always"))
+    return scores["emotion"], scores["source"]
 
 def coaching_for(emotion: str) -> str:
     """감정에 맞춘 간단한 코칭 문구 반환"""
@@ -0,0 +1,118 @@
+# wellness/emotion_analysis.py
+# - 룰 + AI 모델을 결합한 최종 감정 분석 (analyze_emotion.py 에서 옮겨옴)
+# - score_emotions: 룰 전체를 한 번 스캔 + 모델 최대 1번 호출로 걸린 감정 전부와 모델 확률을 반환
+# - analyze_emotion_final: 그 결과에서 1순위만 고르는 단일 레이블 버전
+#   (룰에 걸리면 룰 1순위, 안 걸린 문장만 모델 서버(wellness.inference)로 분류)
+
+from .inference import ModelUnavailable, get_server
+from .matcher import EmotionMatcher, EmotionRule
+
+# 룰 우선순위 테이블 (위에서부터 먼저 적용)
+FINAL_RULES = [
+    #1-A순위: 룰(Rule) 기반 피로
+    EmotionRule("피로", "Rule-Based (Fatigue)",
+                keywords=['피곤', '지친다', '지쳤어', '무기력', '힘들다']),
+    #1-B순위: 룰(Rule) 기반 피로(패턴)
+    EmotionRule("피로", "Rule-Based (Fatigue Pattern)",
+                patterns=[r'기운.*(없|안 나)']),
+    #2순위: 룰(Rule) 기반 불안
+    EmotionRule("불안", "Rule-Based (Anxiety)",
+                keywords=['불안', '걱정', '초조', '떨린다']),
+    #3순위: 룰(Rule) 기반 짜증/분노
+    EmotionRule("짜증/분노", "Rule-Based (Anger)",
+                keywords=['짜증', '화가 나', '화나', '열 받네', '열받아']),
+    #4순위: AI가 실수한 케이스 룰로 보완
+    #슬퍼서를 중립으로 판단하는 AI 실수 방지
+    EmotionRule("슬픔/부정", "Rule-Based (Sadness-Fix)",
+                keywords=['슬퍼서', '슬프다', '슬퍼']),
+    # 아무렇지도 않아를 부정으로 판단하는 AI 실수 방지
+    EmotionRule("중립", "Rule-Based (Neutral-Fix)",
+                keywords=['아무렇지도 않아']),
+]
+
+# 키워드/패턴을 한 번만 컴파일해 두고, 텍스트는 한 번만 스캔
+final_matcher = EmotionMatcher(FINAL_RULES)
+
+
+# 모델 호출 방식: "fallback" 룰에 안 걸렸을 때만 / "always" 룰과 함께 확률도 / "never" 룰만
+MODEL_MODES = ("fallback", "always", "never")
+
+
+def rule_matches(matcher, text):
+    """걸린 규칙 전체 → [(감정, source)] (우선순위 순, 감정마다 가장 앞선 규칙 1개)"""
+    found = {}
+    for i in matcher.matched_rules(text):
+        rule = matcher.rules[i]
+        found.setdefault(rule.label, rule.source)
+    return list(found.items())
+
+
+def _wants_model(model, has_rules):
+    if model not in MODEL_MODES:
+        raise ValueError(f"지원하지 않는 모델 호출 방식입니다: {model}")
+    return model == "always" or (model == "fallback" and not has_rules)
+
+
+def model_result(text, model="fallback", has_rules=False):
+    """
+    모델 결과 1건 → (결과 dict 또는 None, 상태)
+    - 상태: "ok" / "skipped"(호출 안 함) / "error"(로드는 됐지만 추론 실패·시간 초과) / "unavailable"
+    """
+    if not _wants_model(model, has_rules):
+        return None, "skipped"
+    server = get_server()
+    try:
+        return server.predict(text), "ok"
+    except ModelUnavailable:
+        return None, "error" if server.available else "unavailable"
+
+
+async def amodel_result(text, model="fallback", has_rules=False):
+    """model_result() 의 async 버전"""
+    if not _wants_model(model, has_rules):
+        return None, "skipped"
+    server = get_server()
+    try:
+        return await server.apredict(text), "ok"
+    except ModelUnavailable:
+        return None, "error" if server.available else "unavailable"
+
+
+def score_emotions(text, model="fallback"):
+    """
+    최종 감정 분석 다중 레이블 버전
+    - 반환: {
+        "rules": [("피로", "Rule-Based (Fatigue)"), ("불안", "Rule-Based (Anxiety)")],  # 우선순위 순
+        "model": {"label": "LABEL_1", "label_kor": "중립", "score": 0.9, "scores": {...}} 또는 None,
+        "model_status": "ok" / "skipped" / "error" / "unavailable",
+      }
+    """
+    rules = rule_matches(final_matcher, text)
+    result, status = model_result(text, model, bool(rules))
+    return {"rules": rules, "model": result, "model_status": status}
+
+
+def final_label(scores):
+    """score_emotions() 결과 → analyze_emotion_final() 의 단일 결과"""
+    #1~4순위: 룰(Rule) 기반 — 가장 우선순위가 높은 룰 1개
+    if scores["rules"]:
+        label, source = scores["rules"][0]
+        return {"label": label, "source": source}
+
+    #5순위: 룰에 안 걸린 것만 AI가 처리 (동시 요청은 모델 서버가 배치로 묶음)
+    result = scores["model"]
+    if result is not None:
+        return {"label": result["label_kor"], "source": f"AI-Model ({result['label']})"}
+    if scores["model_status"] == "error":
+        return {"label": "중립", "source": "AI Runtime Error"}
+
+    #6순위: AI 로드 실패 시, 모든 룰에 안 걸리면 중립처리
+    return {"label": "중립", "source": "Rule-Based (Default)"}
+
+
+def analyze_emotion_final(text):
+    """
+    최종 감정 분석
+    - 반환: {"label": "피로", "source": "Rule-Based (Fatigue)"}
+    """
+    return final_label(score_emotions(text))
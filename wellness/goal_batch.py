@@ -0,0 +1,133 @@
+# wellness/goal_batch.py
+# - 전체 사용자 목표 사용 시간 야간 일괄 재조정
+# - 하루 동안의 감정 분포 + DailySummary 사용 시간으로 새 목표를 NumPy 로 한 번에 계산
+# - 조정 규칙은 logic_goal 과 동일 (감정별 조정량 × 민감도, 60 ~ 180분 클램프)
+# - 메시지 단위 조정(WELLNESS_GOALS INLINE_ADJUST)을 끈 상태에서만 기록 → 같은 감정을 두 번 반영하지 않음
+# - 바뀐 사용자만 청크 단위로 기록, dry-run 이면 변경 목록만 반환
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from . import settings_cache
+from .logic_goal import MAX_TARGET, MIN_TARGET, message_weights, weighted_delta
+from .models import DailySummary, EmotionLog, UserSettings
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def compute_targets(baselines, sensitivities, delta_sums, log_counts, usage_minutes):
+    """
+    사용자별 배열 → 새 목표 배열
+    - 감정 조정량: 그날 감정 기록들의 조정량 평균 (기록 1건이면 메시지 단위 조정과 같음)
+    - 그날 목표보다 많이 쓴 사용자는 목표를 늘리는(양수) 조정을 적용하지 않음
+    - int(delta * sensitivity) 처럼 0 방향으로 버림 후 클램프
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_delta = np.where(log_counts > 0, delta_sums / log_counts, 0.0)
+    over_target = usage_minutes > baselines
+    mean_delta = np.where(over_target & (mean_delta > 0), 0.0, mean_delta)
+    step = np.trunc(mean_delta * sensitivities).astype(np.int64)
+    return np.clip(baselines + step, MIN_TARGET, MAX_TARGET), mean_delta
+
+
+def plan_recalibration(day):
+    """
+    day(현지 날짜) 하루 기준 전체 사용자 새 목표 계산 → 바뀌는 사용자 목록
+    - 쿼리 3번: UserSettings / 그날 EmotionLog / 그날 DailySummary
+    - 항목: user_id, old_target, new_target,
+      emotion_delta(감정 조정량 평균, 민감도 적용 전), usage_minutes(그날 사용 시간), logs(감정 기록 수)
+    """
+    rows = list(UserSettings.objects.order_by("user_id").values_list(
+        "user_id", "target_daily_usage_min", "stress_sensitivity"
+    ))
+    if not rows:
+        return []
+    users, targets, sensitivities = zip(*rows)
+    users = np.array(users, dtype=np.int64)
+    baselines = np.array(targets, dtype=np.int64)
+    sensitivities = np.array(sensitivities, dtype=np.float64)
+
+    # 감정 기록 → 사용자 위치(users 는 정렬됨) + 조정량
+    # (메시지 단위 조정과 같은 규칙: 저장된 비중이 있으면 가중 평균, 없으면 emotion_label 하나)
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    logs = list(EmotionLog.objects.filter(
+        created_at__gte=start, created_at__lt=start + timedelta(days=1)
+    ).values_list("user_id", "emotion_label", "emotion_weights"))
+    delta_sums = np.zeros(len(users))
+    log_counts = np.zeros(len(users), dtype=np.int64)
+    if logs:
+        deltas = np.array(
+            [weighted_delta(message_weights(label, weights)) for _, label, weights in logs], dtype=np.float64
+        )
+        log_users = np.array([user_id for user_id, _, _ in logs], dtype=np.int64)
+        pos = np.clip(np.searchsorted(users, log_users), 0, len(users) - 1)
+        known = users[pos] == log_users   # 설정 행이 없는 사용자의 기록은 제외
+        delta_sums = np.bincount(pos[known], weights=deltas[known], minlength=len(users))
+        log_counts = np.bincount(pos[known], minlength=len(users))
+
+    usage_minutes = np.zeros(len(users), dtype=np.int64)
+    summaries = list(DailySummary.objects.filter(summary_date=day).values_list(
+        "user_id", "total_usage_minutes"
+    ))
+    if summaries:
+        sum_users, minutes = (np.array(col, dtype=np.int64) for col in zip(*summaries))
+        pos = np.clip(np.searchsorted(users, sum_users), 0, len(users) - 1)
+        known = users[pos] == sum_users
+        usage_minutes[pos[known]] = minutes[known]
+
+    new_targets, mean_delta = compute_targets(
+        baselines, sensitivities, delta_sums, log_counts, usage_minutes
+    )
+    changed = np.flatnonzero(new_targets != baselines)
+    return [
+        {
+            "user_id": int(users[i]),
+            "old_target": int(baselines[i]),
+            "new_target": int(new_targets[i]),
+            "emotion_delta": round(float(mean_delta[i]), 2),
+            "usage_minutes": int(usage_minutes[i]),
+            "logs": int(log_counts[i]),
+        }
+        for i in changed
+    ]
+
+
+def apply_recalibration(changes, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    계산된 변경을 청크 단위 트랜잭션으로 기록 → 실제 바뀐 사용자 수
+    - 계산 이후 목표가 바뀐 사용자(설정 화면에서 직접 수정 등)는 건너뜀 (다음 날 다시 계산)
+    - 새 목표 값(60 ~ 180 중 하나)별로 묶어 UPDATE ... WHERE id IN (...) 1번씩
+      (bulk_update 는 행마다 CASE WHEN 식을 만들어 수만 건에서 파이썬 쪽 비용이 큼)
+    - QuerySet.update() 는 시그널이 없으므로 설정 캐시를 직접 무효화
+    """
+    updated = 0
+    for i in range(0, len(changes), chunk_size):
+        chunk = {c["user_id"]: c for c in changes[i:i + chunk_size]}
+        by_target = defaultdict(list)   # 새 목표 → [settings pk]
+        user_ids = []
+        with transaction.atomic():
+            current = UserSettings.objects.select_for_update().filter(user_id__in=chunk).values_list(
+                "id", "user_id", "target_daily_usage_min"
+            )
+            for pk, user_id, target in current:
+                change = chunk[user_id]
+                if target == change["old_target"]:
+                    by_target[change["new_target"]].append(pk)
+                    user_ids.append(user_id)
+            for target, pks in by_target.items():
+                UserSettings.objects.filter(pk__in=pks).update(target_daily_usage_min=target)
+        settings_cache.invalidate_many("settings", user_ids)
+        updated += len(user_ids)
+    return updated
+
+
+def recalibrate_goals(day, dry_run=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """day 기준 전체 사용자 목표 재조정 → (변경 목록, 실제 기록 수; dry-run 이면 0)"""
+    changes = plan_recalibration(day)
+    if dry_run:
+        return changes, 0
+    return changes, apply_recalibration(changes, chunk_size)
@@ -0,0 +1,339 @@
+# wellness/inference.py
+# - 감정 분류 모델(HuggingFace) 서빙
+# - 워커 프로세스당 1회만 로드, 동시에 들어온 요청을 마이크로 배치로 묶어 한 번에 추론
+# - 추론 전 처리: 정규화된 문장을 MAX_LENGTH 토큰으로 잘라 한 번만 토큰화(토큰 캐시),
+#   쌓여 있는 요청을 토큰 길이 구간(LENGTH_BUCKETS)별로 나눠 배치 → 짧은 메시지가 긴 일기에 맞춰 패딩되지 않음
+# - 모델을 쓸 수 없으면 ModelUnavailable → 호출 측에서 룰 기반으로 fallback
+# - 추론 백엔드(torch / onnx int8)는 wellness.model_backends, 무거운 라이브러리는 모델을 처음 쓸 때
+#   (또는 warmup 시)에만 import → migrate, check 같은 관리 명령과 모델이 필요 없는 워커는 빠르게 뜸
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from django.conf import settings
+
+from backend import perf
+
+from .cache import ClassificationCache, cache_key, get_classification_cache
+from .model_backends import load_backend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = {
+    "ENABLED": True,
+    "NAME": "alsgyu/sentiment-analysis-fine-tuned-model",
+    "MAX_BATCH_SIZE": 16,   # 한 번에 추론할 최대 문장 수
+    "MAX_WAIT_MS": 10,      # 첫 요청 이후 배치를 채우려고 기다리는 최대 시간
+    "TIMEOUT_MS": 3000,     # 요청 1건이 결과를 기다리는 최대 시간
+    "TORCH_THREADS": 1,     # 추론 스레드가 쓰는 torch intra-op 스레드 수
+    "LOCAL_DIR": None,      # 가중치 로컬 캐시 디렉터리 (없으면 허브에서 받아 저장)
+    "BACKEND": "torch",     # 추론 백엔드: "torch" / "onnx" (wellness.model_backends)
+    "MAX_LENGTH": 128,      # 입력 최대 토큰 수 (넘으면 자름)
+    "LENGTH_BUCKETS": (16, 32, 64),  # 배치를 나누는 토큰 길이 구간 상한 (마지막 구간은 MAX_LENGTH)
+    "PENDING_BATCHES": 4,   # 큐에 쌓인 요청을 최대 MAX_BATCH_SIZE × 이 값까지 꺼내 길이별로 묶음
+    "TOKEN_CACHE_SIZE": 10000,  # 문장별 토큰 id 캐시 크기
+    "ONNX_PATH": None,      # onnx 백엔드가 읽을 그래프 (export_emotion_onnx 로 생성)
+    "WARMUP": "",           # 앱 시작 시 미리 로드: "" / "background" / "blocking"
+}
+
+# 모델 출력 레이블 → 한국어 레이블
+LABEL_MAP = {
+    "LABEL_0": "슬픔/부정",
+    "LABEL_1": "중립",
+    "LABEL_2": "기쁨/긍정",
+}
+
+
+class ModelUnavailable(Exception):
+    """모델이 비활성/로드 실패/시간 초과로 결과를 줄 수 없음"""
+
+
+def get_config():
+    return {**DEFAULT_CONFIG, **getattr(settings, "EMOTION_MODEL", {})}
+
+
+def load_pipeline(config):
+    """설정한 백엔드(torch / onnx)의 classify(texts) 함수 생성 (무거운 import 는 백엔드 안에서만)"""
+    return load_backend(config)
+
+
+def _word_prefix(text, limit):
+    """
+    text 의 앞 limit 글자 이하를 단어(공백) 경계에서 자름
+    - 토크나이저는 공백에서 먼저 나누므로 온전한 단어까지의 토큰은 뒤 문장과 무관하게 같음
+    - 경계가 없으면(공백 없는 긴 문자열) 자르지 않음
+    """
+    if len(text) <= limit:
+        return text
+    end = text.rfind(" ", 0, limit + 1)
+    return text[:end] if end > 0 else text
+
+
+class EmotionModelServer:
+    """
+    프로세스 내 모델 서버
+    - 추론 전용 스레드 1개가 큐에서 요청을 꺼내 MAX_BATCH_SIZE / MAX_WAIT_MS 기준으로 배치 구성
+      (그 사이 더 쌓인 요청도 PENDING_BATCHES 배치 분량까지 함께 꺼내 토큰 길이 구간별로 재배치)
+    - 모델은 추론 스레드가 처음 시작될 때 1회 로드
+    """
+
+    def __init__(self, config=None, loader=load_pipeline):
+        self.config = {**DEFAULT_CONFIG, **(config or {})}
+        self.loader = loader
+        self.pid = os.getpid()
+        self.available = None   # None: 로드 전, True/False: 로드 결과
+        self.batch_sizes = []   # 최근 배치 크기 (모니터링용)
+        self.padding_efficiency = []    # 최근 배치의 실제 토큰 / 패딩 포함 토큰
+        self._pipe = None
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._tokens = ClassificationCache(
+            max_size=self.config["TOKEN_CACHE_SIZE"], ttl_seconds=float("inf"), name="tokens"
+        )
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="emotion-model", daemon=True
+                )
+                self._thread.start()
+
+    def warmup(self, wait=False, timeout=None):
+        """추론 스레드를 미리 시작해 모델을 로드 (wait=True 면 로드가 끝날 때까지 대기)"""
+        if not self.config["ENABLED"]:
+            return False
+        self._ensure_started()
+        if wait:
+            self._loaded.wait(timeout)
+        return bool(self.available)
+
+    def submit(self, text):
+        """문장 1개를 큐에 넣고 Future 반환"""
+        future = Future()
+        if not self.config["ENABLED"] or self.available is False:
+            future.set_exception(ModelUnavailable("emotion model disabled or failed to load"))
+            return future
+        self._ensure_started()
+        self._queue.put((text, future))
+        return future
+
+    @property
+    def version(self):
+        """분류 캐시 키에 쓰는 모델 버전"""
+        return f"model:{self.config['NAME']}:{self.config['BACKEND']}"
+
+    def predict(self, text, timeout=None):
+        """
+        문장 1개 분류 (배치는 내부에서 자동 구성)
+        - 같은 (모델 버전, 정규화된 문장)은 분류 캐시에서 바로 반환
+        - 반환: {"label": "LABEL_2", "label_kor": "기쁨/긍정", "score": 0.93, "scores": {...}}
+        """
+        if timeout is None:
+            timeout = self.config["TIMEOUT_MS"] / 1000
+        return get_classification_cache().get_or_compute(
+            self.version, text, lambda t: self._wait(t, timeout)
+        )
+
+    async def apredict(self, text, timeout=None):
+        """
+        predict() 의 async 버전 (ASGI 뷰용)
+        - 이벤트 루프를 막지 않고 추론 스레드의 Future 를 await
+        """
+        if timeout is None:
+            timeout = self.config["TIMEOUT_MS"] / 1000
+        cache = get_classification_cache()
+        key = cache_key(self.version, text)
+        result = cache.get(key)
+        if result is None:
+            started = time.perf_counter()
+            future = self.submit(key[1])
+            try:
+                result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            except asyncio.TimeoutError:
+                raise ModelUnavailable("emotion model timed out")
+            finally:
+                self._record_timing(future, started)
+            cache.set(key, result)
+        return result
+
+    def predict_many(self, texts, timeout=None):
+        """
+        여러 문장을 한 번에 분류 (과거 EmotionLog 재처리 같은 오프라인 작업용)
+        - 캐시에 없는 문장만 중복 없이 한꺼번에 큐에 넣음 → 추론 스레드가 길이 구간별 배치로 처리
+        - timeout 은 문장마다 적용 (앞 문장 결과를 받은 뒤부터 다시 셈)
+        - 반환: texts 와 같은 순서의 결과 목록
+        """
+        if timeout is None:
+            timeout = self.config["TIMEOUT_MS"] / 1000
+        cache = get_classification_cache()
+        keys = [cache_key(self.version, text) for text in texts]
+        results = {}
+        futures = {}
+        for key in keys:
+            if key in results or key in futures:
+                continue
+            value = cache.get(key)
+            if value is None:
+                futures[key] = self.submit(key[1])
+            else:
+                results[key] = value
+        for key, future in futures.items():
+            try:
+                results[key] = future.result(timeout=timeout)
+            except FutureTimeout:
+                raise ModelUnavailable("emotion model timed out")
+            cache.set(key, results[key])
+        return [results[key] for key in keys]
+
+    def _wait(self, text, timeout):
+        started = time.perf_counter()
+        future = self.submit(text)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            raise ModelUnavailable("emotion model timed out")
+        finally:
+            self._record_timing(future, started)
+
+    @staticmethod
+    def _record_timing(future, started):
+        """요청 계측: 전체 대기 시간 중 배치 추론 시간을 뺀 나머지를 큐/배치 구성 대기로 기록"""
+        total = time.perf_counter() - started
+        infer = getattr(future, "infer_seconds", 0.0)
+        perf.record_model(infer, max(total - infer, 0.0))
+
+    def _run(self):
+        try:
+            self._pipe = self.loader(self.config)
+            self.available = True
+        except Exception as e:
+            logger.warning("감정 분류 모델 로드 실패, 룰 기반으로 동작: %s", e)
+            self.available = False
+        self._loaded.set()
+
+        while True:
+            pending = [self._queue.get()]
+            if not self.available:
+                self._fail(pending, ModelUnavailable("emotion model failed to load"))
+                continue
+
+            deadline = time.monotonic() + self.config["MAX_WAIT_MS"] / 1000
+            while len(pending) < self.config["MAX_BATCH_SIZE"]:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            # 이미 쌓여 있는 요청은 기다리지 않고 더 꺼내 길이별로 묶음
+            limit = self.config["MAX_BATCH_SIZE"] * self.config["PENDING_BATCHES"]
+            while len(pending) < limit:
+                try:
+                    pending.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                encodings = self._encode([text for text, _ in pending])
+            except Exception as e:
+                logger.exception("감정 분류 모델 토큰화 오류")
+                self._fail(pending, ModelUnavailable(f"tokenizer error: {e}"))
+                continue
+            items = [(ids, future) for ids, (_, future) in zip(encodings, pending)]
+            for bound, batch in self._buckets(items):
+                self._infer(bound, batch)
+
+    def _encode(self, texts):
+        """
+        정규화된 문장 → 토큰 id tuple (토큰 캐시에 없는 문장만 한 번에 토큰화)
+        - 긴 일기는 앞부분만 토큰화: 4 × MAX_LENGTH 글자 근처의 단어 경계에서 자름
+          → 토큰이 MAX_LENGTH 를 채우면(토크나이저가 잘랐으면) 전체를 토큰화한 결과와 같고,
+            못 채우면([UNK] 하나가 긴 단어 전체를 덮는 경우 등) 두 배 길이로 다시 토큰화
+        """
+        found = {text: self._tokens.get(text) for text in texts}
+        pending = [text for text, ids in found.items() if ids is None]
+        max_length = self.config["MAX_LENGTH"]
+        cut = 4 * max_length
+        while pending:
+            prefixes = [_word_prefix(text, cut) for text in pending]
+            retry = []
+            for text, prefix, ids in zip(pending, prefixes, self._pipe.encode(prefixes)):
+                if len(prefix) < len(text) and len(ids) < max_length:
+                    retry.append(text)
+                    continue
+                self._tokens.set(text, ids)
+                found[text] = ids
+            pending, cut = retry, cut * 2
+        return [found[text] for text in texts]
+
+    def _buckets(self, items):
+        """
+        (토큰 ids, future) 목록 → (구간 상한, 배치) 를 짧은 구간부터
+        - 구간 안에서도 길이순으로 정렬한 뒤 MAX_BATCH_SIZE 씩 자름
+        """
+        max_length = self.config["MAX_LENGTH"]
+        bounds = sorted(b for b in self.config["LENGTH_BUCKETS"] if b < max_length) + [max_length]
+        groups = defaultdict(list)
+        for item in sorted(items, key=lambda item: len(item[0])):
+            groups[bounds[min(bisect_left(bounds, len(item[0])), len(bounds) - 1)]].append(item)
+        size = self.config["MAX_BATCH_SIZE"]
+        for bound, group in sorted(groups.items()):
+            for i in range(0, len(group), size):
+                yield bound, group[i:i + size]
+
+    def _infer(self, bound, batch):
+        encodings = [ids for ids, _ in batch]
+        started = time.perf_counter()
+        try:
+            outputs = self._pipe.classify(encodings)
+        except Exception as e:
+            logger.exception("감정 분류 모델 추론 오류")
+            self._fail(batch, ModelUnavailable(f"inference error: {e}"))
+            return
+        elapsed = time.perf_counter() - started
+
+        self.batch_sizes = (self.batch_sizes + [len(batch)])[-100:]
+        self._record_padding(bound, encodings)
+        for (_, future), result in zip(batch, outputs):
+            future.infer_seconds = elapsed   # 요청 계측용 (set_result 전에 기록)
+            future.set_result({**result, "label_kor": LABEL_MAP.get(result["label"], "중립")})
+
+    def _record_padding(self, bound, encodings):
+        """패딩 효율 = 실제 토큰 수 / (배치 크기 × 배치 안 최대 길이)"""
+        real = sum(len(ids) for ids in encodings)
+        slots = len(encodings) * max(len(ids) for ids in encodings)
+        efficiency = real / slots if slots else 1.0
+        self.padding_efficiency = (self.padding_efficiency + [round(efficiency, 3)])[-100:]
+        registry = perf.get_registry()
+        registry.observe("emotion_model_padding_efficiency", {"bucket": str(bound)}, efficiency)
+        registry.inc("emotion_model_tokens_total", {"kind": "real"}, real)
+        registry.inc("emotion_model_tokens_total", {"kind": "padding"}, slots - real)
+
+    @staticmethod
+    def _fail(batch, exc):
+        for _, future in batch:
+            future.set_exception(exc)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def get_server():
+    """현재 프로세스의 모델 서버 (fork 된 워커에서는 새로 만듦)"""
+    global _server
+    with _server_lock:
+        if _server is None or _server.pid != os.getpid():
+            _server = EmotionModelServer(get_config())
+        return _server
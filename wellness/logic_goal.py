@@ -1,5 +1,31 @@
 # wellness/logic_goal.py
 # - 감정에 따라 목표 사용 시간을 상향/하향 조정하는 간단한 규칙
+# - 메시지 1건 단위 조정(adjust_target_minutes)과 야간 일괄 조정(goal_batch)이 같은 표를 사용
+#   메시지 1건의 조정량 = 감정 비중별 가중 평균 (weighted_delta), 야간 조정은 EmotionLog 에 저장된 비중으로 같은 값 계산
+# - 둘 중 하나만 켜서 씀: WELLNESS_GOALS INLINE_ADJUST=True 면 메시지마다 바로 조정(기본),
+#   False 면 메시지는 목표를 건드리지 않고 recalibrate_goals 가 하루치 감정을 한 번에 반영
+#   (둘 다 켜면 같은 감정이 두 번 반영됨 → recalibrate_goals 는 INLINE_ADJUST 가 켜져 있으면 거부)
+
+from django.conf import settings
+
+DEFAULT_CONFIG = {
+    "INLINE_ADJUST": True,   # 챗봇 메시지마다 목표 조정 (야간 일괄 조정을 쓰면 False)
+}
+
+# 감정별 목표 시간 조정량(분)
+EMOTION_DELTAS = {
+    "피로": -20, "무기력": -15, "우울": -25,
+    "불안": -10, "안정": +5, "활력": +10,
+}
+
+# 목표 시간 하한/상한(분)
+MIN_TARGET = 60
+MAX_TARGET = 180
+
+
+def get_config():
+    return {**DEFAULT_CONFIG, **getattr(settings, "WELLNESS_GOALS", {})}
+
 
 def adjust_target_minutes(baseline: int, emotion: str, sensitivity: float = 1.0) -> int:
     """
@@ -7,10 +33,30 @@ def adjust_target_minutes(baseline: int, emotion: str, sensitivity: float = 1.0)
     - sensitivity: 사용자 민감도(1.0이 기본)
     - 최종 값은 60 ~ 180분 사이로 클램프
     """
-    delta = {
-        "피로": -20, "무기력": -15, "우울": -25,
-        "불안": -10, "안정": +5, "활력": +10,
-    }.get(emotion, 0)
+    return adjust_target_minutes_weighted(baseline, {emotion: 1.0}, sensitivity)
+
 
-    new_value = baseline + int(delta * sensitivity)
-    return max(60, min(180, new_value))  # 하한/상한 제한
+def weighted_delta(weights: dict) -> float:
+    """감정별 비중(chatbot.score_emotions 의 weights) → 감정별 조정량의 가중 평균"""
+    total = sum(weights.values())
+    delta = sum(EMOTION_DELTAS.get(e, 0) * w for e, w in weights.items()) / total if total else 0
+    return round(delta, 9)   # 1/3 같은 비중의 부동소수 오차로 int() 가 한 칸 덜 버리지 않도록
+
+
+def log_weights(weights: dict) -> dict | None:
+    """EmotionLog.emotion_weights 에 저장할 값 (감정이 여러 개일 때만, 1개면 emotion_label 로 충분)"""
+    return dict(weights) if len(weights) > 1 else None
+
+
+def message_weights(label: str, stored: dict | None) -> dict:
+    """EmotionLog 1건의 조정 비중 (저장된 비중이 없으면 emotion_label 1.0)"""
+    return stored or {label: 1.0}
+
+
+def adjust_target_minutes_weighted(baseline: int, weights: dict, sensitivity: float = 1.0) -> int:
+    """
+    여러 감정이 함께 나온 메시지용: 조정량 = weighted_delta(weights)
+    - 감정 1개(비중 1.0)면 adjust_target_minutes 와 같음
+    """
+    new_value = baseline + int(weighted_delta(weights) * sensitivity)
+    return max(MIN_TARGET, min(MAX_TARGET, new_value))  # 하한/상한 제한
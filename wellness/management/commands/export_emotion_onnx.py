@@ -0,0 +1,41 @@
+# wellness/management/commands/export_emotion_onnx.py
+# - 감정 분류 모델을 ONNX 그래프로 내보내고 int8 동적 양자화 (wellness.model_backends.export_onnx)
+# - 결과를 EMOTION_MODEL_BACKEND=onnx 로 서빙 (torch 없이 onnxruntime 만 필요)
+# 실행: python manage.py export_emotion_onnx [--output models/sentiment-onnx] [--no-quantize] [--opset 17]
+
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "감정 분류 모델을 ONNX(fp32 + int8 동적 양자화)로 내보내기"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", help="저장 디렉터리 (기본: EMOTION_MODEL_ONNX_PATH 의 폴더)")
+        parser.add_argument("--no-quantize", action="store_true", help="int8 양자화 생략 (model.onnx 만 생성)")
+        parser.add_argument("--opset", type=int, default=17)
+
+    def handle(self, *args, **options):
+        from wellness.inference import get_config
+
+        config = get_config()
+        output = options["output"] or (Path(config["ONNX_PATH"]).parent if config["ONNX_PATH"] else None)
+        if not output:
+            raise CommandError("--output 또는 EMOTION_MODEL_ONNX_PATH 를 지정하세요.")
+
+        try:
+            from wellness.model_backends import export_onnx
+
+            started = time.perf_counter()
+            paths = export_onnx(config, output, quantize=not options["no_quantize"], opset=options["opset"])
+        except ImportError as e:
+            raise CommandError(
+                f"내보내기에는 transformers, torch, onnx (양자화는 onnxruntime) 가 필요합니다: {e}"
+            )
+        elapsed = time.perf_counter() - started
+
+        for path in paths:
+            self.stdout.write(f"  {path} ({path.stat().st_size / 1024 / 1024:.1f} MB)")
+        self.stdout.write(self.style.SUCCESS(f"{len(paths)}개 그래프 저장 ({elapsed:.1f}s)"))
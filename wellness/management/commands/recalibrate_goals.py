@@ -0,0 +1,69 @@
+# wellness/management/commands/recalibrate_goals.py
+# - 전체 사용자 목표 사용 시간 야간 일괄 재조정 (wellness.goal_batch)
+# - 메시지마다 목표를 바로 조정하는 중이면(WELLNESS_GOALS INLINE_ADJUST=True) 같은 감정이 두 번 반영되므로
+#   --dry-run 외에는 거부 → GOAL_INLINE_ADJUST=False 로 끄고 실행
+# 실행: python manage.py recalibrate_goals [--date 2025-11-20] [--dry-run] [--chunk-size 1000]
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+
+class Command(BaseCommand):
+    help = "하루 감정 분포와 사용 시간으로 전체 사용자 목표 사용 시간을 재조정"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="기준 날짜 YYYY-MM-DD (기본: 어제)")
+        parser.add_argument("--dry-run", action="store_true", help="기록하지 않고 변경 내역만 출력")
+        parser.add_argument("--chunk-size", type=int, default=None, help="한 트랜잭션에서 갱신할 사용자 수 (목표 값별 UPDATE)")
+        parser.add_argument("--show", type=int, default=20, help="출력할 변경 내역 수 (0: 전체)")
+
+    def handle(self, *args, **options):
+        try:
+            from wellness.goal_batch import DEFAULT_CHUNK_SIZE, recalibrate_goals
+        except ImportError as e:
+            raise CommandError(f"목표 일괄 조정에는 numpy 가 필요합니다: {e}")
+        from wellness.logic_goal import get_config
+
+        if get_config()["INLINE_ADJUST"] and not options["dry_run"]:
+            raise CommandError(
+                "챗봇 메시지마다 목표를 조정하는 중이라(WELLNESS_GOALS INLINE_ADJUST) 같은 감정이 두 번 반영됩니다. "
+                "GOAL_INLINE_ADJUST=False 로 끈 뒤 실행하세요."
+            )
+
+        if options["date"]:
+            try:
+                day = parse_date(options["date"])
+            except ValueError:   # 없는 날짜 (2025-02-30)
+                day = None
+            if day is None:
+                raise CommandError("--date 는 YYYY-MM-DD 형식이어야 합니다.")
+        else:
+            day = timezone.localdate() - timedelta(days=1)
+
+        started = time.perf_counter()
+        changes, updated = recalibrate_goals(
+            day,
+            dry_run=options["dry_run"],
+            chunk_size=options["chunk_size"] or DEFAULT_CHUNK_SIZE,
+        )
+        elapsed = time.perf_counter() - started
+
+        shown = changes if not options["show"] else changes[:options["show"]]
+        for c in shown:
+            self.stdout.write(
+                f"  user {c['user_id']}: {c['old_target']} → {c['new_target']}분 "
+                f"(감정 {c['logs']}건, 평균 조정 {c['emotion_delta']:+}, 사용 {c['usage_minutes']}분)"
+            )
+        if len(shown) < len(changes):
+            self.stdout.write(f"  ... 외 {len(changes) - len(shown)}명")
+
+        if options["dry_run"]:
+            self.stdout.write(f"[dry-run] {day} 기준 변경 예정 {len(changes)}명 ({elapsed:.2f}s)")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"{day} 기준 {updated}명 목표 갱신 (계산 {len(changes)}명, {elapsed:.2f}s)"
+            ))
@@ -0,0 +1,67 @@
+# wellness/management/commands/reclassify_emotions.py
+# - 과거 EmotionLog 감정 레이블 일괄 재분류 (wellness.reclassify)
+# - 중단(Ctrl+C, 오류) 후 같은 명령을 다시 실행하면 체크포인트의 id 다음부터 이어서 진행
+# 실행: python manage.py reclassify_emotions [--workers 4] [--chunk-size 1000] [--checkpoint var/reclassify_emotions.json]
+#       [--user 1] [--dry-run] [--reset]
+
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "EMOTION_KEYWORDS / 감정 모델 변경 후 과거 감정 기록을 다시 분류 (바뀐 행만 갱신, 이어서 실행 가능)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=min(os.cpu_count() or 1, 4),
+                            help="분류 프로세스 수 (0: 현재 프로세스에서)")
+        parser.add_argument("--chunk-size", type=int, default=None, help="스트리밍 / bulk_update 청크 크기")
+        parser.add_argument("--checkpoint", default=str(Path(settings.BASE_DIR) / "var" / "reclassify_emotions.json"),
+                            help="진행 상황 파일")
+        parser.add_argument("--reset", action="store_true", help="체크포인트를 지우고 처음부터")
+        parser.add_argument("--user", type=int, action="append", dest="users", help="대상 사용자 id (여러 번 가능)")
+        parser.add_argument("--dry-run", action="store_true", help="기록하지 않고 바뀔 행 수만 출력")
+
+    def handle(self, *args, **options):
+        from wellness.inference import ModelUnavailable
+        from wellness.reclassify import DEFAULT_CHUNK_SIZE, reclassify_logs
+
+        checkpoint = Path(options["checkpoint"])
+        if options["users"]:
+            # 대상이 다른 실행과 진행 위치가 섞이지 않도록 사용자별 파일
+            checkpoint = checkpoint.with_name(
+                f"{checkpoint.stem}-users-{'-'.join(map(str, sorted(options['users'])))}{checkpoint.suffix}"
+            )
+        if options["reset"] and not options["dry_run"]:
+            checkpoint.unlink(missing_ok=True)
+
+        verbose = options["verbosity"] >= 2
+        started = time.perf_counter()
+
+        def progress(state):
+            if verbose:
+                self.stdout.write(f"  id ≤ {state['last_id']}: {state['scanned']}건 확인, {state['updated']}건 변경")
+
+        try:
+            state = reclassify_logs(
+                chunk_size=options["chunk_size"] or DEFAULT_CHUNK_SIZE,
+                workers=options["workers"],
+                checkpoint=checkpoint,
+                user_ids=options["users"],
+                dry_run=options["dry_run"],
+                progress=progress,
+            )
+        except ModelUnavailable as e:
+            raise CommandError(f"감정 모델을 쓸 수 없어 중단 ({e}). 진행 상황: {checkpoint}")
+        elapsed = time.perf_counter() - started
+
+        if options["dry_run"]:
+            self.stdout.write(f"[dry-run] {state['scanned']}건 중 {state['updated']}건 변경 예정 ({elapsed:.2f}s)")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"id ≤ {state['last_id']} 까지 누적 {state['scanned']}건 확인, {state['updated']}건 변경 "
+                f"(이번 실행 {elapsed:.2f}s, 체크포인트 {checkpoint})"
+            ))
@@ -0,0 +1,70 @@
+# wellness/management/commands/weekly_report.py
+# - 전체(또는 지정) 사용자 주간 분석 리포트 생성 (wellness.analytics)
+# 실행: python manage.py weekly_report [--start 2025-11-17] [--days 7] [--user 1 --user 2] [--output report.json]
+
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+
+class Command(BaseCommand):
+    help = "카테고리×시간대 사용 시간 / 잠금 해제 연속 달성일 / 감정-다음날 사용 시간 주간 리포트"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="시작 날짜 YYYY-MM-DD (기본: 오늘 기준 7일 전)")
+        parser.add_argument("--days", type=int, default=7)
+        parser.add_argument("--user", type=int, action="append", dest="users", help="대상 사용자 id (여러 번 가능)")
+        parser.add_argument("--unlock-limit", type=int, help="하루 잠금 해제 목표 횟수")
+        parser.add_argument("--output", help="리포트 JSON 저장 경로")
+
+    def handle(self, *args, **options):
+        try:
+            from wellness.analytics import DEFAULT_UNLOCK_LIMIT, weekly_report
+        except ImportError as e:
+            raise CommandError(f"분석 기능에는 numpy 가 필요합니다: {e}")
+
+        if options["days"] < 1:
+            raise CommandError("--days 는 1 이상이어야 합니다.")
+        # 0 도 유효한 목표 (잠금 해제 없는 날만 달성) → None 일 때만 기본값
+        unlock_limit = DEFAULT_UNLOCK_LIMIT if options["unlock_limit"] is None else options["unlock_limit"]
+        if unlock_limit < 0:
+            raise CommandError("--unlock-limit 은 0 이상이어야 합니다.")
+
+        if options["start"]:
+            try:
+                start_date = parse_date(options["start"])
+            except ValueError:   # 없는 날짜 (2025-02-30)
+                start_date = None
+            if start_date is None:
+                raise CommandError("--start 는 YYYY-MM-DD 형식이어야 합니다.")
+        else:
+            start_date = timezone.localdate() - timedelta(days=options["days"])
+
+        report = weekly_report(
+            start_date,
+            days=options["days"],
+            user_ids=options["users"],
+            unlock_limit=unlock_limit,
+        )
+
+        self.stdout.write(f"{report['start_date']} ~ {report['end_date']} 사용자 {len(report['users'])}명")
+        for user_id, data in report["users"].items():
+            minutes = sum(sum(hours) for hours in data["category_hour_minutes"].values())
+            streak = data["unlock_streak"]
+            self.stdout.write(
+                f"  user {user_id}: 총 {minutes:.0f}분, 잠금 해제 목표 연속 "
+                f"최대 {streak['longest']}일 / 현재 {streak['current']}일"
+            )
+        for label, r in report["emotion_next_day_usage"].items():
+            self.stdout.write(
+                f"  감정 {label}: {r['count']}건, 다음날 평균 {r['mean_next_day_minutes']}분, "
+                f"상관계수 {r['correlation']}"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"리포트 저장: {options['output']}"))
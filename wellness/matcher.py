@@ -0,0 +1,85 @@
+# wellness/matcher.py
+# - 감정 키워드/패턴 매칭 엔진
+# - 모든 키워드를 하나의 정규식으로 미리 컴파일 → 텍스트를 한 번만 스캔해서 전체 히트를 수집
+# - 규칙(rule) 목록의 순서가 곧 우선순위 (먼저 나온 규칙이 이김)
+
+import re
+
+
+class EmotionRule:
+    """
+    감정 규칙 1개
+    - label: 감정 레이블, source: 분류 출처 문자열
+    - keywords: 부분 문자열 그대로 비교할 키워드들
+    - patterns: 정규식 패턴들 (ex. r'기운.*(없|안 나)')
+    """
+
+    def __init__(self, label, source, keywords=(), patterns=()):
+        self.label = label
+        self.source = source
+        self.keywords = tuple(keywords)
+        self.patterns = tuple(patterns)
+
+    def __repr__(self):
+        return f"EmotionRule({self.label!r}, {self.source!r})"
+
+
+class EmotionMatcher:
+    """
+    규칙 목록을 미리 컴파일한 매처
+    - 키워드: 길이 내림차순 alternation 을 lookahead 로 감싸 모든 위치에서 검사
+      (같은 위치에서 시작하는 더 짧은 키워드는 접두사 테이블로 함께 수집)
+    - 패턴: 규칙별로 한 번만 컴파일해 두고 재사용
+    """
+
+    def __init__(self, rules, lowercase=False):
+        self.rules = list(rules)
+        self.lowercase = lowercase
+
+        # 키워드 → 해당 키워드를 가진 규칙 인덱스들
+        self._keyword_rules = {}
+        for i, rule in enumerate(self.rules):
+            for kw in rule.keywords:
+                kw = kw.lower() if lowercase else kw
+                self._keyword_rules.setdefault(kw, []).append(i)
+
+        keywords = sorted(self._keyword_rules, key=len, reverse=True)
+        self._keyword_re = (
+            re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+            if keywords else None
+        )
+        # 키워드 → 자기 자신 + 자신의 접두사인 다른 키워드들의 규칙 인덱스
+        self._implied = {
+            kw: sorted({i for other in keywords if kw.startswith(other)
+                        for i in self._keyword_rules[other]})
+            for kw in keywords
+        }
+        self._patterns = [
+            (i, re.compile(p)) for i, rule in enumerate(self.rules) for p in rule.patterns
+        ]
+
+    @classmethod
+    def from_keywords(cls, table, source="Rule-Based", lowercase=False):
+        """{"키워드": "감정"} 테이블에서 키워드 1개 = 규칙 1개(테이블 순서 = 우선순위)로 생성"""
+        return cls(
+            [EmotionRule(label, source, keywords=[kw]) for kw, label in table.items()],
+            lowercase=lowercase,
+        )
+
+    def matched_rules(self, text):
+        """텍스트에 걸린 모든 규칙 인덱스를 우선순위 순으로 반환"""
+        if self.lowercase:
+            text = text.lower()
+        hits = set()
+        if self._keyword_re is not None:
+            for m in self._keyword_re.finditer(text):
+                hits.update(self._implied[m.group(1)])
+        for i, pattern in self._patterns:
+            if i not in hits and pattern.search(text):
+                hits.add(i)
+        return sorted(hits)
+
+    def first(self, text):
+        """우선순위가 가장 높은 규칙(EmotionRule) 1개, 없으면 None"""
+        hits = self.matched_rules(text)
+        return self.rules[hits[0]] if hits else None
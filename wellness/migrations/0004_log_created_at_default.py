@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:32
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wellness", "0003_dailycategoryusage"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="aicoachinglog",
+            name="created_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name="emotionlog",
+            name="created_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
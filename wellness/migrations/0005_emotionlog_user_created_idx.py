@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wellness", "0004_log_created_at_default"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="emotionlog",
+            index=models.Index(
+                fields=["user", "created_at", "id"], name="emotionlog_user_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def merge_uncategorized(apps, schema_editor):
+    """같은 (user, 날짜) 의 미분류 행이 여러 개면 첫 행에 합치고 나머지 삭제"""
+    DailyCategoryUsage = apps.get_model("wellness", "DailyCategoryUsage")
+    uncategorized = DailyCategoryUsage.objects.filter(category__isnull=True)
+    dupes = (
+        uncategorized.values("user_id", "summary_date")
+        .annotate(n=Count("id"), total=Sum("usage_seconds"))
+        .filter(n__gt=1)
+    )
+    for d in dupes:
+        rows = uncategorized.filter(user_id=d["user_id"], summary_date=d["summary_date"]).order_by("id")
+        keep = rows.first()
+        rows.exclude(pk=keep.pk).delete()
+        DailyCategoryUsage.objects.filter(pk=keep.pk).update(usage_seconds=d["total"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wellness", "0005_emotionlog_user_created_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_uncategorized, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="dailycategoryusage",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(category__isnull=True),
+                fields=("user", "summary_date"),
+                name="dailycategoryusage_uncategorized_unique",
+            ),
+        ),
+    ]
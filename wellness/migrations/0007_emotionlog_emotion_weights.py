@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("wellness", "0006_dailycategoryusage_uncategorized_unique"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="emotionlog",
+            name="emotion_weights",
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
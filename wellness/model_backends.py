@@ -0,0 +1,206 @@
+# wellness/model_backends.py
+# - 감정 분류 모델 추론 백엔드 (EMOTION_MODEL["BACKEND"] 로 선택)
+#   torch : transformers 모델을 PyTorch(fp32)로 직접 실행
+#   onnx  : export_onnx() 로 내보낸 ONNX 그래프(기본 int8 동적 양자화)를 onnxruntime CPU 로 실행
+#           → torch / transformers 없이 onnxruntime + tokenizers + numpy 만 필요
+# - 두 백엔드 모두 Backend(encode, classify) 를 돌려줌
+#   encode(texts)       → 문장별 토큰 id tuple (MAX_LENGTH 토큰에서 자름, 패딩 없음)
+#   classify(encodings) → [{"label", "score", "scores"}] (배치 안 가장 긴 문장 길이까지만 패딩)
+#   softmax 확률과 argmax 를 한 번에 계산, 레이블별 점수를 파이썬에서 다시 정렬하지 않음
+# - 토큰화와 추론을 나눠 두어 모델 서버가 토큰 길이로 배치를 묶을 수 있음 (wellness.inference)
+
+import json
+import os
+from pathlib import Path
+
+
+def _to_results(probs, top, labels):
+    """확률 행렬(list of list) + argmax 인덱스 → 결과 dict 목록"""
+    return [
+        {"label": labels[k], "score": row[k], "scores": dict(zip(labels, row))}
+        for row, k in zip(probs, top)
+    ]
+
+
+def softmax(logits):
+    """numpy logits (batch, labels) → 확률 (행마다 합 1)"""
+    import numpy as np
+
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class Backend:
+    """추론 백엔드: encode / classify 를 따로 쓰거나 backend(texts) 로 한 번에 분류"""
+
+    def __init__(self, encode, classify):
+        self.encode = encode
+        self.classify = classify
+
+    def __call__(self, texts):
+        return self.classify(self.encode(texts))
+
+
+def model_source(config):
+    """(가중치 경로 또는 허브 이름, 로컬 캐시에 저장해야 하는지)"""
+    local_dir = config["LOCAL_DIR"]
+    has_local = bool(local_dir) and os.path.isfile(os.path.join(local_dir, "config.json"))
+    return (local_dir if has_local else config["NAME"]), bool(local_dir) and not has_local
+
+
+def load_torch_model(config):
+    """
+    (tokenizer, model) 로드 (무거운 import 는 여기서만)
+    - LOCAL_DIR 에 저장된 가중치가 있으면 네트워크 없이 그걸 사용
+    - 없으면 허브(NAME)에서 받아 LOCAL_DIR 에 저장해 다음 로드부터 재사용
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    torch.set_num_threads(config["TORCH_THREADS"])
+    source, save_local = model_source(config)
+    tokenizer = AutoTokenizer.from_pretrained(source)
+    model = AutoModelForSequenceClassification.from_pretrained(source)
+    model.eval()
+    if save_local:
+        _save_local(tokenizer, model, config["LOCAL_DIR"])
+    return tokenizer, model
+
+
+def _save_local(tokenizer, model, local_dir):
+    """
+    가중치를 LOCAL_DIR 에 저장
+    - 여러 워커가 동시에 받아 저장할 수 있으므로 임시 폴더에 다 쓴 뒤 rename 으로 한 번에 교체
+      → 다른 워커가 config.json 만 있고 가중치는 덜 쓰인 폴더를 읽는 일이 없음
+    - 다른 워커가 먼저 옮겨 놓았으면 내 임시 폴더는 버림
+    """
+    import shutil
+    import tempfile
+
+    target = Path(local_dir)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=f".{target.name}-", dir=target.parent)
+    try:
+        tokenizer.save_pretrained(tmp)
+        model.save_pretrained(tmp)
+        os.replace(tmp, target)   # target 이 없거나 빈 폴더일 때만 성공
+    except OSError:
+        pass
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_torch(config):
+    import torch
+
+    tokenizer, model = load_torch_model(config)
+    labels = [model.config.id2label[i] for i in range(model.config.num_labels)]
+    max_length = config["MAX_LENGTH"]
+
+    def encode(texts):
+        return [tuple(ids) for ids in tokenizer(texts, truncation=True, max_length=max_length)["input_ids"]]
+
+    def classify(encodings):
+        inputs = tokenizer.pad({"input_ids": [list(ids) for ids in encodings]}, return_tensors="pt")
+        with torch.inference_mode():
+            probs = torch.softmax(model(**inputs).logits, dim=-1)
+        return _to_results(probs.tolist(), probs.argmax(dim=-1).tolist(), labels)
+
+    return Backend(encode, classify)
+
+
+def load_onnx(config):
+    import numpy as np
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+
+    path = Path(config["ONNX_PATH"])
+    if not path.is_file():
+        raise FileNotFoundError(f"{path} 가 없습니다. 먼저 python manage.py export_emotion_onnx 실행")
+    model_config = json.loads((path.parent / "config.json").read_text(encoding="utf-8"))
+    labels = [model_config["id2label"][str(i)] for i in range(len(model_config["id2label"]))]
+    pad_id = model_config.get("pad_token_id") or 0
+
+    tokenizer = Tokenizer.from_file(str(path.parent / "tokenizer.json"))
+    tokenizer.no_padding()
+    tokenizer.enable_truncation(config["MAX_LENGTH"])
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = config["TORCH_THREADS"]
+    options.inter_op_num_threads = 1
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session = ort.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+    input_names = {i.name for i in session.get_inputs()}
+
+    def encode(texts):
+        return [tuple(e.ids) for e in tokenizer.encode_batch(texts)]
+
+    def classify(encodings):
+        width = max(len(e) for e in encodings)
+        ids = np.full((len(encodings), width), pad_id, dtype=np.int64)
+        mask = np.zeros((len(encodings), width), dtype=np.int64)
+        for row, e in enumerate(encodings):
+            ids[row, :len(e)] = e
+            mask[row, :len(e)] = 1
+        # 문장 1개 입력이라 token_type_ids 는 전부 0
+        feeds = {"input_ids": ids, "attention_mask": mask, "token_type_ids": np.zeros_like(ids)}
+        logits = session.run(["logits"], {k: v for k, v in feeds.items() if k in input_names})[0]
+        probs = softmax(logits)
+        return _to_results(probs.tolist(), probs.argmax(axis=1).tolist(), labels)
+
+    return Backend(encode, classify)
+
+
+BACKENDS = {
+    "torch": load_torch,
+    "onnx": load_onnx,
+}
+
+
+def load_backend(config):
+    """설정의 BACKEND 로 Backend 생성"""
+    try:
+        loader = BACKENDS[config["BACKEND"]]
+    except KeyError:
+        raise ValueError(f"지원하지 않는 감정 모델 백엔드입니다: {config['BACKEND']}")
+    return loader(config)
+
+
+def export_onnx(config, output_dir, quantize=True, opset=17):
+    """
+    PyTorch 모델 → ONNX 그래프 (+ int8 동적 양자화)
+    - output_dir 에 model.onnx, model.int8.onnx, tokenizer.json, config.json 저장
+    - batch / sequence 축은 동적, 실제 입력 길이는 추론 시 MAX_LENGTH 로 제한
+    - 반환: 만든 .onnx 경로 목록
+    """
+    import torch
+
+    tokenizer, model = load_torch_model(config)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+
+    sample = tokenizer(
+        ["오늘 하루 어땠어?"], padding="max_length", truncation=True,
+        max_length=config["MAX_LENGTH"], return_tensors="pt",
+    )
+    # forward(input_ids, attention_mask, token_type_ids) 순서대로 위치 인자로 전달
+    names = [k for k in ("input_ids", "attention_mask", "token_type_ids") if k in sample]
+    fp32 = output_dir / "model.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            model, tuple(sample[k] for k in names), str(fp32),
+            input_names=names, output_names=["logits"],
+            dynamic_axes={**{k: {0: "batch", 1: "sequence"} for k in names}, "logits": {0: "batch"}},
+            opset_version=opset,
+        )
+    paths = [fp32]
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        int8 = output_dir / "model.int8.onnx"
+        quantize_dynamic(str(fp32), str(int8), weight_type=QuantType.QInt8)
+        paths.append(int8)
+    return paths
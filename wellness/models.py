@@ -1,5 +1,6 @@
 # wellness/models.py
 from django.db import models
+from django.utils import timezone
 from accounts.models import User
 from usage.models import AppCategory
 
@@ -14,7 +15,16 @@ class EmotionLog(models.Model):
     emotion_label = models.CharField(max_length=50)
     source = models.CharField(max_length=100, null=True, blank=True)
     log_text = models.TextField(null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # 목표 조정 비중 {감정: 비중} — 키워드에 감정이 여러 개 걸린 경우만 저장 (없으면 emotion_label 1.0)
+    emotion_weights = models.JSONField(null=True, blank=True)
+    # auto_now_add 대신 default: write-behind 로 늦게 저장돼도 요청 시각 유지
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # 사용자별 최신순 기록 조회 (keyset 페이지네이션)
+            models.Index(fields=["user", "created_at", "id"], name="emotionlog_user_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.emotion_label}"
@@ -41,6 +51,33 @@ class DailySummary(models.Model):
         return f"{self.user.username} {self.summary_date} 요약"
 
 
+class DailyCategoryUsage(models.Model):
+    """
+    하루 카테고리별 누적 사용시간(초)
+    - DailySummary 를 증분 갱신하기 위한 running total
+    - 사용 기록이 들어올 때마다 해당 날짜/카테고리 행에 더해짐
+    - category 가 null 인 행(미분류)도 하루 1개만 유지
+      (NULL 은 unique_together 로 막히지 않으므로 조건부 unique 제약을 따로 둠)
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    summary_date = models.DateField()
+    category = models.ForeignKey(AppCategory, on_delete=models.CASCADE, null=True)
+    usage_seconds = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("user", "summary_date", "category")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "summary_date"],
+                condition=models.Q(category__isnull=True),
+                name="dailycategoryusage_uncategorized_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} {self.summary_date} {self.category_id}"
+
+
 class Challenge(models.Model):
     """
     챌린지(목표) 테이블
@@ -69,7 +106,7 @@ class AiCoachingLog(models.Model):
     insight_text = models.TextField(null=True, blank=True)
     suggestion_text = models.TextField()
     user_response = models.CharField(max_length=50, null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now)
 
     def __str__(self):
         return f"Coaching for {self.user.username}"
@@ -87,3 +124,18 @@ class UserPreferences(models.Model):
 
     def __str__(self):
         return f"{self.user.username} Preferences"
+
+
+class UserSettings(models.Model):
+    """
+    사용자 목표 설정
+    - 하루 목표 사용 시간(분), 감정 민감도, 온보딩 완료 여부
+    - 챗봇 감정 분석 결과에 따라 target_daily_usage_min 이 조정됨
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE)
+    target_daily_usage_min = models.IntegerField(default=120)
+    stress_sensitivity = models.FloatField(default=1.0)
+    onboarding_completed = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f"{self.user.username} Settings"
@@ -0,0 +1,167 @@
+# wellness/reclassify.py
+# - 과거 EmotionLog 감정 레이블 일괄 재분류 (EMOTION_KEYWORDS 변경 / 감정 모델 교체 후)
+# - 챗봇 메시지와 같은 경로로 분류: 키워드 룰 → 안 걸린 문장만 모델 (wellness.chatbot)
+# - id 순으로 iterator(chunk_size) 스트리밍 → 청크 단위로 프로세스 풀에서 분류 → 바뀐 행만 bulk_update
+# - 청크를 쓸 때마다 마지막 id 를 체크포인트 파일에 기록 → 중단 후 다시 실행하면 이어서 진행
+#   (룰/모델 버전이 체크포인트와 다르면 처음부터)
+# - 작업 프로세스는 DB 를 쓰지 않고 분류만 함 (모델은 프로세스마다 시작할 때 1회 로드)
+# - 모델 대기 시간은 온라인 요청용 TIMEOUT_MS 대신 OFFLINE_TIMEOUT (청크 전체를 배치로 돌리므로)
+
+import json
+import os
+from collections import deque
+from pathlib import Path
+
+from .chatbot import MODEL_EMOTION_MAP, RULE_VERSION, keyword_emotions
+from .inference import get_server
+from .logic_goal import log_weights
+
+DEFAULT_CHUNK_SIZE = 1000
+# 문장 1개 결과를 기다리는 최대 시간(초) — 청크 하나를 길이 구간별 배치로 모두 처리하는 시간보다 넉넉하게
+OFFLINE_TIMEOUT = 600
+
+
+def classification_version():
+    """체크포인트에 기록하는 분류 버전 (키워드 테이블 + 모델 이름/백엔드)"""
+    return f"{RULE_VERSION}|{get_server().version}"
+
+
+def classify_texts(texts):
+    """
+    문장 목록 → [(감정, source, 목표 조정 비중)] (챗봇 메시지 저장 때와 같은 값)
+    - 비중은 키워드에 감정이 여러 개 걸린 경우만 (logic_goal.log_weights), 그 외 None
+    - 룰에 안 걸린 문장은 모델 서버에 한 번에 넣어 길이별 배치로 추론
+    - 모델을 켜 두었는데 쓸 수 없으면(로드 실패, 시간 초과) ModelUnavailable
+      → 기존 AI 레이블을 기본값으로 덮어쓰지 않도록 호출 측에서 중단
+    """
+    results = [None] * len(texts)
+    pending = []
+    for i, text in enumerate(texts):
+        emotions = keyword_emotions(text)
+        if not emotions:
+            pending.append(i)
+        else:
+            results[i] = (emotions[0], "Rule-Based", log_weights({e: 1 / len(emotions) for e in emotions}))
+    if not pending:
+        return results
+
+    server = get_server()
+    if not server.config["ENABLED"]:
+        for i in pending:
+            results[i] = ("안정", "Rule-Based (Default)", None)
+        return results
+    predictions = server.predict_many([texts[i] for i in pending], timeout=OFFLINE_TIMEOUT)
+    for i, r in zip(pending, predictions):
+        results[i] = (MODEL_EMOTION_MAP.get(r["label_kor"], "안정"), f"AI-Model ({r['label']})", None)
+    return results
+
+
+def classify_chunk(rows):
+    """작업 프로세스용: [(id, 문장)] → [(id, (감정, source, 비중))]"""
+    return list(zip([pk for pk, _ in rows], classify_texts([text or "" for _, text in rows])))
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+    # 첫 청크가 모델 로드를 기다리다 시간 초과되지 않도록 미리 로드
+    get_server().warmup(wait=True)
+
+
+def load_checkpoint(path, version):
+    """체크포인트 → 진행 상태 (파일이 없거나 분류 버전이 다르면 처음부터)"""
+    state = {"version": version, "last_id": 0, "scanned": 0, "updated": 0}
+    if path and Path(path).is_file():
+        saved = json.loads(Path(path).read_text(encoding="utf-8"))
+        if saved.get("version") == version:
+            state.update(saved)
+    return state
+
+
+def save_checkpoint(path, state):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def reclassify_logs(chunk_size=DEFAULT_CHUNK_SIZE, workers=0, checkpoint=None, user_ids=None,
+                    dry_run=False, progress=None):
+    """
+    EmotionLog 재분류
+    - workers=0 이면 현재 프로세스에서 분류, 그 외에는 spawn 프로세스 풀 (진행 중인 청크는 workers × 2 개까지)
+    - checkpoint: 진행 상태 JSON 경로 (dry_run 이면 읽기만 함)
+    - progress(state): 청크를 쓸 때마다 호출
+    - 반환: 진행 상태 {"version", "last_id", "scanned", "updated"}
+    """
+    from .models import EmotionLog
+
+    state = load_checkpoint(checkpoint, classification_version())
+    qs = EmotionLog.objects.filter(id__gt=state["last_id"])
+    if user_ids:
+        qs = qs.filter(user_id__in=user_ids)
+    # 갱신하는 행은 항상 이미 읽은 id (≤ 현재 위치) 라 스트리밍 중에 써도 안전
+    rows = qs.order_by("id").values_list(
+        "id", "log_text", "emotion_label", "source", "emotion_weights"
+    ).iterator(chunk_size=chunk_size)
+
+    def write(chunk, results):
+        current = {pk: (label, source, weights) for pk, _, label, source, weights in chunk}
+        changed = [
+            EmotionLog(id=pk, emotion_label=label, source=source, emotion_weights=weights)
+            for pk, (label, source, weights) in results if current[pk] != (label, source, weights)
+        ]
+        if changed and not dry_run:
+            EmotionLog.objects.bulk_update(
+                changed, ["emotion_label", "source", "emotion_weights"], batch_size=chunk_size
+            )
+        state["last_id"] = chunk[-1][0]
+        state["scanned"] += len(chunk)
+        state["updated"] += len(changed)
+        if checkpoint and not dry_run:
+            save_checkpoint(checkpoint, state)
+        if progress:
+            progress(state)
+
+    chunks = _chunks(rows, chunk_size)
+    if not workers:
+        get_server().warmup(wait=True)
+        for chunk in chunks:
+            write(chunk, classify_chunk([(pk, text) for pk, text, *_ in chunk]))
+        return state
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # fork 하면 부모의 DB 커넥션 / 스레드를 물려받으므로 spawn
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+        in_flight = deque()
+        try:
+            for chunk in chunks:
+                in_flight.append((chunk, pool.submit(classify_chunk, [(pk, text) for pk, text, *_ in chunk])))
+                if len(in_flight) >= workers * 2:
+                    chunk, future = in_flight.popleft()
+                    write(chunk, future.result())
+            # 체크포인트가 id 순서대로 움직이도록 제출한 순서대로 기록
+            while in_flight:
+                chunk, future = in_flight.popleft()
+                write(chunk, future.result())
+        except BaseException:
+            for _, future in in_flight:
+                future.cancel()
+            raise
+    return state
@@ -0,0 +1,149 @@
+# wellness/settings_cache.py
+# - 사용자 설정(UserSettings) / 개인 설정(UserPreferences) 읽기 캐시 (read-through)
+# - Django 캐시 프레임워크 사용 (settings.CACHES: locmem 기본, file / db 선택 가능)
+# - 캐시 항목: {"data": 직렬화된 응답, "etag": 응답 해시} → If-None-Match 일치 시 직렬화 없이 304
+# - 모델 저장/삭제 시그널과 목표치 UPDATE 경로에서 무효화
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.http import parse_etags, quote_etag
+
+from backend import perf
+
+from .models import UserPreferences, UserSettings
+from .serializers import UserPreferencesSerializer, UserSettingsSerializer
+
+DEFAULT_CONFIG = {
+    "ENABLED": True,
+    "ALIAS": "default",     # settings.CACHES 의 캐시 이름
+    "TTL_SECONDS": 300,     # 다른 프로세스의 변경이 반영되기까지 최대 지연 (locmem 사용 시)
+}
+
+# 캐시 종류 → (모델, 직렬화기)
+KINDS = {
+    "settings": (UserSettings, UserSettingsSerializer),
+    "preferences": (UserPreferences, UserPreferencesSerializer),
+}
+
+
+def get_config():
+    return {**DEFAULT_CONFIG, **getattr(settings, "WELLNESS_SETTINGS_CACHE", {})}
+
+
+def _cache(config):
+    return caches[config["ALIAS"]]
+
+
+def cache_key(kind, user_id):
+    return f"wellness:{kind}:{user_id}"
+
+
+def make_entry(data):
+    """직렬화된 응답 → 캐시 항목 (ETag 는 내용 해시라 프로세스/백엔드가 달라도 같음)"""
+    body = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return {"data": data, "etag": quote_etag(hashlib.sha1(body.encode("utf-8")).hexdigest())}
+
+
+def get_entry(kind, user):
+    """캐시에서 조회, 없으면 get_or_create 후 직렬화해서 저장"""
+    config = get_config()
+    cache = _cache(config) if config["ENABLED"] else None
+    key = cache_key(kind, user.pk)
+    entry = cache.get(key) if cache else None
+    perf.record_cache(kind, entry is not None)
+    if entry is None:
+        model, serializer_class = KINDS[kind]
+        obj, _ = model.objects.get_or_create(user=user)
+        entry = make_entry(serializer_class(obj).data)
+        if cache:
+            cache.set(key, entry, config["TTL_SECONDS"])
+    return entry
+
+
+async def aget_entry(kind, user):
+    """get_entry() 의 async 버전 (async 뷰용)"""
+    config = get_config()
+    cache = _cache(config) if config["ENABLED"] else None
+    key = cache_key(kind, user.pk)
+    entry = await cache.aget(key) if cache else None
+    perf.record_cache(kind, entry is not None)
+    if entry is None:
+        model, serializer_class = KINDS[kind]
+        obj, _ = await model.objects.aget_or_create(user=user)
+        entry = make_entry(serializer_class(obj).data)
+        if cache:
+            await cache.aset(key, entry, config["TTL_SECONDS"])
+    return entry
+
+
+def prime(kind, user_id, data):
+    """수정 직후 새 응답으로 캐시를 채움 → 캐시 항목 반환"""
+    entry = make_entry(data)
+    config = get_config()
+    if config["ENABLED"]:
+        _cache(config).set(cache_key(kind, user_id), entry, config["TTL_SECONDS"])
+    return entry
+
+
+async def aprime(kind, user_id, data):
+    """prime() 의 async 버전"""
+    entry = make_entry(data)
+    config = get_config()
+    if config["ENABLED"]:
+        await _cache(config).aset(cache_key(kind, user_id), entry, config["TTL_SECONDS"])
+    return entry
+
+
+def invalidate(kind, user_id):
+    """
+    캐시 항목 삭제
+    - 트랜잭션 안이면 커밋 후에 한 번 더 삭제
+      (커밋 전에 다른 요청이 옛 값을 다시 채우는 경우 대비)
+    """
+    config = get_config()
+    if not config["ENABLED"]:
+        return
+    cache = _cache(config)
+    key = cache_key(kind, user_id)
+    cache.delete(key)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: cache.delete(key))
+
+
+def invalidate_many(kind, user_ids):
+    """여러 사용자의 캐시 항목을 한 번에 삭제 (bulk_update 처럼 시그널이 없는 일괄 수정 후)"""
+    config = get_config()
+    if config["ENABLED"] and user_ids:
+        _cache(config).delete_many([cache_key(kind, user_id) for user_id in user_ids])
+
+
+async def ainvalidate(kind, user_id):
+    """invalidate() 의 async 버전 (async 뷰에는 트랜잭션이 없으므로 바로 삭제)"""
+    config = get_config()
+    if config["ENABLED"]:
+        await _cache(config).adelete(cache_key(kind, user_id))
+
+
+def not_modified(request, entry):
+    """If-None-Match 가 현재 ETag 와 같으면 True"""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    # 약한 비교: W/"..." 도 같은 것으로 취급
+    return "*" in etags or entry["etag"] in {e.removeprefix("W/") for e in etags}
+
+
+def on_settings_changed(sender, instance, **kwargs):
+    """UserSettings 저장/삭제 시그널 핸들러"""
+    invalidate("settings", instance.user_id)
+
+
+def on_preferences_changed(sender, instance, **kwargs):
+    """UserPreferences 저장/삭제 시그널 핸들러"""
+    invalidate("preferences", instance.user_id)
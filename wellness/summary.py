@@ -0,0 +1,112 @@
+# wellness/summary.py
+# - 앱 사용 기록 → DailySummary 증분 집계
+# - 원본 AppUsage 를 다시 스캔하지 않고, 들어온 배치만큼 카테고리별 running total 을 더함
+# - 자정을 넘는 세션은 날짜별로 나눠서 반영, 늦게 도착한 기록도 해당 날짜에 그대로 누적
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import DailyCategoryUsage, DailySummary
+
+
+def split_by_local_date(start, end):
+    """
+    세션(start~end)을 현지 시간(settings.TIME_ZONE) 자정 기준으로 나눔
+    - 반환: [(date, 초), ...]
+    """
+    cur = timezone.localtime(start)
+    end = timezone.localtime(end)
+    pieces = []
+    while cur.date() < end.date():
+        next_midnight = timezone.make_aware(
+            datetime.combine(cur.date() + timedelta(days=1), time.min)
+        )
+        pieces.append((cur.date(), int((next_midnight - cur).total_seconds())))
+        cur = next_midnight
+    pieces.append((cur.date(), int((end - cur).total_seconds())))
+    return pieces
+
+
+def apply_usage_batch(sessions):
+    """
+    새로 저장된 AppUsage 배치를 하루 요약에 반영
+    - sessions: user_id / category_id / usage_type / start_time / end_time 을 가진 객체들
+    - 포그라운드 세션 시작 1회를 잠금 해제 1회로 근사해 total_unlocks 에 더함
+    """
+    seconds = defaultdict(int)   # (user_id, date, category_id) → 초
+    unlocks = defaultdict(int)   # (user_id, date) → 횟수
+    for s in sessions:
+        for day, sec in split_by_local_date(s.start_time, s.end_time):
+            seconds[(s.user_id, day, s.category_id)] += sec
+        if s.usage_type == "foreground":
+            unlocks[(s.user_id, timezone.localdate(s.start_time))] += 1
+
+    days = {(u, d) for u, d, _ in seconds} | set(unlocks)
+    if not days:
+        return
+
+    user_ids = {u for u, _ in days}
+    dates = {d for _, d in days}
+
+    with transaction.atomic():
+        # 1) 카테고리별 running total 갱신
+        totals = {
+            (r.user_id, r.summary_date, r.category_id): r
+            for r in DailyCategoryUsage.objects.select_for_update().filter(
+                user_id__in=user_ids, summary_date__in=dates
+            )
+            if (r.user_id, r.summary_date) in days
+        }
+        to_update, to_create = [], []
+        for key, sec in seconds.items():
+            row = totals.get(key)
+            if row is None:
+                user_id, day, category_id = key
+                row = totals[key] = DailyCategoryUsage(
+                    user_id=user_id, summary_date=day,
+                    category_id=category_id, usage_seconds=sec,
+                )
+                to_create.append(row)
+            else:
+                row.usage_seconds += sec
+                to_update.append(row)
+        DailyCategoryUsage.objects.bulk_update(to_update, ["usage_seconds"])
+        DailyCategoryUsage.objects.bulk_create(to_create)
+
+        # 2) 날짜별 합계 / 최다 사용 카테고리 계산 (하루 카테고리 수만큼만 순회)
+        day_seconds = defaultdict(int)
+        top = {}
+        for (user_id, day, category_id), row in totals.items():
+            day_seconds[(user_id, day)] += row.usage_seconds
+            if category_id is not None:
+                best = top.get((user_id, day))
+                if best is None or row.usage_seconds > best.usage_seconds:
+                    top[(user_id, day)] = row
+
+        # 3) DailySummary upsert
+        summaries = {
+            (s.user_id, s.summary_date): s
+            for s in DailySummary.objects.select_for_update().filter(
+                user_id__in=user_ids, summary_date__in=dates
+            )
+        }
+        to_update, to_create = [], []
+        for key in days:
+            user_id, day = key
+            best = top.get(key)
+            summary = summaries.get(key)
+            if summary is None:
+                summary = DailySummary(user_id=user_id, summary_date=day, total_unlocks=0)
+                to_create.append(summary)
+            else:
+                to_update.append(summary)
+            summary.total_usage_minutes = day_seconds[key] // 60
+            summary.total_unlocks += unlocks.get(key, 0)
+            summary.most_used_category_id = best.category_id if best else None
+        DailySummary.objects.bulk_update(
+            to_update, ["total_usage_minutes", "total_unlocks", "most_used_category"]
+        )
+        DailySummary.objects.bulk_create(to_create)
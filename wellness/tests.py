@@ -1,3 +1,978 @@
-from django.test import TestCase
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from backend import perf
+from backend.profiling import Sampler
+from usage.models import App, AppCategory, AppUsage
+from .cache import ClassificationCache, get_classification_cache
+from .inference import EmotionModelServer, ModelUnavailable
+from .model_backends import Backend, _to_results, softmax
+from .logic_goal import adjust_target_minutes, adjust_target_minutes_weighted
+from .chatbot import EMOTION_KEYWORDS, classify_emotion, score_emotions
+from .matcher import EmotionMatcher, EmotionRule
+from .models import AiCoachingLog, DailySummary, EmotionLog, UserPreferences, UserSettings
+from .summary import apply_usage_batch, split_by_local_date
+from .writebehind import LogWriter
+
+KST = ZoneInfo("Asia/Seoul")
+
+
+def _session(user, category, start, end, usage_type="foreground"):
+    return AppUsage(
+        user=user, app=App.objects.get_or_create(app_name="app")[0], category=category, usage_type=usage_type,
+        start_time=start, end_time=end,
+    )
+
+
+class DailySummaryAggregationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "pw")
+        self.video = AppCategory.objects.create(category_name="Video")
+        self.social = AppCategory.objects.create(category_name="Social")
+
+    def test_split_session_across_midnight(self):
+        pieces = split_by_local_date(
+            datetime(2025, 11, 20, 23, 30, tzinfo=KST),
+            datetime(2025, 11, 21, 0, 45, tzinfo=KST),
+        )
+        self.assertEqual(pieces, [(date(2025, 11, 20), 1800), (date(2025, 11, 21), 2700)])
+
+    def test_batches_accumulate_into_daily_summary(self):
+        apply_usage_batch([
+            _session(self.user, self.video,
+                     datetime(2025, 11, 20, 9, 0, tzinfo=KST),
+                     datetime(2025, 11, 20, 9, 40, tzinfo=KST)),
+            _session(self.user, self.social,
+                     datetime(2025, 11, 20, 10, 0, tzinfo=KST),
+                     datetime(2025, 11, 20, 10, 30, tzinfo=KST)),
+        ])
+        # 늦게 도착한 배치: Social 이 최다 사용 카테고리로 바뀌어야 함
+        apply_usage_batch([
+            _session(self.user, self.social,
+                     datetime(2025, 11, 20, 21, 0, tzinfo=KST),
+                     datetime(2025, 11, 20, 21, 20, tzinfo=KST)),
+            _session(self.user, None,
+                     datetime(2025, 11, 20, 22, 0, tzinfo=KST),
+                     datetime(2025, 11, 20, 22, 10, tzinfo=KST), "background"),
+        ])
+
+        summary = DailySummary.objects.get(user=self.user, summary_date=date(2025, 11, 20))
+        self.assertEqual(summary.total_usage_minutes, 100)
+        self.assertEqual(summary.total_unlocks, 3)
+        self.assertEqual(summary.most_used_category, self.social)
+
+
+class EmotionMatcherTests(TestCase):
+    def test_classify_emotion_matches_linear_scan(self):
+        def linear(text):
+            t = text.lower()
+            for k, v in EMOTION_KEYWORDS.items():
+                if k in t:
+                    return v
+            return None
+
+        samples = [
+            "오늘 너무 피곤하고 우울해", "아무 것도 하기 싫어", "기분 좋다 상쾌해",
+            "걱정돼서 잠이 안 와", "그냥 그래", "", "슬프고 졸려",
+        ]
+        for text in samples:
+            self.assertEqual(classify_emotion(text), linear(text), text)
+
+    def test_score_emotions_returns_all_matches_in_one_pass(self):
+        from .emotion_analysis import analyze_emotion_final, score_emotions as score_final
+
+        get_classification_cache().clear()
+        scores = score_emotions("피곤하고 불안해 걱정돼", model="never")
+        self.assertEqual(scores["rules"], [("피로", "Rule-Based"), ("불안", "Rule-Based")])
+        self.assertEqual((scores["emotion"], scores["source"]), ("피로", "Rule-Based"))
+        self.assertEqual(scores["weights"], {"피로": 0.5, "불안": 0.5})
+        self.assertEqual(scores["model_status"], "skipped")
+        self.assertEqual(classify_emotion("피곤하고 불안해 걱정돼"), "피로")
+
+        final = score_final("불안하고 기운이 없어", model="never")
+        self.assertEqual(final["rules"], [("피로", "Rule-Based (Fatigue Pattern)"), ("불안", "Rule-Based (Anxiety)")])
+        self.assertEqual(analyze_emotion_final("불안하고 기운이 없어"),
+                         {"label": "피로", "source": "Rule-Based (Fatigue Pattern)"})
+
+    def test_model_probabilities_alongside_rules_with_one_call(self):
+        calls = []
+
+        def classify(encodings):
+            calls.append(len(encodings))
+            return _to_results([[0.6, 0.3, 0.1]], [0], ["LABEL_0", "LABEL_1", "LABEL_2"])
+
+        get_classification_cache().clear()
+        server = EmotionModelServer(loader=lambda config: Backend(lambda texts: [tuple(t) for t in texts], classify))
+        with patch("wellness.emotion_analysis.get_server", return_value=server):
+            scores = score_emotions("너무 피곤해", model="always")
+            fallback = score_emotions("그냥 그래")
+
+        self.assertEqual(calls, [1, 1])
+        self.assertEqual(scores["emotion"], "피로")             # 룰 1순위는 그대로
+        self.assertEqual(scores["model_emotions"], {"우울": 0.6, "안정": 0.3, "활력": 0.1})
+        self.assertEqual((fallback["emotion"], fallback["source"]), ("우울", "AI-Model (LABEL_0)"))
+        self.assertEqual(fallback["weights"], {"우울": 1.0})   # 모델 분류는 1순위 감정 하나로 조정
+
+    def test_weighted_goal_adjustment(self):
+        self.assertEqual(adjust_target_minutes_weighted(120, {"피로": 1.0}), adjust_target_minutes(120, "피로"))
+        self.assertEqual(adjust_target_minutes_weighted(120, {"피로": 0.5, "불안": 0.5}), 105)
+        self.assertEqual(adjust_target_minutes_weighted(120, {"우울": 1 / 3, "불안": 1 / 3, "안정": 1 / 3}), 110)
+        self.assertEqual(adjust_target_minutes_weighted(120, {}), 120)
+
+    def test_rule_priority_keywords_and_patterns(self):
+        matcher = EmotionMatcher([
+            EmotionRule("피로", "fatigue", keywords=["피곤"]),
+            EmotionRule("피로", "fatigue-pattern", patterns=[r"기운.*(없|안 나)"]),
+            EmotionRule("불안", "anxiety", keywords=["불안"]),
+            EmotionRule("슬픔/부정", "sad", keywords=["슬퍼서", "슬퍼"]),
+        ])
+        self.assertEqual(matcher.first("불안하고 기운이 없어").source, "fatigue-pattern")
+        self.assertEqual(matcher.matched_rules("불안하고 기운이 없어"), [1, 2])
+        self.assertEqual(matcher.first("너무 슬퍼서").label, "슬픔/부정")
+        self.assertIsNone(matcher.first("괜찮아"))
+
+    def test_overlapping_keywords_are_all_found(self):
+        matcher = EmotionMatcher([
+            EmotionRule("a", "short", keywords=["화나"]),
+            EmotionRule("b", "long", keywords=["화나서"]),
+        ])
+        self.assertEqual(matcher.matched_rules("너무 화나서 그래"), [0, 1])
+
+
+class EmotionModelServerTests(TestCase):
+    def setUp(self):
+        get_classification_cache().clear()
+
+    def _fake_loader(self, batches, encoded=None):
+        """글자 하나를 토큰 하나로 보는 가짜 백엔드 (classify 에 들어온 배치의 토큰 길이를 기록)"""
+        def encode(texts, max_length):
+            if encoded is not None:
+                encoded.extend(texts)
+            return [tuple(range(min(len(text), max_length))) for text in texts]
+
+        def classify(encodings):
+            batches.append([len(ids) for ids in encodings])
+            return _to_results([[0.05, 0.05, 0.9]] * len(encodings), [2] * len(encodings), ["LABEL_0", "LABEL_1", "LABEL_2"])
+        return lambda config: Backend(lambda texts: encode(texts, config["MAX_LENGTH"]), classify)
+
+    def test_concurrent_requests_are_batched(self):
+        batches = []
+        server = EmotionModelServer(
+            {"MAX_BATCH_SIZE": 8, "MAX_WAIT_MS": 200}, loader=self._fake_loader(batches)
+        )
+        server.predict("warmup")
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(server.predict, [f"문장 {i}" for i in range(8)]))
+
+        sizes = [len(batch) for batch in batches]
+        self.assertEqual(results[0]["label_kor"], "기쁨/긍정")
+        self.assertEqual(sum(sizes), 9)
+        self.assertLess(len(sizes), 9)
+        self.assertLessEqual(max(sizes), 8)
+
+    def test_pending_requests_are_batched_by_token_length(self):
+        batches, encoded = [], []
+        server = EmotionModelServer(
+            {"MAX_BATCH_SIZE": 4, "MAX_LENGTH": 64, "LENGTH_BUCKETS": (8, 32)},
+            loader=self._fake_loader(batches, encoded),
+        )
+        server.warmup(wait=True, timeout=5)
+        short = [f"짧은 말 {i}" for i in range(4)]
+        long = [f"{i} " + "긴 일기 " * 20 for i in range(4)]
+        texts = [t for pair in zip(short, long) for t in pair]
+
+        results = server.predict_many(texts + texts[:2])
+
+        self.assertEqual(len(results), 10)
+        self.assertEqual(sorted(batches), [[6, 6, 6, 6], [64, 64, 64, 64]])  # 긴 문장은 MAX_LENGTH 에서 자름
+        self.assertEqual(server.padding_efficiency, [1.0, 1.0])
+        self.assertEqual(len(encoded), 8)
+
+        get_classification_cache().clear()
+        server.predict_many(short)
+        self.assertEqual(len(encoded), 8)   # 토큰 캐시 적중 → 다시 토큰화하지 않음
+
+    def test_long_text_prefix_matches_full_tokenization(self):
+        encoded = []
+
+        def encode(texts):
+            # 단어 하나 = 토큰 하나 ([UNK] 처럼 긴 단어도 1개), MAX_LENGTH 에서 자름
+            encoded.extend(texts)
+            return [tuple(len(word) for word in text.split())[:16] for text in texts]
+
+        server = EmotionModelServer(
+            {"MAX_LENGTH": 16}, loader=lambda config: Backend(encode, lambda encodings: []),
+        )
+        server.warmup(wait=True, timeout=5)
+        diary = " ".join(f"{i % 10}" * 9 for i in range(40))   # 10글자당 토큰 1개, 399자
+
+        self.assertEqual(server._encode([diary]), [tuple([9] * 16)])
+        # 64자 → 6토큰, 128자 → 12토큰 (못 채움, 다시) → 256자 → 16토큰에서 잘림
+        self.assertEqual([len(text) for text in encoded], [59, 119, 249])
+        self.assertTrue(all(diary.startswith(text + " ") for text in encoded))   # 단어 경계에서 자름
+
+    def test_load_failure_raises_unavailable(self):
+        def broken(config):
+            raise ImportError("no transformers")
+
+        server = EmotionModelServer(loader=broken)
+        with self.assertRaises(ModelUnavailable):
+            server.predict("아무 말")
+        self.assertFalse(server.available)
+        with self.assertRaises(ModelUnavailable):
+            server.predict("다시")
+
+    def test_wellness_import_does_not_load_model_libraries(self):
+        import sys
+        import wellness.views  # noqa: F401
+
+        self.assertNotIn("transformers", sys.modules)
+        self.assertNotIn("torch", sys.modules)
+
+    def test_warmup_loads_once_before_first_request(self):
+        loads = []
+        server = EmotionModelServer(loader=lambda config: loads.append(1) or (lambda *a, **k: []))
+        self.assertTrue(server.warmup(wait=True, timeout=5))
+        self.assertTrue(server.warmup(wait=True, timeout=5))
+        self.assertEqual(loads, [1])
+
+    def test_backend_returns_argmax_with_probabilities(self):
+        import numpy as np
+
+        probs = softmax(np.array([[2.0, 0.0, -1.0], [0.0, 0.0, 3.0]]))
+        results = _to_results(probs.tolist(), probs.argmax(axis=1).tolist(), ["LABEL_0", "LABEL_1", "LABEL_2"])
+
+        self.assertEqual([r["label"] for r in results], ["LABEL_0", "LABEL_2"])
+        self.assertAlmostEqual(sum(results[0]["scores"].values()), 1.0)
+        self.assertEqual(results[1]["score"], results[1]["scores"]["LABEL_2"])
+
+    def test_local_weights_are_swapped_in_whole(self):
+        from .model_backends import _save_local
+
+        class Part:
+            def __init__(self, name):
+                self.name = name
+
+            def save_pretrained(self, directory):
+                (Path(directory) / self.name).write_text("x")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "sentiment"
+            _save_local(Part("config.json"), Part("model.safetensors"), target)
+            _save_local(Part("config.json"), Part("other.safetensors"), target)   # 늦게 끝난 워커
+
+            self.assertEqual(sorted(p.name for p in target.iterdir()), ["config.json", "model.safetensors"])
+            self.assertEqual([p.name for p in Path(tmp).iterdir()], ["sentiment"])
+
+    def test_missing_onnx_graph_falls_back(self):
+        server = EmotionModelServer({"BACKEND": "onnx", "ONNX_PATH": "/nonexistent/model.int8.onnx"})
+        with self.assertRaises(ModelUnavailable):
+            server.predict("그냥 그래")
+        self.assertFalse(server.available)
+
+    def test_repeated_messages_skip_inference(self):
+        batches = []
+        server = EmotionModelServer(loader=self._fake_loader(batches))
+        server.predict("그냥 그래")
+        server.predict("  그냥   그래 ")
+        self.assertEqual(len(batches), 1)
+
+
+class RequestPerfMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        perf.get_registry().clear()
+        self.user = User.objects.create_user("tester", "tester@example.com", "pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing_and_metrics_per_route(self):
+        first = self.client.get(reverse("user_settings"))
+        second = self.client.get(reverse("user_settings"))
+
+        self.assertIn('cache;desc="hit=0 miss=1"', first["Server-Timing"])
+        self.assertIn('db;dur=0.0;desc="0 queries"', second["Server-Timing"])
+        self.assertIn('cache;desc="hit=1 miss=0"', second["Server-Timing"])
+
+        body = self.client.get(reverse("metrics")).content.decode()
+        route = 'route="api/wellness/settings/"'
+        self.assertIn(f'http_requests_total{{method="GET",{route},status="200"}} 2', body)
+        self.assertIn(f'db_queries_per_request_bucket{{{route},le="0"}} 1', body)
+        self.assertIn(f'db_queries_per_request_count{{{route}}} 2', body)
+        self.assertIn(f'cache_requests_total{{cache="settings",result="hit",{route}}} 1', body)
+
+    def test_metrics_is_local_only(self):
+        res = self.client.get(reverse("metrics"), REMOTE_ADDR="10.0.0.5")
+        self.assertEqual(res.status_code, 404)
+        # 같은 서버의 프록시를 거친 요청 (REMOTE_ADDR 은 127.0.0.1)
+        res = self.client.get(reverse("metrics"), HTTP_X_FORWARDED_FOR="203.0.113.7")
+        self.assertEqual(res.status_code, 404)
+
+    def test_metrics_token_replaces_ip_check(self):
+        with self.settings(PERF_METRICS={"TOKEN": "s3cret"}):
+            self.assertEqual(self.client.get(reverse("metrics")).status_code, 404)
+            self.assertEqual(
+                self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong").status_code, 404
+            )
+            res = self.client.get(
+                reverse("metrics"), HTTP_AUTHORIZATION="Bearer s3cret",
+                REMOTE_ADDR="10.0.0.5", HTTP_X_FORWARDED_FOR="203.0.113.7",
+            )
+            self.assertEqual(res.status_code, 200)
+
+    def test_model_inference_and_batch_wait_are_recorded(self):
+        def slow_classify(encodings):
+            time.sleep(0.02)
+            return [{"label": "LABEL_1", "score": 1.0, "scores": {"LABEL_1": 1.0}} for _ in encodings]
+
+        slow_pipe = Backend(lambda texts: [tuple(text) for text in texts], slow_classify)
+
+        get_classification_cache().clear()
+        server = EmotionModelServer({"MAX_WAIT_MS": 30}, loader=lambda config: slow_pipe)
+        server.warmup(wait=True, timeout=5)
+        with perf.collect() as stats:
+            server.predict("측정용 문장")
+            server.predict("측정용 문장")   # 두 번째는 분류 캐시
+
+        self.assertEqual(stats["model_calls"], 1)
+        self.assertGreaterEqual(stats["model_seconds"], 0.02)
+        self.assertGreaterEqual(stats["model_wait_seconds"], 0.02)   # MAX_WAIT_MS 동안 배치 구성
+        self.assertEqual(dict(stats["cache"]), {("emotion", "miss"): 1, ("emotion", "hit"): 1})
+        body = perf.get_registry().render()
+        self.assertIn('emotion_model_padding_efficiency_count{bucket="16"} 1', body)
+        self.assertIn('emotion_model_tokens_total{kind="padding"} 0', body)
+
+
+class SamplingProfilerTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.user = User.objects.create_user("tester", "tester@example.com", "pw")
+        UserSettings.objects.create(user=self.user, target_daily_usage_min=120)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _slow_classify(self, text):
+        time.sleep(0.05)
+        return ("피로",)
+
+    def _post(self, **headers):
+        with patch("wellness.chatbot.keyword_emotions", side_effect=self._slow_classify):
+            return self.client.post(reverse("chatbot_message"), {"message": "피곤해"}, format="json", **headers)
+
+    def test_sampler_collects_collapsed_stacks(self):
+        import threading
+
+        sampler = Sampler(threading.get_ident(), interval=0.002).start()
+        self._slow_classify("x")
+        stacks = sampler.stop()
+        self.assertTrue(any(s.startswith("request;") and "_slow_classify" in s for s in stacks))
+
+    def test_header_profiles_only_staff_and_rotates(self):
+        from backend.profiling import ProfilerMiddleware
+
+        # JWT 로 인증 (헤더 요청은 뷰 실행 전에 토큰으로 스태프인지 확인)
+        self.client.force_authenticate(None)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+        config = {"ENABLED": True, "DIR": str(self.dir), "INTERVAL_MS": 2, "MAX_FILES": 2}
+        with self.settings(PROFILER=config):
+            with patch.object(ProfilerMiddleware, "_start") as start:
+                res = self._post(HTTP_X_PROFILE="1")
+            start.assert_not_called()   # 스태프가 아니면 수집하지 않음
+            self.assertNotIn("X-Profile-File", res)
+            self.assertEqual(list(self.dir.iterdir()), [])
+
+            self.user.is_staff = True
+            self.user.save()
+            names = [self._post(HTTP_X_PROFILE="1")["X-Profile-File"] for _ in range(3)]
+
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), sorted(names[1:]))
+        lines = (self.dir / names[-1]).read_text(encoding="utf-8").splitlines()
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertTrue(stack.startswith("request;"))
+        self.assertGreater(int(count), 0)
+        self.assertTrue(any("_slow_classify" in line for line in lines))
+
+    def test_header_with_shared_secret(self):
+        config = {"ENABLED": True, "DIR": str(self.dir), "INTERVAL_MS": 2, "SECRET": "s3cret"}
+        with self.settings(PROFILER=config):
+            self.assertNotIn("X-Profile-File", self._post(HTTP_X_PROFILE="1"))
+            self.assertIn("X-Profile-File", self._post(HTTP_X_PROFILE="s3cret"))
+
+    async def test_async_mode_samples_sync_view_worker_thread(self):
+        # AsyncClient → 미들웨어가 async 모드, sync DRF 뷰는 sync_to_async 작업 스레드에서 실행
+        config = {"ENABLED": True, "DIR": str(self.dir), "INTERVAL_MS": 2, "SECRET": "s3cret"}
+        with self.settings(PROFILER=config), patch("wellness.chatbot.keyword_emotions", side_effect=self._slow_classify):
+            res = await AsyncClient().post(
+                reverse("chatbot_message"), {"message": "피곤해"}, content_type="application/json",
+                headers={"Authorization": f"Bearer {AccessToken.for_user(self.user)}", "X-Profile": "s3cret"},
+            )
+
+        self.assertEqual(res.status_code, 200)
+        lines = (self.dir / res["X-Profile-File"]).read_text(encoding="utf-8").splitlines()
+        self.assertTrue(any(line.startswith("worker;") and "_slow_classify" in line for line in lines))
+
+
+class ClassificationCacheTests(TestCase):
+    def test_lru_eviction_and_counters(self):
+        cache = ClassificationCache(max_size=2, ttl_seconds=60, policy="lru")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_fifo_and_ttl(self):
+        cache = ClassificationCache(max_size=2, ttl_seconds=60, policy="fifo")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("a"))
+
+        expired = ClassificationCache(ttl_seconds=0)
+        expired.set("a", 1)
+        self.assertIsNone(expired.get("a"))
+
+    def test_get_or_compute_keys_on_normalized_text_and_version(self):
+        cache = ClassificationCache()
+        calls = []
+        compute = lambda t: calls.append(t) or len(calls)
+        cache.get_or_compute("v1", "피곤해", compute)
+        cache.get_or_compute("v1", " 피곤해  ", compute)
+        cache.get_or_compute("v2", "피곤해", compute)
+        self.assertEqual(calls, ["피곤해", "피곤해"])
+
+
+class EmotionMessageWritePathTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "pw")
+        UserSettings.objects.create(user=self.user, target_daily_usage_min=120)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("chatbot_message")
+        get_classification_cache().clear()
+
+    def _post_and_capture(self, message):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.post(self.url, {"message": message}, format="json")
+        # TestCase 안에서는 atomic() 이 SAVEPOINT 로 바뀌므로 제외하고 센다
+        sql = [q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+        return res, sql
+
+    def test_target_change_uses_four_queries(self):
+        res, sql = self._post_and_capture("오늘 너무 피곤해")
+
+        self.assertEqual(res.data["newTargetDailyUsage"], 100)
+        # SELECT settings, INSERT emotion log, INSERT coaching log, UPDATE settings
+        self.assertEqual(len(sql), 4, sql)
+        self.assertEqual(UserSettings.objects.get(user=self.user).target_daily_usage_min, 100)
+        log = EmotionLog.objects.get(user=self.user)
+        self.assertEqual((log.emotion_label, log.source), ("피로", "Rule-Based"))
+
+    def test_unchanged_target_skips_update(self):
+        UserSettings.objects.filter(user=self.user).update(target_daily_usage_min=60)
+        res, sql = self._post_and_capture("오늘 너무 피곤해")
+
+        self.assertEqual(res.data["newTargetDailyUsage"], 60)
+        self.assertEqual(len(sql), 3, sql)
+
+    def test_write_behind_takes_log_inserts_off_the_request(self):
+        writer = LogWriter(flush_size=10)
+        with patch("wellness.writebehind.get_log_writer", return_value=writer):
+            with self.captureOnCommitCallbacks(execute=True):
+                res, sql = self._post_and_capture("오늘 너무 피곤해")
+
+        self.assertEqual(len(sql), 2, sql)
+        self.assertFalse(EmotionLog.objects.exists())
+        writer.flush()
+        self.assertEqual(EmotionLog.objects.get().emotion_label, "피로")
+        self.assertEqual(AiCoachingLog.objects.get().suggestion_text, res.data["coachingMessage"])
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "pw")
+        UserSettings.objects.create(user=self.user, target_daily_usage_min=120)
+        self.auth = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        self.client = AsyncClient()
+        get_classification_cache().clear()
+
+    async def test_async_message_matches_sync_response(self):
+        res = await self.client.post(
+            reverse("chatbot_message_async"), {"message": "오늘 너무 피곤해"},
+            content_type="application/json", headers=self.auth,
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["emotion"], "피로")
+        self.assertEqual(res.json()["newTargetDailyUsage"], 100)
+        settings_obj = await UserSettings.objects.aget(user=self.user)
+        self.assertEqual(settings_obj.target_daily_usage_min, 100)
+        log = await EmotionLog.objects.aget(user=self.user)
+        self.assertEqual((log.emotion_label, log.source), ("피로", "Rule-Based"))
+
+    async def test_async_settings_patch_and_auth(self):
+        url = reverse("user_settings_async")
+        res = await self.client.get(url)
+        self.assertEqual(res.status_code, 401)
+
+        res = await self.client.patch(
+            url, {"target_daily_usage_min": 90}, content_type="application/json", headers=self.auth,
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["target_daily_usage_min"], 90)
+
+        res = await self.client.get(reverse("me_async"), headers=self.auth)
+        self.assertEqual(res.json()["username"], "tester")
+
+    async def test_async_settings_get_shares_cache_and_etag(self):
+        await cache.aclear()
+        url = reverse("user_settings_async")
+        res = await self.client.get(url, headers=self.auth)
+        self.assertEqual(res.json()["target_daily_usage_min"], 120)
+        etag = res["ETag"]
+
+        res = await self.client.get(url, headers={**self.auth, "If-None-Match": etag})
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res["ETag"], etag)
+        self.assertEqual((await cache.aget(f"wellness:settings:{self.user.pk}"))["etag"], etag)
+
+        res = await self.client.patch(
+            url, {"target_daily_usage_min": 90}, content_type="application/json", headers=self.auth,
+        )
+        res = await self.client.get(url, headers={**self.auth, "If-None-Match": etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["target_daily_usage_min"], 90)
+        self.assertNotEqual(res["ETag"], etag)
+
+
+class SettingsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("tester", "tester@example.com", "pw")
+        UserSettings.objects.create(user=self.user, target_daily_usage_min=120)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("user_settings")
+
+    def test_get_is_served_from_cache_and_revalidated_with_etag(self):
+        with self.assertNumQueries(1):
+            res = self.client.get(self.url)
+        etag = res["ETag"]
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).data["target_daily_usage_min"], 120)
+            res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res["ETag"], etag)
+
+    def test_message_update_invalidates_cached_settings(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.client.post(reverse("chatbot_message"), {"message": "오늘 너무 피곤해"}, format="json")
+
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["target_daily_usage_min"], 100)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_preferences_patch_primes_cache(self):
+        url = reverse("user_preferences")
+        self.client.get(url)
+        res = self.client.patch(url, {"focus_blocked_apps": "YouTube,Instagram"}, format="json")
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(UserPreferences.objects.get(user=self.user).focus_blocked_apps, "YouTube,Instagram")
+
+
+class WeeklyAnalyticsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "pw")
+        self.other = User.objects.create_user("other", "other@example.com", "pw")
+        video = AppCategory.objects.create(category_name="Video")
+        for session in [
+            _session(self.user, video, datetime(2025, 11, 17, 9, 10, tzinfo=KST), datetime(2025, 11, 17, 9, 20, tzinfo=KST)),
+            _session(self.user, video, datetime(2025, 11, 18, 9, 40, tzinfo=KST), datetime(2025, 11, 18, 9, 45, tzinfo=KST)),
+            _session(self.user, None, datetime(2025, 11, 18, 23, 0, tzinfo=KST), datetime(2025, 11, 18, 23, 30, tzinfo=KST)),
+            _session(self.other, video, datetime(2025, 11, 18, 0, 5, tzinfo=KST), datetime(2025, 11, 18, 1, 5, tzinfo=KST)),
+        ]:
+            session.save()
+        # user: 17~19 달성, 20 실패, 22~23 달성(21 기록 없음), other: 17~18 달성
+        for user, day, unlocks, minutes in [
+            (self.user, 17, 10, 100), (self.user, 18, 20, 200), (self.user, 19, 30, 60),
+            (self.user, 20, 80, 300), (self.user, 22, 10, 50), (self.user, 23, 10, 40),
+            (self.other, 17, 5, 30), (self.other, 18, 5, 90),
+        ]:
+            DailySummary.objects.create(
+                user=user, summary_date=date(2025, 11, day),
+                total_unlocks=unlocks, total_usage_minutes=minutes,
+            )
+        # 감정 기록 (KST 자정 직전/직후로 현지 날짜 경계 확인)
+        for user, when, label in [
+            (self.user, datetime(2025, 11, 17, 23, 50, tzinfo=KST), "피로"),
+            (self.user, datetime(2025, 11, 18, 0, 10, tzinfo=KST), "활력"),
+            (self.user, datetime(2025, 11, 19, 12, 0, tzinfo=KST), "피로"),
+            (self.other, datetime(2025, 11, 17, 8, 0, tzinfo=KST), "활력"),
+        ]:
+            EmotionLog.objects.create(user=user, emotion_label=label, created_at=when)
+
+    def test_weekly_report_matches_row_by_row_computation(self):
+        from .analytics import weekly_report
+
+        report = weekly_report(date(2025, 11, 17), unlock_limit=50)
+        mine = report["users"][self.user.id]
+
+        self.assertEqual(mine["category_hour_minutes"]["Video"][9], 15.0)
+        self.assertEqual(mine["category_hour_minutes"]["미분류"][23], 30.0)
+        self.assertEqual(report["users"][self.other.id]["category_hour_minutes"]["Video"][0], 60.0)
+        self.assertEqual(mine["unlock_streak"], {"longest": 3, "current": 2})
+        self.assertEqual(report["users"][self.other.id]["unlock_streak"], {"longest": 2, "current": 2})
+
+        # (감정, 다음날 사용 시간): 피로 17일→200, 활력 18일→60, 피로 19일→300, other 활력 17일→90
+        samples = [("피로", 200), ("활력", 60), ("피로", 300), ("활력", 90)]
+        ys = [y for _, y in samples]
+        mean_y = sum(ys) / len(ys)
+        std_y = (sum((y - mean_y) ** 2 for y in ys) / len(ys)) ** 0.5
+        xs = [1 if label == "피로" else 0 for label, _ in samples]
+        mean_x = sum(xs) / len(xs)
+        cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / len(xs)
+        std_x = (sum((x - mean_x) ** 2 for x in xs) / len(xs)) ** 0.5
+        fatigue = report["emotion_next_day_usage"]["피로"]
+        self.assertEqual((fatigue["count"], fatigue["mean_next_day_minutes"]), (2, 250.0))
+        self.assertAlmostEqual(fatigue["correlation"], round(cov / (std_x * std_y), 3))
+
+    def test_weekly_report_api_returns_own_data(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        res = client.get(reverse("weekly_report"), {"start": "2025-11-17"})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["unlock_streak"], {"longest": 3, "current": 2})
+        self.assertEqual(res.data["emotion_next_day_usage"]["활력"]["count"], 1)
+        self.assertEqual(client.get(reverse("weekly_report"), {"start": "nope"}).status_code, 400)
+        self.assertEqual(client.get(reverse("weekly_report"), {"start": "2025-02-30"}).status_code, 400)
+        self.assertEqual(client.get(reverse("weekly_report"), {"unlock_limit": "-1"}).status_code, 400)
+        self.assertEqual(client.get(reverse("weekly_report"), {"unlock_limit": "0"}).data["unlock_limit"], 0)
+
+    def test_weekly_report_command_rejects_impossible_date(self):
+        from django.core.management import CommandError, call_command
+
+        with self.assertRaisesMessage(CommandError, "YYYY-MM-DD"):
+            call_command("weekly_report", start="2025-02-30")
+        with self.assertRaisesMessage(CommandError, "--days"):
+            call_command("weekly_report", days=0)
+
+    def test_weekly_report_command_keeps_explicit_zero_unlock_limit(self):
+        from django.core.management import call_command
+
+        from .analytics import weekly_report
+
+        with patch("wellness.analytics.weekly_report", wraps=weekly_report) as report:
+            call_command("weekly_report", start="2025-11-17", unlock_limit=0, stdout=StringIO())
+        self.assertEqual(report.call_args.kwargs["unlock_limit"], 0)
+
+
+class GoalRecalibrationTests(TestCase):
+    def setUp(self):
+        self.day = date(2025, 11, 20)
+        self.users = [
+            User.objects.create_user(f"user{i}", f"user{i}@example.com", "pw") for i in range(5)
+        ]
+        for user, target, sensitivity in zip(self.users, [120, 120, 70, 175, 120], [1.0, 1.5, 1.0, 1.0, 1.0]):
+            UserSettings.objects.create(user=user, target_daily_usage_min=target, stress_sensitivity=sensitivity)
+
+    def _log(self, user, label, when=datetime(2025, 11, 20, 12, 0, tzinfo=KST)):
+        EmotionLog.objects.create(user=user, emotion_label=label, created_at=when)
+
+    def test_single_emotion_matches_adjust_target_minutes(self):
+        from .goal_batch import plan_recalibration
+
+        labels = ["피로", "불안", "우울", "활력", "모름"]
+        for user, label in zip(self.users, labels):
+            self._log(user, label)
+        # 다른 날짜(전날 밤)의 기록은 제외
+        self._log(self.users[0], "활력", when=datetime(2025, 11, 19, 23, 30, tzinfo=KST))
+
+        with self.assertNumQueries(3):
+            changes = {c["user_id"]: c for c in plan_recalibration(self.day)}
+        for user, label in zip(self.users, labels):
+            s = UserSettings.objects.get(user=user)
+            expected = adjust_target_minutes(s.target_daily_usage_min, label, s.stress_sensitivity)
+            new = changes[user.id]["new_target"] if user.id in changes else s.target_daily_usage_min
+            self.assertEqual(new, expected, label)
+
+    def test_distribution_overuse_and_dry_run(self):
+        from .goal_batch import recalibrate_goals
+
+        for label in ["피로", "피로", "활력"]:          # 평균 -10
+            self._log(self.users[0], label)
+        self._log(self.users[1], "활력")                  # 목표 초과 사용 → 늘리지 않음
+        DailySummary.objects.create(
+            user=self.users[1], summary_date=self.day, total_usage_minutes=200, total_unlocks=10
+        )
+
+        changes, updated = recalibrate_goals(self.day, dry_run=True)
+        self.assertEqual(updated, 0)
+        self.assertEqual([(c["user_id"], c["new_target"]) for c in changes], [(self.users[0].id, 110)])
+        self.assertEqual(UserSettings.objects.get(user=self.users[0]).target_daily_usage_min, 120)
+
+        changes, updated = recalibrate_goals(self.day, chunk_size=1)
+        self.assertEqual(updated, 1)
+        self.assertEqual(UserSettings.objects.get(user=self.users[0]).target_daily_usage_min, 110)
+
+    def test_nightly_uses_the_same_per_message_rule_as_inline(self):
+        from .goal_batch import plan_recalibration
+
+        server = EmotionModelServer(loader=lambda config: Backend(
+            lambda texts: [tuple(text) for text in texts],
+            lambda encodings: _to_results([[0.9, 0.05, 0.05]] * len(encodings), [0] * len(encodings),
+                                          ["LABEL_0", "LABEL_1", "LABEL_2"]),
+        ))
+        get_classification_cache().clear()
+        client = APIClient()
+        targets = {}
+        with patch("wellness.emotion_analysis.get_server", return_value=server):
+            for user, text in [(self.users[0], "그냥 그래"), (self.users[4], "피곤하고 불안해")]:
+                client.force_authenticate(user)
+                res = client.post(reverse("chatbot_message"), {"message": text}, format="json")
+                targets[user.id] = res.data["newTargetDailyUsage"]
+        self.assertEqual(targets[self.users[0].id], 95)    # 모델 우울(p=0.9) → -25 (확률 평균 -22 가 아님)
+        self.assertEqual(targets[self.users[4].id], 105)   # (피로 -20 + 불안 -10) / 2
+
+        # 야간 조정도 같은 메시지에서 같은 조정량 (메시지 전 목표 120 기준)
+        UserSettings.objects.update(target_daily_usage_min=120)
+        EmotionLog.objects.update(created_at=datetime(2025, 11, 20, 12, 0, tzinfo=KST))
+        changes = {c["user_id"]: c["new_target"] for c in plan_recalibration(self.day)}
+        self.assertEqual(changes, targets)
+
+    def test_batch_mode_leaves_message_targets_to_the_nightly_run(self):
+        from django.core.management import CommandError, call_command
+
+        with self.assertRaisesMessage(CommandError, "INLINE_ADJUST"):
+            call_command("recalibrate_goals", date="2025-11-20", stdout=StringIO())
+        with self.assertRaisesMessage(CommandError, "YYYY-MM-DD"):
+            call_command("recalibrate_goals", date="2025-02-30", dry_run=True, stdout=StringIO())
+
+        with self.settings(WELLNESS_GOALS={"INLINE_ADJUST": False}):
+            client = APIClient()
+            client.force_authenticate(self.users[0])
+            with patch("wellness.chatbot.keyword_emotions", return_value=("피로",)):
+                res = client.post(reverse("chatbot_message"), {"message": "오늘 너무 피곤해"}, format="json")
+            self.assertEqual(res.data["newTargetDailyUsage"], 120)
+            EmotionLog.objects.update(created_at=datetime(2025, 11, 20, 12, 0, tzinfo=KST))
+
+            call_command("recalibrate_goals", date="2025-11-20", stdout=StringIO())
+        # 피로(-20)가 한 번만 반영
+        self.assertEqual(UserSettings.objects.get(user=self.users[0]).target_daily_usage_min, 100)
+
+
+class EmotionReclassifyTests(TestCase):
+    def setUp(self):
+        get_classification_cache().clear()
+        self.user = User.objects.create_user("tester", "tester@example.com", "pw")
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.checkpoint = Path(tmp.name) / "reclassify.json"
+
+    def _log(self, text, label, source="Rule-Based"):
+        return EmotionLog.objects.create(user=self.user, log_text=text, emotion_label=label, source=source)
+
+    def _server(self, broken=False):
+        def loader(config):
+            if broken:
+                raise ImportError("no model")
+            return Backend(
+                lambda texts: [tuple(text) for text in texts],
+                lambda encodings: _to_results([[0.1, 0.1, 0.8]] * len(encodings), [2] * len(encodings),
+                                              ["LABEL_0", "LABEL_1", "LABEL_2"]),
+            )
+        return EmotionModelServer(loader=loader)
+
+    def test_resumes_from_checkpoint_after_model_failure(self):
+        from .reclassify import reclassify_logs
+
+        stale = self._log("오늘 너무 피곤해", "안정")                     # 룰 → 피로
+        same = self._log("내일 발표가 걱정돼", "불안")                    # 그대로
+        ai = self._log("그냥 그래", "안정", "Rule-Based (Default)")       # 모델 → 활력
+
+        with patch("wellness.reclassify.get_server", return_value=self._server(broken=True)):
+            with self.assertRaises(ModelUnavailable):
+                reclassify_logs(chunk_size=2, checkpoint=self.checkpoint)
+        self.assertEqual(EmotionLog.objects.get(pk=stale.pk).emotion_label, "피로")
+        self.assertEqual(json.loads(self.checkpoint.read_text())["last_id"], same.pk)
+
+        with patch("wellness.reclassify.get_server", return_value=self._server()):
+            with self.assertNumQueries(2):   # id > 체크포인트인 행 1건 조회 + UPDATE 1건
+                state = reclassify_logs(chunk_size=2, checkpoint=self.checkpoint)
+        self.assertEqual((state["scanned"], state["updated"], state["last_id"]), (3, 2, ai.pk))
+        ai.refresh_from_db()
+        self.assertEqual((ai.emotion_label, ai.source), ("활력", "AI-Model (LABEL_2)"))
+
+    def test_cold_slow_model_does_not_hit_the_online_timeout(self):
+        from .reclassify import reclassify_logs
+
+        def loader(config):
+            time.sleep(0.1)   # 모델 로드
+
+            def classify(encodings):
+                time.sleep(0.05)
+                return _to_results([[0.1, 0.1, 0.8]] * len(encodings), [2] * len(encodings),
+                                   ["LABEL_0", "LABEL_1", "LABEL_2"])
+            return Backend(lambda texts: [tuple(text) for text in texts], classify)
+
+        ai = self._log("그냥 그래", "안정", "Rule-Based (Default)")
+        server = EmotionModelServer({"TIMEOUT_MS": 10}, loader=loader)   # 온라인 요청 기준이면 시간 초과
+        with patch("wellness.reclassify.get_server", return_value=server):
+            state = reclassify_logs(checkpoint=self.checkpoint)
+        self.assertEqual(state["updated"], 1)
+        ai.refresh_from_db()
+        self.assertEqual(ai.emotion_label, "활력")
+
+    def test_process_pool_and_dry_run(self):
+        from .reclassify import reclassify_logs
+
+        logs = [self._log(f"{i}번째 너무 피곤해", "안정") for i in range(5)]
+
+        state = reclassify_logs(chunk_size=2, workers=1, checkpoint=self.checkpoint, dry_run=True)
+        self.assertEqual(state["updated"], 5)
+        self.assertFalse(self.checkpoint.exists())
+        self.assertFalse(EmotionLog.objects.filter(emotion_label="피로").exists())
+
+        state = reclassify_logs(chunk_size=2, workers=2, checkpoint=self.checkpoint)
+        self.assertEqual((state["scanned"], state["updated"], state["last_id"]), (5, 5, logs[-1].pk))
+        self.assertEqual(EmotionLog.objects.filter(emotion_label="피로").count(), 5)
+
+
+class EmotionLogHistoryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "pw")
+        other = User.objects.create_user("other", "other@example.com", "pw")
+        same_time = datetime(2025, 11, 20, 9, 0, tzinfo=KST)
+        # 같은 시각 기록 여러 개 → (created_at, id) 로 순서가 정해져야 함
+        self.logs = [
+            EmotionLog.objects.create(
+                user=self.user, emotion_label="피로", log_text="x" * 1000,
+                created_at=same_time if i < 3 else same_time + timedelta(hours=i),
+            )
+            for i in range(5)
+        ]
+        EmotionLog.objects.create(user=other, emotion_label="활력", created_at=same_time)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_pages_walk_all_logs_newest_first(self):
+        url, seen = reverse("emotion_history") + "?limit=2", []
+        while url:
+            with self.assertNumQueries(1):
+                res = self.client.get(url)
+            seen += [row["id"] for row in res.data["results"]]
+            url = res.data["next"]
+
+        expected = sorted(self.logs, key=lambda log: (log.created_at, log.id), reverse=True)
+        self.assertEqual(seen, [log.id for log in expected])
+
+    def test_fields_parameter_limits_payload(self):
+        res = self.client.get(reverse("emotion_history"), {"fields": "id,emotion_label"})
+        self.assertEqual(set(res.data["results"][0]), {"id", "emotion_label"})
+
+        self.assertEqual(self.client.get(reverse("emotion_history"), {"fields": "password"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("emotion_history"), {"cursor": "garbage"}).status_code, 400)
+
+
+class LogWriterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "pw")
+
+    def _log(self, i):
+        return EmotionLog(user=self.user, emotion_label="피로", log_text=f"msg {i}")
+
+    def test_flush_bulk_creates_in_batches(self):
+        writer = LogWriter(flush_size=3)
+        for i in range(7):
+            writer.add(self._log(i))
+        with self.assertNumQueries(3):
+            writer.flush()
+        self.assertEqual(EmotionLog.objects.count(), 7)
+
+    def test_overflow_spills_to_file_and_is_replayed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = LogWriter(flush_size=10, max_queue=2, spill_path=f"{tmp}/spill.sqlite3")
+            created_at = datetime(2025, 11, 20, 9, 0, tzinfo=KST)
+            for i in range(5):
+                log = self._log(i)
+                log.created_at = created_at
+                writer.add(log)
+            self.assertEqual(writer.spilled, 3)
+
+            writer.flush()
+            self.assertEqual(EmotionLog.objects.count(), 5)
+            self.assertEqual(EmotionLog.objects.filter(created_at=created_at).count(), 5)
+            self.assertEqual(writer._spill.count(), 0)
+
+    def test_shared_spill_rows_are_claimed_once_and_recovered_without_duplicates(self):
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/spill.sqlite3"
+            first = LogWriter(flush_size=10, spill_path=path)
+            first._spill_objs([self._log(i) for i in range(3)])
+            other = LogWriter(flush_size=10, spill_path=path)   # 같은 파일을 쓰는 다른 워커
+
+            claimed = first._spill.claim(2)
+            self.assertEqual(len(claimed), 2)
+            self.assertEqual([row_id for row_id, _, _ in other._spill.claim(10)], [3])
+            other._spill.release([3])
+
+            # 첫 워커가 INSERT 후 삭제 전에 죽고, 재시작한 워커가 같은 pid 를 받은 상황
+            EmotionLog.objects.bulk_create([obj for _, obj, _ in claimed])
+            restarted = LogWriter(flush_size=10, spill_path=path)
+            self.assertEqual(restarted._spill.token.split(":")[0], first._spill.token.split(":")[0])
+            self.assertEqual([row_id for row_id, _, _ in restarted._spill.claim(10)], [3])   # lease 안
+            restarted._spill.release([3])
+
+            with sqlite3.connect(path) as conn:   # lease 만료
+                conn.execute("UPDATE spill SET claimed_at = claimed_at - 301 WHERE id IN (1, 2)")
+            self.assertEqual(restarted._replay_spill(), 3)
+            self.assertEqual(EmotionLog.objects.count(), 3)
+            self.assertEqual(restarted._spill.count(), 0)
+
+    def test_logs_are_queued_only_after_commit(self):
+        from django.db import transaction
+
+        from .writebehind import write_logs
+
+        writer = LogWriter(flush_size=10)
+        with patch("wellness.writebehind.get_log_writer", return_value=writer):
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        write_logs([self._log(0)])
+                        raise RuntimeError("rollback")
+                except RuntimeError:
+                    pass
+                with transaction.atomic():
+                    write_logs([self._log(1)])
+        writer.flush()
+        self.assertEqual(list(EmotionLog.objects.values_list("log_text", flat=True)), ["msg 1"])
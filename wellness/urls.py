@@ -2,9 +2,20 @@
 # - wellness 관련 API 라우팅
 
 from django.urls import path
-from .views import EmotionMessageView, UserSettingsView
+from .views import (
+    EmotionLogHistoryView, EmotionMessageView, UserPreferencesView, UserSettingsView,
+    WeeklyReportView,
+)
+from .async_views import AsyncEmotionMessageView, AsyncUserSettingsView
 
 urlpatterns = [
     path("chatbot/message/", EmotionMessageView.as_view(), name="chatbot_message"),
     path("settings/", UserSettingsView.as_view(), name="user_settings"),
+    path("preferences/", UserPreferencesView.as_view(), name="user_preferences"),
+    path("analytics/weekly/", WeeklyReportView.as_view(), name="weekly_report"),
+    path("emotions/", EmotionLogHistoryView.as_view(), name="emotion_history"),
+
+    # ASGI(uvicorn) 배포용 async 버전
+    path("async/chatbot/message/", AsyncEmotionMessageView.as_view(), name="chatbot_message_async"),
+    path("async/settings/", AsyncUserSettingsView.as_view(), name="user_settings_async"),
 ]
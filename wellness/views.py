@@ -1,57 +1,86 @@
 # wellness/views.py
 # - 감정 메시지 입력 → 분류 → 저장 → 목표 조정 → 코칭 응답
-# - 사용자 설정 조회/수정 API
+# - 사용자 설정 / 개인 설정 조회·수정 API (읽기 캐시 + ETag)
+# - 주간 분석 리포트 API
+# - 감정 기록 조회 API (keyset 페이지네이션)
 
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from .models import EmotionLog, UserSettings
-from .serializers import EmotionLogSerializer, UserSettingsSerializer
-from .chatbot import classify_emotion, coaching_for
-from .logic_goal import adjust_target_minutes
+from backend.pagination import KeysetPaginator
+from . import settings_cache
+from .models import AiCoachingLog, EmotionLog, UserSettings
+from .serializers import EmotionLogSerializer
+from .chatbot import coaching_for, score_emotions
+from .logic_goal import adjust_target_minutes_weighted, get_config as get_goal_config, log_weights
+from .writebehind import write_logs
 
 class EmotionMessageView(APIView):
     """
     POST /api/wellness/chatbot/message/
     Body: {"message": "오늘 너무 무기력하고 아무 것도 하기 싫어"}
-    1) 규칙 기반으로 감정 분류(모호하면 TODO: 모델 분류)
-    2) EmotionLog 저장
-    3) UserSettings 읽어 목표치 조정 후 저장
+    1) 규칙 기반으로 감정 분류(모호하면 감정 분류 모델로 분류)
+    2) EmotionLog / AiCoachingLog 저장
+    3) UserSettings 읽어 목표치 조정 후 저장 (WELLNESS_GOALS INLINE_ADJUST 가 꺼져 있으면 야간 일괄 조정에 맡김)
     4) 감정/코칭문구/조정된 목표치를 응답
+    - 2)~3)은 하나의 트랜잭션: SELECT ... FOR UPDATE → INSERT → (바뀐 경우만) UPDATE
+    - 분류(모델 추론 포함)는 트랜잭션 밖에서 먼저 수행해 쓰기 잠금을 짧게 유지
+    - WELLNESS_LOG_WRITER 가 켜져 있으면 로그 INSERT 는 write-behind 큐로 빠짐
     """
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
         text = request.data.get("message", "") or ""
 
-        # 1) 규칙 기반 분류
-        emotion = classify_emotion(text)
-
-        # 2) 모호하면 추후 모델 분류(Fallback)로 확장 가능
-        if emotion is None:
-            # TODO: 모델(LLM/감정분류모델) 호출 후 emotion 결정
-            emotion = "안정"  # 임시 기본값
-
-        # 3) 감정 로그 저장
-        EmotionLog.objects.create(
-            user=request.user,
-            emotion=emotion,
-            text_original=text
-        )
-
-        # 4) 사용자 설정 가져오고 목표치 조정
-        settings_obj, _ = UserSettings.objects.get_or_create(user=request.user)
-        new_target = adjust_target_minutes(
-            settings_obj.target_daily_usage_min,
-            emotion,
-            settings_obj.stress_sensitivity
-        )
-        if new_target != settings_obj.target_daily_usage_min:
-            settings_obj.target_daily_usage_min = new_target
-            settings_obj.save(update_fields=["target_daily_usage_min"])
-
-        # 5) 코칭 문구 생성
+        # 1) 규칙 기반 분류 — 걸린 감정 전부를 한 번에
+        # 2) 모호하면 모델 분류(Fallback) — 모델을 못 쓰면 "안정"
+        scores = score_emotions(text)
+        emotion, source = scores["emotion"], scores["source"]
+
         msg = coaching_for(emotion)
+        inline = get_goal_config()["INLINE_ADJUST"]
+
+        with transaction.atomic():
+            # 3) 사용자 설정을 잠그고 가져와 목표치 계산 (동시 메시지끼리 덮어쓰기 방지)
+            settings_qs = UserSettings.objects.select_for_update() if inline else UserSettings.objects
+            settings_obj, _ = settings_qs.get_or_create(user=request.user)
+            new_target = settings_obj.target_daily_usage_min
+            if inline:
+                # 여러 감정이 함께 나오면 감정별 조정량을 비중대로 평균
+                new_target = adjust_target_minutes_weighted(
+                    settings_obj.target_daily_usage_min,
+                    scores["weights"],
+                    settings_obj.stress_sensitivity
+                )
+
+            # 4) 감정/코칭 로그 저장 + 목표치가 바뀐 경우에만 UPDATE 1회
+            write_logs([
+                EmotionLog(
+                    user=request.user,
+                    emotion_label=emotion,
+                    emotion_weights=log_weights(scores["weights"]),   # 야간 일괄 조정도 같은 비중 사용
+                    source=source,
+                    log_text=text
+                ),
+                AiCoachingLog(
+                    user=request.user,
+                    insight_text=f"감정: {emotion} ({source})",
+                    suggestion_text=msg,
+                ),
+            ])
+            if new_target != settings_obj.target_daily_usage_min:
+                UserSettings.objects.filter(pk=settings_obj.pk).update(
+                    target_daily_usage_min=new_target
+                )
+                settings_obj.target_daily_usage_min = new_target
+                # update() 는 시그널이 없으므로 설정 캐시를 직접 무효화
+                settings_cache.invalidate("settings", settings_obj.user_id)
 
         return Response({
             "emotion": emotion,
@@ -59,20 +88,104 @@ class EmotionMessageView(APIView):
             "newTargetDailyUsage": settings_obj.target_daily_usage_min,
         })
 
-class UserSettingsView(APIView):
+class EmotionLogHistoryView(APIView):
     """
-    GET  /api/wellness/settings/   → 사용자 설정 조회
-    PATCH /api/wellness/settings/  → 설정 일부 수정
+    GET /api/wellness/emotions/?limit=50&fields=id,emotion_label,created_at&cursor=...
+    - 내 감정 기록 최신순, 다음 페이지는 응답의 next URL 사용
+    - fields 로 log_text 같은 큰 필드를 빼고 받을 수 있음
+    """
+    permission_classes = [IsAuthenticated]
+    paginator = KeysetPaginator(
+        "created_at", {name: name for name in EmotionLogSerializer.Meta.fields}
+    )
+
+    def get(self, request):
+        return self.paginator.paginate(request, EmotionLog.objects.filter(user=request.user))
+
+
+class CachedSettingsView(APIView):
+    """
+    설정 조회/수정 공통 뷰 (kind: settings_cache.KINDS 의 키)
+    - GET: 캐시된 응답 반환, If-None-Match 가 ETag 와 같으면 본문 없이 304
+    - PATCH: 일부 수정 후 새 응답으로 캐시 갱신
     """
     permission_classes = [IsAuthenticated]
+    kind = None
 
     def get(self, request):
-        settings_obj, _ = UserSettings.objects.get_or_create(user=request.user)
-        return Response(UserSettingsSerializer(settings_obj).data)
+        entry = settings_cache.get_entry(self.kind, request.user)
+        if settings_cache.not_modified(request, entry):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": entry["etag"]})
+        return Response(entry["data"], headers={"ETag": entry["etag"]})
 
     def patch(self, request):
-        settings_obj, _ = UserSettings.objects.get_or_create(user=request.user)
-        ser = UserSettingsSerializer(settings_obj, data=request.data, partial=True)
+        model, serializer_class = settings_cache.KINDS[self.kind]
+        obj, _ = model.objects.get_or_create(user=request.user)
+        ser = serializer_class(obj, data=request.data, partial=True)
         ser.is_valid(raise_exception=True)
         ser.save()
-        return Response(ser.data)
+        entry = settings_cache.prime(self.kind, request.user.pk, ser.data)
+        return Response(entry["data"], headers={"ETag": entry["etag"]})
+
+
+class UserSettingsView(CachedSettingsView):
+    """
+    GET  /api/wellness/settings/   → 사용자 설정 조회
+    PATCH /api/wellness/settings/  → 설정 일부 수정
+    """
+    kind = "settings"
+
+
+class UserPreferencesView(CachedSettingsView):
+    """
+    GET  /api/wellness/preferences/   → 개인 설정 조회 (집중모드 클라이언트가 자주 폴링)
+    PATCH /api/wellness/preferences/  → 개인 설정 일부 수정
+    """
+    kind = "preferences"
+
+
+class WeeklyReportView(APIView):
+    """
+    GET /api/wellness/analytics/weekly/?start=2025-11-17&unlock_limit=50
+    - start 부터 7일간의 카테고리×시간대 사용 시간, 잠금 해제 연속 달성일,
+      감정 ↔ 다음날 사용 시간 관계 (기본 start: 오늘 기준 7일 전)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            from .analytics import DEFAULT_UNLOCK_LIMIT, weekly_report
+        except ImportError:
+            return Response(
+                {"detail": "분석 기능에는 numpy 가 필요합니다."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        start = request.query_params.get("start")
+        try:
+            # 형식은 맞지만 없는 날짜(2025-02-30)면 parse_date 가 ValueError
+            start_date = parse_date(start) if start else timezone.localdate() - timedelta(days=7)
+        except ValueError:
+            start_date = None
+        try:
+            unlock_limit = int(request.query_params.get("unlock_limit", DEFAULT_UNLOCK_LIMIT))
+        except ValueError:
+            unlock_limit = None
+        if start_date is None or unlock_limit is None or unlock_limit < 0:
+            return Response(
+                {"detail": "start 는 YYYY-MM-DD, unlock_limit 은 0 이상의 정수여야 합니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        report = weekly_report(start_date, user_ids=[request.user.id], unlock_limit=unlock_limit)
+        mine = report["users"].get(request.user.id, {
+            "category_hour_minutes": {},
+            "unlock_streak": {"longest": 0, "current": 0},
+        })
+        return Response({
+            "start_date": report["start_date"],
+            "end_date": report["end_date"],
+            "unlock_limit": unlock_limit,
+            **mine,
+            "emotion_next_day_usage": report["emotion_next_day_usage"],
+        })
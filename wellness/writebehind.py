@@ -0,0 +1,338 @@
+# wellness/writebehind.py
+# - EmotionLog / AiCoachingLog 쓰기 지연(write-behind) 버퍼
+# - 요청 스레드는 큐에 넣기만 하고, 백그라운드 스레드가 개수/시간 기준으로 모아서 bulk_create
+# - 큐가 가득 찼거나 DB 쓰기에 실패한 레코드는 로컬 SQLite spill 파일에 보관 후 재시도
+#   (spill 파일은 워커들이 공유 → 재기록할 행은 BEGIN IMMEDIATE 로 먼저 자기 몫(프로세스 토큰 + 시각)으로 표시,
+#    표시 후 SPILL_LEASE 초가 지나도 남아 있으면 그 워커가 죽은 것으로 보고 다른 워커가 가져감)
+# - 트랜잭션 안에서 호출하면 커밋된 뒤에만 큐에 넣음 (롤백된 요청의 로그는 기록하지 않음)
+# - 외부 브로커 없음, 프로세스 종료 시 남은 레코드를 모두 기록(drain)
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = {
+    "ENABLED": False,
+    "FLUSH_SIZE": 200,        # 이 개수가 모이면 즉시 기록
+    "FLUSH_INTERVAL": 1.0,    # 최대 대기 시간(초)
+    "MAX_QUEUE": 10000,       # 메모리 큐 최대 길이 (넘치면 spill 파일로)
+    "SPILL_PATH": None,       # spill 용 SQLite 파일 경로 (None 이면 spill 없이 유실 로그만)
+    "SPILL_LEASE": 300,       # spill 행 재기록 표시 유효 시간(초) — 재기록 1회(FLUSH_SIZE 건)보다 충분히 길게
+}
+
+
+def _to_payload(obj):
+    data = {}
+    for field in obj._meta.concrete_fields:
+        if field.primary_key:
+            continue
+        value = getattr(obj, field.attname)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        data[field.attname] = value
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _from_payload(label, payload):
+    model = apps.get_model(label)
+    data = json.loads(payload)
+    for field in model._meta.concrete_fields:
+        if field.get_internal_type() == "DateTimeField" and data.get(field.attname):
+            data[field.attname] = parse_datetime(data[field.attname])
+    return model(**data)
+
+
+def _already_written(obj):
+    """lease 가 끝난(죽은 워커가 재기록하던) 레코드가 이미 DB 에 들어갔는지 (pk 제외 전체 필드가 같은 행)"""
+    fields = {}
+    for f in obj._meta.concrete_fields:
+        if not f.primary_key:
+            value = getattr(obj, f.attname)
+            # JSONField 는 =None 이 JSON null 과 비교하므로 SQL NULL 은 isnull 로
+            fields[f.attname if value is not None else f"{f.attname}__isnull"] = value if value is not None else True
+    return type(obj).objects.filter(**fields).exists()
+
+
+class SpillFile:
+    """
+    DB 에 못 쓴 레코드를 임시 보관하는 SQLite 파일 (Django DB 와 별개)
+    - claimed_by: 재기록 중인 SpillFile 의 토큰 "pid:uuid" (NULL 이면 아무도 가져가지 않음)
+      pid 만 쓰면 재시작 후 같은 pid 를 받은 프로세스 / 다른 pid 네임스페이스(공유 볼륨)에서 구분이 안 됨
+    - claimed_at: 표시한 시각 (epoch 초) — lease 초가 지나면 다른 워커가 가져갈 수 있음
+    """
+
+    def __init__(self, path, lease=DEFAULT_CONFIG["SPILL_LEASE"]):
+        self.path = str(path)
+        self.lease = lease
+        self.token = f"{os.getpid()}:{uuid.uuid4().hex}"
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS spill ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, model TEXT, payload TEXT, claimed_by TEXT, claimed_at REAL)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(spill)")}
+            # 이전 버전이 만든 파일 (claimed_at 이 없는 표시는 만료된 것으로 취급)
+            if "claimed_by" not in columns:
+                conn.execute("ALTER TABLE spill ADD COLUMN claimed_by TEXT")
+            if "claimed_at" not in columns:
+                conn.execute("ALTER TABLE spill ADD COLUMN claimed_at REAL")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def write(self, objs):
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO spill (model, payload) VALUES (?, ?)",
+                [(obj._meta.label, _to_payload(obj)) for obj in objs],
+            )
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM spill").fetchone()[0]
+
+    def claim(self, limit):
+        """
+        재기록할 레코드를 최대 limit 건 이 SpillFile 몫으로 표시 → [(id, 객체, 복구 여부)]
+        - BEGIN IMMEDIATE 로 쓰기 잠금을 잡은 채 표시하므로 두 워커가 같은 행을 가져가지 않음
+        - 표시가 lease 초보다 오래된 행도 가져옴 (복구=True: 그 워커가 INSERT 후 삭제 전에 죽었을 수 있음)
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.isolation_level = None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT id, model, payload, claimed_by FROM spill "
+                "WHERE claimed_by IS NULL OR claimed_at IS NULL OR claimed_at < ? ORDER BY id LIMIT ?",
+                (now - self.lease, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE spill SET claimed_by = ?, claimed_at = ? WHERE id = ?",
+                [(self.token, now, row[0]) for row in rows],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return [
+            (row_id, _from_payload(label, payload), owner is not None)
+            for row_id, label, payload, owner in rows
+        ]
+
+    def release(self, ids):
+        """재기록에 실패한 행을 다시 아무나 가져갈 수 있게 (그사이 다른 워커가 가져간 행은 그대로)"""
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE spill SET claimed_by = NULL, claimed_at = NULL WHERE id = ? AND claimed_by = ?",
+                [(i, self.token) for i in ids],
+            )
+
+    def delete(self, ids):
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM spill WHERE id = ?", [(i,) for i in ids])
+
+
+class LogWriter:
+    """
+    로그 레코드(저장 전 모델 인스턴스) 쓰기 지연 버퍼
+    - add(): 요청 스레드에서 호출, 큐에 넣고 바로 반환
+    - start(): 백그라운드 flush 스레드 시작 / stop(): 스레드 종료 후 남은 레코드 모두 기록
+    - flush(): 현재 스레드에서 즉시 모두 기록 (테스트/종료 시)
+    """
+
+    def __init__(self, flush_size=200, flush_interval=1.0, max_queue=10000, spill_path=None,
+                 spill_lease=DEFAULT_CONFIG["SPILL_LEASE"]):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.pid = os.getpid()
+        self.written = 0
+        self.spilled = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._spill = SpillFile(spill_path, spill_lease) if spill_path else None
+        self._spill_pending = bool(self._spill and self._spill.count())
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add(self, obj):
+        try:
+            self._queue.put_nowait(obj)
+        except queue.Full:
+            self._spill_objs([obj])
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def stop(self, timeout=10):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def flush(self):
+        while True:
+            batch = self._drain(self.flush_size)
+            if not batch:
+                break
+            self._write(batch)
+        while self._replay_spill():
+            pass
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _collect(self):
+        """FLUSH_SIZE 가 차거나 FLUSH_INTERVAL 이 지날 때까지 모음"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.flush_size and not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            close_old_connections()
+            if batch:
+                self._write(batch)
+            self._replay_spill()
+        connection.close()
+
+    def _write(self, objs):
+        by_model = defaultdict(list)
+        for obj in objs:
+            by_model[type(obj)].append(obj)
+        with self._write_lock:
+            for model, items in by_model.items():
+                try:
+                    model.objects.bulk_create(items)
+                    self.written += len(items)
+                except Exception:
+                    logger.exception("%s %d건 기록 실패 → spill", model.__name__, len(items))
+                    self._spill_objs(items)
+
+    def _spill_objs(self, objs):
+        if self._spill is None:
+            logger.error("spill 파일이 없어 로그 %d건을 버립니다", len(objs))
+            return
+        self._spill.write(objs)
+        self.spilled += len(objs)
+        self._spill_pending = True
+
+    def _replay_spill(self):
+        """
+        spill 파일에서 최대 FLUSH_SIZE 건을 DB 로 옮김 → 옮긴 건수 반환
+        - claim(표시) → bulk_create → delete 순서, 실패하면 표시를 풀어 다음 주기에 재시도
+        """
+        if not self._spill_pending:
+            return 0
+        with self._write_lock:
+            rows = self._spill.claim(self.flush_size)
+            if not rows:
+                self._spill_pending = False
+                return 0
+            by_model = defaultdict(list)
+            for row_id, obj, recovered in rows:
+                by_model[type(obj)].append((row_id, obj, recovered))
+            pending_ids = [row_id for row_id, _, _ in rows]
+            for model, items in by_model.items():
+                try:
+                    objs = [obj for _, obj, recovered in items if not (recovered and _already_written(obj))]
+                    model.objects.bulk_create(objs)
+                except Exception:
+                    logger.warning("spill 재기록 실패, 다음 주기에 재시도")
+                    self._spill.release(pending_ids)
+                    return 0
+                ids = [row_id for row_id, _, _ in items]
+                self._spill.delete(ids)
+                pending_ids = [i for i in pending_ids if i not in set(ids)]
+                self.written += len(objs)
+            return len(rows)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_config():
+    return {**DEFAULT_CONFIG, **getattr(settings, "WELLNESS_LOG_WRITER", {})}
+
+
+def get_log_writer():
+    """설정에서 켜져 있으면 프로세스 공용 LogWriter(스레드 시작됨), 아니면 None"""
+    global _writer
+    config = get_config()
+    if not config["ENABLED"]:
+        return None
+    with _writer_lock:
+        # fork 된 워커에는 스레드가 없으므로 새로 만듦
+        if _writer is None or _writer.pid != os.getpid():
+            _writer = LogWriter(
+                flush_size=config["FLUSH_SIZE"],
+                flush_interval=config["FLUSH_INTERVAL"],
+                max_queue=config["MAX_QUEUE"],
+                spill_path=config["SPILL_PATH"],
+                spill_lease=config["SPILL_LEASE"],
+            )
+            _writer.start()
+        return _writer
+
+
+def write_logs(objs):
+    """
+    로그 레코드 저장: write-behind 가 켜져 있으면 큐에, 아니면 즉시 INSERT
+    - 큐에는 현재 트랜잭션이 커밋된 뒤에 넣음 (트랜잭션 밖이면 바로)
+    """
+    writer = get_log_writer()
+    if writer is None:
+        for obj in objs:
+            obj.save()
+        return
+    objs = list(objs)
+    transaction.on_commit(lambda: [writer.add(obj) for obj in objs])
+
+
+async def awrite_logs(objs):
+    """write_logs() 의 async 버전 (즉시 INSERT 시 asave 사용)"""
+    writer = get_log_writer()
+    for obj in objs:
+        if writer is not None:
+            writer.add(obj)
+        else:
+            await obj.asave()